@@ -0,0 +1,47 @@
+# Decode a log stream written by logging.cbor.CBORHandler into text.
+#
+# Runs on the host with CPython and the cbor2 package from PyPI (or under
+# MicroPython with the cbor2 package from micropython-lib):
+#
+#     python decode.py app.cbor
+#     python decode.py < /dev/ttyUSB0.log
+
+import io
+import sys
+
+import cbor2
+
+_LEVELS = {50: "CRITICAL", 40: "ERROR", 30: "WARNING", 20: "INFO", 10: "DEBUG", 0: "NOTSET"}
+
+
+def decode(data):
+    # Yield (time, levelno, name, message) for each record in `data`.
+    fp = io.BytesIO(data)
+    dec = cbor2.CBORDecoder(fp)
+    strings = {}
+    while fp.tell() < len(data):
+        item = dec.decode()
+        if item[0] == 0:
+            strings = {}
+        elif item[0] == 1:
+            strings[item[1]] = item[2]
+        elif item[0] == 2:
+            _, ct, levelno, name, msg, args = item
+            msg = strings[msg]
+            if args:
+                msg = msg % (args if isinstance(args, dict) else tuple(args))
+            yield ct, levelno, strings[name], msg
+
+
+def main():
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "rb") as f:
+            data = f.read()
+    else:
+        data = sys.stdin.buffer.read()
+    for ct, levelno, name, msg in decode(data):
+        print("%.3f %s:%s:%s" % (ct, _LEVELS.get(levelno, levelno), name, msg))
+
+
+if __name__ == "__main__":
+    main()
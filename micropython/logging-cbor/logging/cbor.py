@@ -0,0 +1,96 @@
+"""Compact binary (CBOR) encoding of log records.
+
+CBORHandler writes each record as a short CBOR array instead of a line of
+text.  The level is sent as a number, and logger names and (unformatted)
+message strings are sent once and then referred to by a small integer ID,
+with the message arguments encoded separately.  This makes records much
+smaller than their formatted text when sending logs over a slow uplink or
+storing them in flash.
+
+    import logging, logging.cbor
+
+    logging.getLogger().addHandler(logging.cbor.CBORHandler(uart))
+
+The stream is a sequence of CBOR arrays, each one of:
+
+    [0]                                      reset: forget all string IDs
+    [1, id, string]                          define string ID
+    [2, time, level, name_id, msg_id, args]  log record
+
+A reset is written before the first record and whenever the table of
+strings is full.  Use decode.py (from this package's source directory) on
+the host to turn the stream back into text.
+"""
+
+from micropython import const
+import io
+import logging
+
+import cbor2
+
+_RESET = const(0)
+_STRING = const(1)
+_RECORD = const(2)
+
+
+def _value(v):
+    # Arguments are sent as-is when CBOR can encode them, and as their
+    # string representation otherwise.
+    if v is None or isinstance(v, (int, float, str, bytes, bool)):
+        return v
+    return str(v)
+
+
+class CBORHandler(logging.Handler):
+    def __init__(self, stream, maxStrings=64):
+        super().__init__()
+        self.stream = stream
+        self.maxStrings = maxStrings
+        self._ids = {}
+        self._reset = True
+
+    def close(self):
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def reset(self):
+        # Forget all string IDs, so that the next record is self-contained.
+        # Call this e.g. when a new receiver connects.
+        self._ids = {}
+        self._reset = True
+
+    def _intern(self, enc, new, s):
+        # New IDs go in new, and are only added to the table once the record
+        # defining them has been written.
+        i = self._ids.get(s)
+        if i is None:
+            i = new.get(s)
+        if i is None:
+            i = len(self._ids) + len(new)
+            new[s] = i
+            enc.encode([_STRING, i, s])
+        return i
+
+    def emit(self, record):
+        if record.levelno >= self.level:
+            buf = io.BytesIO()
+            enc = cbor2.CBOREncoder(buf)
+            # A record can add up to two strings, make sure both fit.
+            if len(self._ids) + 2 > self.maxStrings:
+                self.reset()
+            if self._reset:
+                enc.encode([_RESET])
+            new = {}
+            name = self._intern(enc, new, record.name)
+            msg = record.msg
+            # The message may be any object, e.g. log.error(exc).
+            msg = self._intern(enc, new, msg if isinstance(msg, str) else str(msg))
+            args = record.args
+            if isinstance(args, dict):
+                args = {k: _value(v) for k, v in args.items()}
+            else:
+                args = [_value(v) for v in args]
+            enc.encode([_RECORD, record.ct, record.levelno, name, msg, args])
+            self.stream.write(buf.getvalue())
+            self._ids.update(new)
+            self._reset = False
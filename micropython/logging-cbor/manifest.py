@@ -0,0 +1,6 @@
+metadata(description="Compact CBOR-encoding handler for the logging module.", version="0.1.0")
+
+require("logging")
+require("cbor2")
+
+package("logging")
@@ -0,0 +1,109 @@
+import io
+import logging
+import logging.cbor
+import sys
+import unittest
+
+# decode.py is a host tool that lives next to the package, not in it.
+sys.path.append("..")
+from decode import decode
+
+
+def _make_logger(name, handler):
+    log = logging.getLogger(name)
+    log.setLevel(logging.DEBUG)
+    log.handlers = [handler]
+    return log
+
+
+class TestCBORHandler(unittest.TestCase):
+    def _decode(self, stream):
+        return [(levelno, name, msg) for _, levelno, name, msg in decode(stream.getvalue())]
+
+    def test_roundtrip(self):
+        stream = io.BytesIO()
+        log = _make_logger("test_roundtrip", logging.cbor.CBORHandler(stream))
+        log.info("reading %d: %s", 1, "ok")
+        log.warning("reading %d: %s", 2, "bad")
+        log.error("plain")
+        log.info("%(a)s=%(b)d", {"a": "x", "b": 3})
+        log.info("object %s", ValueError("oops"))
+        self.assertEqual(
+            self._decode(stream),
+            [
+                (logging.INFO, "test_roundtrip", "reading 1: ok"),
+                (logging.WARNING, "test_roundtrip", "reading 2: bad"),
+                (logging.ERROR, "test_roundtrip", "plain"),
+                (logging.INFO, "test_roundtrip", "x=3"),
+                (logging.INFO, "test_roundtrip", "object oops"),
+            ],
+        )
+
+    def test_strings_sent_once(self):
+        stream = io.BytesIO()
+        log = _make_logger("test_once", logging.cbor.CBORHandler(stream))
+        log.info("value %d", 1)
+        first = len(stream.getvalue())
+        log.info("value %d", 2)
+        second = len(stream.getvalue()) - first
+        self.assertTrue(second < first)
+        self.assertEqual(stream.getvalue().count(b"value %d"), 1)
+
+    def test_table_reset(self):
+        stream = io.BytesIO()
+        log = _make_logger("test_reset", logging.cbor.CBORHandler(stream, maxStrings=4))
+        for i in range(10):
+            # Distinct message strings, to fill up the string table.
+            msg = "message %d" % i
+            log.info(msg)
+        result = self._decode(stream)
+        self.assertEqual([r[2] for r in result], ["message %d" % i for i in range(10)])
+
+    def test_non_str_msg(self):
+        stream = io.BytesIO()
+        log = _make_logger("test_non_str", logging.cbor.CBORHandler(stream))
+        log.error(ValueError("boom"))
+        log.info({"a": 1})
+        log.error(ValueError("boom"))
+        self.assertEqual(
+            self._decode(stream),
+            [
+                (logging.ERROR, "test_non_str", "boom"),
+                (logging.INFO, "test_non_str", "{'a': 1}"),
+                (logging.ERROR, "test_non_str", "boom"),
+            ],
+        )
+        self.assertEqual(stream.getvalue().count(b"boom"), 1)
+
+    def test_failed_write(self):
+        class Stream(io.BytesIO):
+            fail = False
+
+            def write(self, b):
+                if self.fail:
+                    raise OSError("write")
+                return super().write(b)
+
+        stream = Stream()
+        handler = logging.cbor.CBORHandler(stream)
+        log = _make_logger("test_failed", handler)
+        stream.fail = True
+        try:
+            log.info("lost")
+        except OSError:
+            pass
+        stream.fail = False
+        log.info("lost")
+        self.assertEqual(self._decode(stream), [(logging.INFO, "test_failed", "lost")])
+
+    def test_level(self):
+        stream = io.BytesIO()
+        handler = logging.cbor.CBORHandler(stream)
+        handler.setLevel(logging.ERROR)
+        log = _make_logger("test_level", handler)
+        log.info("ignored")
+        self.assertEqual(stream.getvalue(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
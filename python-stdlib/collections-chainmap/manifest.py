@@ -0,0 +1,4 @@
+metadata(version="0.1.0", description="Adds ChainMap to collections.")
+
+require("collections")
+package("collections")
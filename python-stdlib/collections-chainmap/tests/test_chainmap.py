@@ -0,0 +1,40 @@
+import unittest
+from collections import ChainMap
+
+
+class TestChainMap(unittest.TestCase):
+    def test_lookup(self):
+        defaults = {"colour": "red", "user": "guest"}
+        args = {"user": "admin"}
+        c = ChainMap(args, defaults)
+        self.assertEqual(c["user"], "admin")
+        self.assertEqual(c["colour"], "red")
+        self.assertEqual(c.get("size"), None)
+        self.assertEqual(len(c), 2)
+        self.assertEqual(sorted(c), ["colour", "user"])
+        self.assertIn("colour", c)
+        with self.assertRaises(KeyError):
+            c["size"]
+
+    def test_write(self):
+        defaults = {"a": 1}
+        c = ChainMap({}, defaults)
+        c["a"] = 2
+        self.assertEqual(c["a"], 2)
+        self.assertEqual(defaults["a"], 1)
+        del c["a"]
+        self.assertEqual(c["a"], 1)
+        with self.assertRaises(KeyError):
+            del c["a"]
+
+    def test_child(self):
+        c = ChainMap({"a": 1})
+        child = c.new_child({"b": 2})
+        self.assertEqual(dict(child.items()), {"a": 1, "b": 2})
+        self.assertEqual(child.parents.maps, c.maps)
+        self.assertTrue(ChainMap({}, {"x": 1}))
+        self.assertFalse(ChainMap({}, {}))
+
+
+if __name__ == "__main__":
+    unittest.main()
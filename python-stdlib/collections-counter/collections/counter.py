@@ -0,0 +1,122 @@
+from . import MutableMapping
+
+
+def _count(item):
+    return item[1]
+
+
+class Counter(MutableMapping):
+    # Counts of hashable items.  Missing items have a count of zero.
+
+    def __init__(self, iterable=None, **kwargs):
+        self._map = {}
+        self.update(iterable, **kwargs)
+
+    def __getitem__(self, key):
+        return self._map.get(key, 0)
+
+    def __setitem__(self, key, count):
+        self._map[key] = count
+
+    def __delitem__(self, key):
+        # Like CPython, deleting a missing item is not an error.
+        self._map.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self._map
+
+    def __len__(self):
+        return len(self._map)
+
+    def __iter__(self):
+        return iter(self._map)
+
+    def get(self, key, default=None):
+        return self._map.get(key, default)
+
+    def keys(self):
+        return self._map.keys()
+
+    def values(self):
+        return self._map.values()
+
+    def items(self):
+        return self._map.items()
+
+    def update(self, iterable=None, **kwargs):
+        # Adds counts, rather than replacing them.
+        self._add(iterable, 1)
+        self._add(kwargs, 1)
+
+    def subtract(self, iterable=None, **kwargs):
+        self._add(iterable, -1)
+        self._add(kwargs, -1)
+
+    def _add(self, iterable, sign):
+        if not iterable:
+            return
+        d = self._map
+        if hasattr(iterable, "items"):
+            for elem, count in iterable.items():
+                d[elem] = d.get(elem, 0) + sign * count
+        else:
+            for elem in iterable:
+                d[elem] = d.get(elem, 0) + sign
+
+    def most_common(self, n=None):
+        if n is None:
+            return sorted(self._map.items(), key=_count, reverse=True)
+        import heapq
+
+        return heapq.nlargest(n, self._map.items(), key=_count)
+
+    def elements(self):
+        for elem, count in self._map.items():
+            for _ in range(count):
+                yield elem
+
+    def total(self):
+        return sum(self._map.values())
+
+    def copy(self):
+        return Counter(self)
+
+    def _combine(self, other, f):
+        if not isinstance(other, Counter):
+            return NotImplemented
+        result = Counter()
+        for elem in self._map:
+            count = f(self[elem], other[elem])
+            if count > 0:
+                result._map[elem] = count
+        for elem in other._map:
+            if elem not in self._map:
+                count = f(0, other[elem])
+                if count > 0:
+                    result._map[elem] = count
+        return result
+
+    def __add__(self, other):
+        return self._combine(other, lambda a, b: a + b)
+
+    def __sub__(self, other):
+        return self._combine(other, lambda a, b: a - b)
+
+    def __or__(self, other):
+        return self._combine(other, max)
+
+    def __and__(self, other):
+        return self._combine(other, min)
+
+    def __eq__(self, other):
+        if isinstance(other, Counter):
+            other = other._map
+        if not isinstance(other, dict):
+            return NotImplemented
+        # Missing items count as zero.
+        return all(self[e] == other.get(e, 0) for e in self._map) and all(
+            self[e] == c for e, c in other.items()
+        )
+
+    def __repr__(self):
+        return "Counter({%s})" % ", ".join("%r: %r" % item for item in self.most_common())
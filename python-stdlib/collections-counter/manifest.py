@@ -0,0 +1,5 @@
+metadata(version="0.1.0", description="Adds Counter to collections.")
+
+require("collections")
+require("heapq")
+package("collections")
@@ -0,0 +1,41 @@
+import unittest
+from collections import Counter
+
+
+class TestCounter(unittest.TestCase):
+    def test_count(self):
+        c = Counter("abracadabra")
+        self.assertEqual(c["a"], 5)
+        self.assertEqual(c["z"], 0)
+        self.assertNotIn("z", c)
+        self.assertEqual(c.total(), 11)
+        self.assertEqual(sorted(c.elements()), sorted("abracadabra"))
+        del c["z"]
+
+    def test_most_common(self):
+        c = Counter("abracadabra")
+        self.assertEqual(c.most_common(1), [("a", 5)])
+        self.assertEqual([n for _, n in c.most_common(3)], [5, 2, 2])
+        self.assertEqual([n for _, n in c.most_common()], [5, 2, 2, 1, 1])
+        self.assertEqual(Counter().most_common(3), [])
+
+    def test_update(self):
+        c = Counter(a=1)
+        c.update("aab")
+        c.update({"b": 2})
+        self.assertEqual(c, Counter(a=3, b=3))
+        c.subtract(a=4)
+        self.assertEqual(c["a"], -1)
+        self.assertEqual(c, {"a": -1, "b": 3})
+
+    def test_operators(self):
+        a = Counter(a=3, b=1)
+        b = Counter(a=1, b=2, c=1)
+        self.assertEqual(a + b, Counter(a=4, b=3, c=1))
+        self.assertEqual(a - b, Counter(a=2))
+        self.assertEqual(a | b, Counter(a=3, b=2, c=1))
+        self.assertEqual(a & b, Counter(a=1, b=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+class deque:
+    # A ring buffer.  With a maxlen the buffer is allocated once and full
+    # deques overwrite their oldest items, so sliding windows don't allocate
+    # per item; otherwise it doubles in size as needed.  The typecode keyword
+    # (not in CPython) stores numbers in an array instead of a list.  This
+    # replaces the built-in deque, which needs a maxlen and lacks most of
+    # these methods, but is faster.
+
+    def __init__(self, iterable=(), maxlen=None, *, typecode=None):
+        if maxlen is not None and maxlen < 0:
+            raise ValueError("maxlen must be non-negative")
+        self._maxlen = maxlen
+        self._typecode = typecode
+        self._buf = self._alloc(maxlen or 8)
+        self._head = 0
+        self._len = 0
+        self.extend(iterable)
+
+    def _alloc(self, n):
+        if self._typecode is None:
+            return [None] * n
+        from array import array
+
+        buf = array(self._typecode)
+        for _ in range(n):
+            buf.append(0)
+        return buf
+
+    def _grow(self):
+        buf = self._alloc(2 * len(self._buf))
+        for i in range(self._len):
+            buf[i] = self[i]
+        self._buf = buf
+        self._head = 0
+
+    @property
+    def maxlen(self):
+        return self._maxlen
+
+    def append(self, x):
+        buf = self._buf
+        if self._len == self._maxlen:
+            if self._len:
+                buf[self._head] = x
+                self._head = (self._head + 1) % len(buf)
+            return
+        if self._len == len(buf):
+            self._grow()
+            buf = self._buf
+        buf[(self._head + self._len) % len(buf)] = x
+        self._len += 1
+
+    def appendleft(self, x):
+        buf = self._buf
+        if self._len == self._maxlen:
+            if self._len:
+                self._head = (self._head - 1) % len(buf)
+                buf[self._head] = x
+            return
+        if self._len == len(buf):
+            self._grow()
+            buf = self._buf
+        self._head = (self._head - 1) % len(buf)
+        buf[self._head] = x
+        self._len += 1
+
+    def pop(self):
+        if not self._len:
+            raise IndexError("pop from an empty deque")
+        self._len -= 1
+        i = (self._head + self._len) % len(self._buf)
+        x = self._buf[i]
+        if self._typecode is None:
+            self._buf[i] = None
+        return x
+
+    def popleft(self):
+        if not self._len:
+            raise IndexError("pop from an empty deque")
+        i = self._head
+        x = self._buf[i]
+        if self._typecode is None:
+            self._buf[i] = None
+        self._head = (i + 1) % len(self._buf)
+        self._len -= 1
+        return x
+
+    def extend(self, iterable):
+        if iterable is self:
+            iterable = list(iterable)
+        for x in iterable:
+            self.append(x)
+
+    def extendleft(self, iterable):
+        if iterable is self:
+            iterable = list(iterable)
+        for x in iterable:
+            self.appendleft(x)
+
+    def rotate(self, n=1):
+        if self._len <= 1:
+            return
+        n %= self._len
+        if self._len == len(self._buf):
+            # The buffer is full, so rotating only moves the head.
+            self._head = (self._head - n) % self._len
+        elif n <= self._len // 2:
+            for _ in range(n):
+                self.appendleft(self.pop())
+        else:
+            for _ in range(self._len - n):
+                self.append(self.popleft())
+
+    def clear(self):
+        if self._typecode is None:
+            self._buf = self._alloc(self._maxlen or 8)
+        self._head = 0
+        self._len = 0
+
+    def copy(self):
+        return deque(self, self._maxlen, typecode=self._typecode)
+
+    def count(self, x):
+        n = 0
+        for y in self:
+            if y == x:
+                n += 1
+        return n
+
+    def remove(self, value):
+        for i in range(self._len):
+            if self[i] == value:
+                break
+        else:
+            raise ValueError("deque.remove(x): x not in deque")
+        # Shift the items after it one place left.
+        for j in range(i, self._len - 1):
+            self[j] = self[j + 1]
+        self.pop()
+
+    def _index(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("deque index out of range")
+        return (self._head + i) % len(self._buf)
+
+    def __getitem__(self, i):
+        return self._buf[self._index(i)]
+
+    def __setitem__(self, i, x):
+        self._buf[self._index(i)] = x
+
+    def __len__(self):
+        return self._len
+
+    def __bool__(self):
+        return self._len > 0
+
+    def __iter__(self):
+        buf = self._buf
+        n = len(buf)
+        head = self._head
+        for i in range(self._len):
+            yield buf[(head + i) % n]
+
+    def __reversed__(self):
+        for i in range(self._len - 1, -1, -1):
+            yield self[i]
+
+    def __contains__(self, x):
+        for y in self:
+            if y == x:
+                return True
+        return False
+
+    def __eq__(self, other):
+        if not isinstance(other, deque):
+            return NotImplemented
+        return self._len == other._len and all(a == b for a, b in zip(self, other))
+
+    def __repr__(self):
+        if self._maxlen is None:
+            return "deque({})".format(list(self))
+        return "deque({}, maxlen={})".format(list(self), self._maxlen)
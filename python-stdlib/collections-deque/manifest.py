@@ -0,0 +1,8 @@
+metadata(
+    version="0.1.0",
+    description="Replaces the built-in collections.deque with a pure-Python ring buffer, "
+    "which is slower but adds unbounded deques, rotate() and the other CPython methods.",
+)
+
+require("collections")
+package("collections")
@@ -0,0 +1,75 @@
+import unittest
+from collections import deque
+
+
+class TestDeque(unittest.TestCase):
+    def test_ends(self):
+        d = deque()
+        for i in range(20):
+            d.append(i)
+            d.appendleft(-i)
+        self.assertEqual(len(d), 40)
+        self.assertEqual(d[0], -19)
+        self.assertEqual(d[-1], 19)
+        self.assertEqual(d.pop(), 19)
+        self.assertEqual(d.popleft(), -19)
+        self.assertEqual(list(d), list(range(-18, 1)) + list(range(19)))
+        d.clear()
+        self.assertFalse(d)
+        with self.assertRaises(IndexError):
+            d.pop()
+        with self.assertRaises(IndexError):
+            d.popleft()
+
+    def test_maxlen(self):
+        d = deque((), 3)
+        self.assertEqual(d.maxlen, 3)
+        d.extend(range(5))
+        self.assertEqual(list(d), [2, 3, 4])
+        d.appendleft(1)
+        self.assertEqual(list(d), [1, 2, 3])
+        d.append(4)
+        self.assertEqual(list(d), [2, 3, 4])
+        self.assertEqual(repr(d), "deque([2, 3, 4], maxlen=3)")
+        d = deque([1, 2], 0)
+        self.assertEqual(len(d), 0)
+
+    def test_rotate(self):
+        for maxlen in (None, 5, 10):
+            d = deque(range(5), maxlen)
+            d.rotate(2)
+            self.assertEqual(list(d), [3, 4, 0, 1, 2])
+            d.rotate(-3)
+            self.assertEqual(list(d), [1, 2, 3, 4, 0])
+            d.rotate(9)
+            self.assertEqual(list(d), [2, 3, 4, 0, 1])
+
+    def test_index(self):
+        d = deque(range(10), 4)
+        self.assertEqual(d[0], 6)
+        self.assertEqual(d[-1], 9)
+        d[1] = 0
+        self.assertEqual(list(d), [6, 0, 8, 9])
+        with self.assertRaises(IndexError):
+            d[4]
+        self.assertIn(8, d)
+        self.assertEqual(d.count(0), 1)
+        d.remove(0)
+        self.assertEqual(list(d), [6, 8, 9])
+        self.assertEqual(list(reversed(d)), [9, 8, 6])
+        self.assertEqual(d, deque([6, 8, 9]))
+
+    def test_typecode(self):
+        window = deque((), 4, typecode="f")
+        for x in range(10):
+            window.append(x * 0.5)
+        self.assertEqual(list(window), [3.0, 3.5, 4.0, 4.5])
+        self.assertEqual(sum(window) / len(window), 3.75)
+        d = deque(range(20), typecode="h")
+        self.assertEqual(d.popleft(), 0)
+        self.assertEqual(d.pop(), 19)
+        self.assertEqual(len(d), 18)
+
+
+if __name__ == "__main__":
+    unittest.main()
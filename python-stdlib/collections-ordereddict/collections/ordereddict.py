@@ -0,0 +1,159 @@
+from . import MutableMapping
+
+try:
+    from ucollections import OrderedDict as _OrderedDict
+except ImportError:
+    _OrderedDict = None
+
+# Fields of the links in the doubly-linked list that keeps the key order.
+_PREV = 0
+_NEXT = 1
+_KEY = 2
+_VALUE = 3
+
+
+if _OrderedDict is not None:
+
+    class OrderedDict(_OrderedDict):
+        # The built-in ordered dict, which is still a dict, with the methods
+        # it lacks added.  Those that move keys to the front rebuild it, so
+        # are O(n).
+
+        def move_to_end(self, key, last=True):
+            value = self.pop(key)
+            if last:
+                self[key] = value
+            else:
+                items = list(self.items())
+                self.clear()
+                self[key] = value
+                self.update(items)
+
+        def popitem(self, last=True):
+            if last:
+                return super().popitem()
+            for key in self:
+                return key, self.pop(key)
+            raise KeyError("dictionary is empty")
+
+        def copy(self):
+            return OrderedDict(self.items())
+
+        def __eq__(self, other):
+            if isinstance(other, OrderedDict):
+                return len(self) == len(other) and all(
+                    a == b for a, b in zip(self.items(), other.items())
+                )
+            if not isinstance(other, dict):
+                return NotImplemented
+            return len(self) == len(other) and all(
+                key in other and other[key] == value for key, value in self.items()
+            )
+
+        def __repr__(self):
+            return "OrderedDict({%s})" % ", ".join("%r: %r" % item for item in self.items())
+
+else:
+
+    class OrderedDict(MutableMapping):
+        # For ports without the built-in one.  A dict plus a circular
+        # doubly-linked list of [prev, next, key, value] links, so that
+        # lookups, deletions and move_to_end() are all O(1).
+
+        def __init__(self, other=(), **kwargs):
+            self._map = {}
+            root = self._root = [None, None, None, None]
+            root[_PREV] = root[_NEXT] = root
+            self.update(other, **kwargs)
+
+        def __getitem__(self, key):
+            return self._map[key][_VALUE]
+
+        def __setitem__(self, key, value):
+            link = self._map.get(key)
+            if link is not None:
+                link[_VALUE] = value
+                return
+            root = self._root
+            last = root[_PREV]
+            link = [last, root, key, value]
+            last[_NEXT] = root[_PREV] = self._map[key] = link
+
+        def __delitem__(self, key):
+            link = self._map.pop(key)
+            link[_PREV][_NEXT] = link[_NEXT]
+            link[_NEXT][_PREV] = link[_PREV]
+
+        def __contains__(self, key):
+            return key in self._map
+
+        def __len__(self):
+            return len(self._map)
+
+        def __iter__(self):
+            root = self._root
+            link = root[_NEXT]
+            while link is not root:
+                yield link[_KEY]
+                link = link[_NEXT]
+
+        def __reversed__(self):
+            root = self._root
+            link = root[_PREV]
+            while link is not root:
+                yield link[_KEY]
+                link = link[_PREV]
+
+        def get(self, key, default=None):
+            link = self._map.get(key)
+            return default if link is None else link[_VALUE]
+
+        def values(self):
+            for key in self:
+                yield self._map[key][_VALUE]
+
+        def items(self):
+            for key in self:
+                yield key, self._map[key][_VALUE]
+
+        def move_to_end(self, key, last=True):
+            link = self._map[key]
+            link[_PREV][_NEXT] = link[_NEXT]
+            link[_NEXT][_PREV] = link[_PREV]
+            root = self._root
+            if last:
+                prev = root[_PREV]
+                link[_PREV] = prev
+                link[_NEXT] = root
+                prev[_NEXT] = root[_PREV] = link
+            else:
+                first = root[_NEXT]
+                link[_PREV] = root
+                link[_NEXT] = first
+                first[_PREV] = root[_NEXT] = link
+
+        def popitem(self, last=True):
+            if not self._map:
+                raise KeyError("dictionary is empty")
+            link = self._root[_PREV if last else _NEXT]
+            key = link[_KEY]
+            del self[key]
+            return key, link[_VALUE]
+
+        def clear(self):
+            self._map.clear()
+            root = self._root
+            root[_PREV] = root[_NEXT] = root
+
+        def copy(self):
+            return OrderedDict(self)
+
+        def __eq__(self, other):
+            if isinstance(other, OrderedDict):
+                return len(self) == len(other) and all(
+                    a == b for a, b in zip(self.items(), other.items())
+                )
+            return MutableMapping.__eq__(self, other)
+
+        def __repr__(self):
+            return "OrderedDict({%s})" % ", ".join("%r: %r" % item for item in self.items())
@@ -0,0 +1,4 @@
+metadata(version="0.1.0", description="Adds OrderedDict with move_to_end to collections.")
+
+require("collections")
+package("collections")
@@ -0,0 +1,72 @@
+import unittest
+from collections import OrderedDict
+
+
+class TestOrderedDict(unittest.TestCase):
+    def test_order(self):
+        d = OrderedDict()
+        for k in "hello world":
+            d[k] = ord(k)
+        self.assertEqual(list(d), ["h", "e", "l", "o", " ", "w", "r", "d"])
+        del d["l"]
+        d["l"] = 0
+        self.assertEqual("".join(d), "heo wrdl")
+        self.assertEqual("".join(reversed(d)), "ldrw oeh")
+        self.assertEqual(list(d.values())[-1], 0)
+        self.assertEqual(len(d), 8)
+        self.assertIn("w", d)
+        self.assertEqual(d.get("x", 1), 1)
+
+    def test_move_to_end(self):
+        d = OrderedDict([("a", 1), ("b", 2), ("c", 3)])
+        d.move_to_end("a")
+        self.assertEqual(list(d), ["b", "c", "a"])
+        d.move_to_end("a", last=False)
+        self.assertEqual(list(d), ["a", "b", "c"])
+        with self.assertRaises(KeyError):
+            d.move_to_end("x")
+
+    def test_popitem(self):
+        d = OrderedDict(a=1)
+        d.update([("b", 2), ("c", 3)])
+        self.assertEqual(d.popitem(), ("c", 3))
+        self.assertEqual(d.popitem(last=False), ("a", 1))
+        self.assertEqual(d.pop("b"), 2)
+        with self.assertRaises(KeyError):
+            d.popitem()
+
+    def test_lru(self):
+        cache = OrderedDict()
+        for key in (1, 2, 3, 1, 4, 5, 1):
+            if key in cache:
+                cache.move_to_end(key)
+            else:
+                cache[key] = str(key)
+                if len(cache) > 3:
+                    cache.popitem(last=False)
+        self.assertEqual(list(cache.items()), [(4, "4"), (5, "5"), (1, "1")])
+
+    def test_eq_repr(self):
+        a = OrderedDict([("a", 1), ("b", 2)])
+        b = OrderedDict([("b", 2), ("a", 1)])
+        self.assertFalse(a == b)
+        self.assertTrue(a == {"a": 1, "b": 2})
+        self.assertTrue(a == a.copy())
+        self.assertEqual(repr(a), "OrderedDict({'a': 1, 'b': 2})")
+        a.clear()
+        self.assertEqual(len(a), 0)
+        self.assertEqual(list(a), [])
+
+    def test_builtin(self):
+        # Where there is a built-in OrderedDict, it is used, and still a dict.
+        try:
+            from ucollections import OrderedDict as builtin
+        except ImportError:
+            return
+        d = OrderedDict(a=1)
+        self.assertIsInstance(d, builtin)
+        self.assertIsInstance(d, dict)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,98 @@
 # Replace built-in collections module.
 from ucollections import *
 
+
+class MutableMapping:
+    # Mixin methods for mappings that define __getitem__, __setitem__,
+    # __delitem__, __iter__ and __len__.
+
+    def __contains__(self, key):
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return iter(self)
+
+    def values(self):
+        return (self[key] for key in self)
+
+    def items(self):
+        return ((key, self[key]) for key in self)
+
+    def pop(self, key, *default):
+        try:
+            value = self[key]
+        except KeyError:
+            if default:
+                return default[0]
+            raise
+        del self[key]
+        return value
+
+    def popitem(self):
+        for key in self:
+            value = self[key]
+            del self[key]
+            return key, value
+        raise KeyError("dictionary is empty")
+
+    def setdefault(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            self[key] = default
+            return default
+
+    def update(self, other=(), **kwargs):
+        if hasattr(other, "keys"):
+            for key in other.keys():
+                self[key] = other[key]
+        else:
+            for key, value in other:
+                self[key] = value
+        for key, value in kwargs.items():
+            self[key] = value
+
+    def clear(self):
+        try:
+            while True:
+                self.popitem()
+        except KeyError:
+            pass
+
+    def __eq__(self, other):
+        if not hasattr(other, "items"):
+            return NotImplemented
+        return dict(self.items()) == dict(other.items())
+
+
 # Provide optional dependencies (which may be installed separately).
 try:
     from .defaultdict import defaultdict
 except ImportError:
     pass
-
-
-class MutableMapping:
+try:
+    from .deque import deque
+except ImportError:
+    pass
+try:
+    from .ordereddict import OrderedDict
+except ImportError:
+    pass
+try:
+    from .counter import Counter
+except ImportError:
+    pass
+try:
+    from .chainmap import ChainMap
+except ImportError:
     pass
@@ -0,0 +1,81 @@
+# Time copy.deepcopy() on JSON-like trees of 10^4 nodes, with a json
+# round trip as a point of comparison.
+
+import copy
+import json
+import random
+import time
+
+try:
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_ms = lambda: int(time.perf_counter() * 1000)
+    ticks_diff = lambda a, b: a - b
+
+N = 10_000
+REPEAT = 10
+
+random.seed(1)
+
+
+def leaf():
+    r = random.getrandbits(2)
+    if r == 0:
+        return random.getrandbits(16)
+    if r == 1:
+        return "s%d" % random.getrandbits(8)
+    if r == 2:
+        return random.getrandbits(8) / 4
+    return None
+
+
+def wide():
+    # A list of small records, like a parsed JSON array.
+    return [
+        {"id": i, "name": leaf(), "tags": [leaf(), leaf()], "v": leaf()} for i in range(N // 6)
+    ]
+
+
+def bushy():
+    # Random nesting, a few levels deep.
+    nodes = 0
+    root = {}
+    containers = [root]
+    while nodes < N:
+        parent = containers[random.getrandbits(16) % len(containers)]
+        r = random.getrandbits(2)
+        child = [] if r == 0 else {} if r == 1 else leaf()
+        if isinstance(child, (list, dict)):
+            containers.append(child)
+        if isinstance(parent, list):
+            parent.append(child)
+        else:
+            parent["k%d" % nodes] = child
+        nodes += 1
+    return root
+
+
+def deep():
+    # A chain nested N levels deep, too deep to copy recursively.
+    x = None
+    for i in range(N):
+        x = {"i": i, "next": [x]}
+    return x
+
+
+def timeit(name, f, x):
+    t = ticks_ms()
+    for _ in range(REPEAT):
+        f(x)
+    print("%-28s %6d ms" % (name, ticks_diff(ticks_ms(), t)))
+
+
+def json_copy(x):
+    return json.loads(json.dumps(x))
+
+
+for name, tree in (("wide", wide()), ("bushy", bushy())):
+    timeit("deepcopy %s" % name, copy.deepcopy, tree)
+    timeit("json round trip %s" % name, json_copy, tree)
+timeit("deepcopy deep", copy.deepcopy, deep())
@@ -242,15 +242,54 @@ d[types.FunctionType] = _deepcopy_atomic
 # d[weakref.ref] = _deepcopy_atomic
 
 
-def _deepcopy_list(x, memo):
-    y = []
+_atomic_types = set(t for t, f in d.items() if f is _deepcopy_atomic)
+
+
+def _deepcopy_tree(x, memo, _nil=[]):
+    # Copies nested lists and dicts using an explicit stack of (original,
+    # copy) pairs instead of recursion, so deeply nested data can't overflow
+    # the C stack.  Atomic values are used as they are without a memo lookup
+    # or a call through the dispatch table; anything else goes to deepcopy().
+    atomic = _atomic_types
+    y = [] if type(x) is list else {}
     memo[id(x)] = y
-    for a in x:
-        y.append(deepcopy(a, memo))
+    stack = [(x, y)]
+    while stack:
+        src, dst = stack.pop()
+        if type(dst) is list:
+            append = dst.append
+            for a in src:
+                if type(a) not in atomic:
+                    a = _deepcopy_node(a, memo, stack, _nil)
+                append(a)
+        else:
+            for key, value in src.items():
+                if type(key) not in atomic:
+                    key = deepcopy(key, memo)
+                if type(value) not in atomic:
+                    value = _deepcopy_node(value, memo, stack, _nil)
+                dst[key] = value
+    return y
+
+
+def _deepcopy_node(x, memo, stack, _nil):
+    y = memo.get(id(x), _nil)
+    if y is not _nil:
+        return y
+    cls = type(x)
+    if cls is list:
+        y = []
+    elif cls is dict:
+        y = {}
+    else:
+        return deepcopy(x, memo)
+    # The copy is filled in when it comes off the stack.
+    memo[id(x)] = y
+    stack.append((x, y))
     return y
 
 
-d[list] = _deepcopy_list
+d[list] = _deepcopy_tree
 
 
 def _deepcopy_tuple(x, memo):
@@ -283,7 +322,7 @@ def _deepcopy_dict(x, memo):
     return y
 
 
-d[dict] = _deepcopy_dict
+d[dict] = _deepcopy_tree
 if OrderedDict is not None:
     d[OrderedDict] = _deepcopy_dict
 if PyStringMap is not None:
@@ -1,4 +1,4 @@
-metadata(version="3.3.5")
+metadata(version="3.4.0")
 
 require("types")
 
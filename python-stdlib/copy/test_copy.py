@@ -0,0 +1,55 @@
+import copy
+
+# Plain trees.
+x = {"a": [1, 2.5, "s", None, True, b"b"], "b": {"c": (1, 2), "d": []}, 3: []}
+y = copy.deepcopy(x)
+assert y == x
+assert y is not x and y["a"] is not x["a"] and y["b"] is not x["b"]
+assert y["b"]["d"] is not x["b"]["d"]
+assert list(y) == list(x)
+
+# Shared and recursive references are preserved.
+shared = [1]
+x = [shared, {"s": shared}]
+x.append(x)
+y = copy.deepcopy(x)
+assert y[0] is y[1]["s"] and y[0] is not shared
+assert y[2] is y
+
+# Tuples are only copied when they contain something mutable.
+t = (1, "a")
+assert copy.deepcopy([t])[0] is t
+t = (1, [2])
+y = copy.deepcopy({"t": t})
+assert y["t"] == t and y["t"] is not t and y["t"][1] is not t[1]
+
+# Nesting deeper than the C stack would allow with recursion.
+x = []
+for _ in range(10000):
+    x = [x, {"k": x}]
+y = copy.deepcopy(x)
+n = 0
+while y:
+    assert y[1]["k"] is y[0]
+    y = y[0]
+    n += 1
+assert n == 10000
+
+
+# Objects inside lists and dicts still go through __deepcopy__.
+class C:
+    def __init__(self, v):
+        self.v = v
+
+    def __deepcopy__(self, memo):
+        return C(copy.deepcopy(self.v, memo))
+
+
+c = C([1, 2])
+y = copy.deepcopy({"c": [c, c]})
+assert y["c"][0] is y["c"][1]
+assert y["c"][0] is not c and y["c"][0].v == [1, 2] and y["c"][0].v is not c.v
+
+memo = {}
+x = [1]
+assert copy.deepcopy(x, memo) is memo[id(x)]
@@ -0,0 +1,46 @@
+# Measure the rate of common datetime operations: parsing and formatting
+# RFC 3339 timestamps, converting from POSIX timestamps and arithmetic.
+
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+except AttributeError:
+
+    def ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+
+N = 2000
+
+
+def bench(name, f, args):
+    t = ticks_ms()
+    for a in args:
+        f(a)
+    dt = ticks_diff(ticks_ms(), t) or 1
+    print("%-32s %8d ops/s" % (name, len(args) * 1000 // dt))
+
+
+base = datetime(2024, 5, 17, 8, 30, 0, tzinfo=timezone.utc)
+stamps = [base + timedelta(seconds=i * 7, microseconds=i * 1001) for i in range(N)]
+strings = [dt.isoformat() for dt in stamps]
+zulu = [s[:-6] + "Z" for s in strings]
+naive = [s[:19] for s in strings]
+posix = [1715934600 + i * 7 for i in range(N)]
+delta = timedelta(minutes=5)
+
+bench("fromisoformat (+00:00)", datetime.fromisoformat, strings)
+bench("fromisoformat (Z)", datetime.fromisoformat, zulu)
+bench("fromisoformat (naive)", datetime.fromisoformat, naive)
+bench("isoformat", datetime.isoformat, stamps)
+bench("fromtimestamp (UTC)", lambda ts: datetime.fromtimestamp(ts, timezone.utc), posix)
+bench("datetime + timedelta", lambda dt: dt + delta, stamps)
+bench("datetime - datetime", lambda dt: dt - base, stamps)
+bench("year/month/day", lambda dt: (dt.year, dt.month, dt.day), stamps)
+bench("hour/minute/second", lambda dt: (dt.hour, dt.minute, dt.second), stamps)
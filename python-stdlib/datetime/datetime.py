@@ -19,8 +19,23 @@ def _dbm(y, m):
     return (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)[m] + (m > 2 and _leap(y))
 
 
+# One-entry cache for _o2ymd(): timestamps processed in bulk mostly fall on
+# the same day.
+_o2ymd_cache = [0, None]
+
+
 def _o2ymd(n):
     # ordinal -> (year, month, day), considering 01-Jan-0001 as day 1.
+    cache = _o2ymd_cache
+    if cache[0] == n:
+        return cache[1]
+    ymd = _o2ymd_calc(n)
+    cache[0] = n
+    cache[1] = ymd
+    return ymd
+
+
+def _o2ymd_calc(n):
     n -= 1
     n400, n = divmod(n, 146_097)
     y = n400 * 400 + 1
@@ -266,9 +281,25 @@ class timezone(tzinfo):
     def fromutc(self, dt):
         return dt + self._offset
 
+    def isoformat(self, dt):
+        # The offset is fixed, so format it only once.
+        if not hasattr(self, "_iso"):
+            self._iso = self._offset._fmt(0x12)
+        return self._iso
+
 
 timezone.utc = timezone(timedelta(0))
 
+# Timezones created while parsing, by offset in minutes.
+_tz_cache = {0: timezone.utc}
+
+
+def _tz_minutes(m):
+    tz = _tz_cache.get(m)
+    if tz is None:
+        tz = _tz_cache[m] = timezone(timedelta(minutes=m))
+    return tz
+
 
 def _date(y, m, d):
     if MINYEAR <= y <= MAXYEAR and 1 <= m <= 12 and 1 <= d <= _dim(y, m):
@@ -293,6 +324,58 @@ def _d2iso(o):  # date -> ISO
     return "%04d-%02d-%02d" % _o2ymd(o)
 
 
+def _num(b, i, n):
+    # Parse n ASCII digits of b starting at i.
+    v = 0
+    for j in range(i, i + n):
+        c = b[j] - 48
+        if not 0 <= c <= 9:
+            raise ValueError
+        v = v * 10 + c
+    return v
+
+
+def _rfc3339(s):
+    # Fast path for RFC 3339 timestamps, "YYYY-MM-DD[T ]HH:MM:SS[.f][Z|+HH:MM]".
+    # Returns (ordinal, microseconds, tzinfo), or None for any other form.
+    n = len(s)
+    if n < 19:
+        return None
+    b = s.encode()
+    if b[4] != 45 or b[7] != 45 or b[13] != 58 or b[16] != 58 or b[10] not in (84, 116, 32):
+        return None
+    o = _date(_num(b, 0, 4), _num(b, 5, 2), _num(b, 8, 2))
+    h = _num(b, 11, 2)
+    m = _num(b, 14, 2)
+    sec = _num(b, 17, 2)
+    if h > 23 or m > 59 or sec > 59:
+        raise ValueError
+    us = 0
+    i = 19
+    if i < n and b[i] == 46:  # "."
+        i += 1
+        j = i
+        while j < n and 48 <= b[j] <= 57:
+            j += 1
+        if not 0 < j - i <= 6:
+            return None
+        us = _num(b, i, j - i) * (1, 10, 100, 1000, 10_000, 100_000)[6 - j + i]
+        i = j
+    tz = None
+    if i < n:
+        c = b[i]
+        if c == 90 or c == 122:  # "Z"
+            tz = timezone.utc
+            i += 1
+        elif (c == 43 or c == 45) and n - i == 6 and b[i + 3] == 58:  # "+HH:MM"
+            off = _num(b, i + 1, 2) * 60 + _num(b, i + 4, 2)
+            tz = _tz_minutes(-off if c == 45 else off)
+            i += 6
+    if i != n:
+        return None
+    return o, ((h * 60 + m) * 60 + sec) * 1_000_000 + us, tz
+
+
 class date:
     def __init__(self, year, month, day):
         self._ord = _date(year, month, day)
@@ -629,7 +712,9 @@ class datetime:
             if s < 0 and dt == datetime(*_t.localtime(ts + s)[:6]):
                 dt._fd = 1
         else:
-            dt = cls(*_t.gmtime(ts)[:6], microsecond=us, tzinfo=tz)
+            # UTC needs no calls to gmtime() and only integer arithmetic.
+            d, s = divmod(ts, 86400)
+            dt = cls(0, 0, _EPOCH_ORD + d, 0, 0, 0, s * 1_000_000 + us, tz)
             dt = tz.fromutc(dt)
         return dt
 
@@ -643,6 +728,12 @@ class datetime:
 
     @classmethod
     def fromisoformat(cls, s):
+        try:
+            r = _rfc3339(s)
+        except ValueError:
+            r = None
+        if r is not None:
+            return cls(0, 0, r[0], 0, 0, 0, r[1], r[2])
         d = _iso2d(s)
         if len(s) <= 12:
             return cls(*d)
@@ -669,19 +760,19 @@ class datetime:
 
     @property
     def hour(self):
-        return self._t.tuple()[1]
+        return self._t._us // 3_600_000_000
 
     @property
     def minute(self):
-        return self._t.tuple()[2]
+        return self._t._us // 60_000_000 % 60
 
     @property
     def second(self):
-        return self._t.tuple()[3]
+        return self._t._us // 1_000_000 % 60
 
     @property
     def microsecond(self):
-        return self._t.tuple()[4]
+        return self._t._us % 1_000_000
 
     @property
     def tzinfo(self):
@@ -877,7 +968,18 @@ class datetime:
         return self._d % 7 or 7
 
     def isoformat(self, sep="T", timespec="auto"):
-        return _d2iso(self._d) + sep + _t2iso(self._t, timespec, self, self._tz)
+        if timespec != "auto":
+            return _d2iso(self._d) + sep + _t2iso(self._t, timespec, self, self._tz)
+        # Fast path for the default format.
+        s, us = divmod(self._t._us, 1_000_000)
+        m, s = divmod(s, 60)
+        h, m = divmod(m, 60)
+        r = "%04d-%02d-%02d%s%02d:%02d:%02d" % (_o2ymd(self._d) + (sep, h, m, s))
+        if us:
+            r += ".%06d" % us
+        if self._tz is not None:
+            r += self._tz.isoformat(self)
+        return r
 
     def __repr__(self):
         Y, M, D, h, m, s, us, tz, fold = self.tuple()
@@ -901,3 +1003,4 @@ class datetime:
 
 
 datetime.EPOCH = datetime(*_t.gmtime(0)[:6], tzinfo=timezone.utc)
+_EPOCH_ORD = datetime.EPOCH._d
@@ -1,4 +1,4 @@
-metadata(version="4.1.0")
+metadata(version="4.2.0")
 
 # Originally written by Lorenzo Cappelletti.
 
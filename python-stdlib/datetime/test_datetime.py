@@ -1696,6 +1696,37 @@ class Test5DateTime(unittest.TestCase):
             str(datetime.fromisoformat("1975-08-10 23:30:12+01:00")), "1975-08-10 23:30:12+01:00"
         )
 
+    def test_fromisoformat05(self):
+        self.assertEqual(
+            datetime.fromisoformat("2002-03-01T12:59:59.000100+01:00"),
+            datetime(2002, 3, 1, 12, 59, 59, 100, tz2),
+        )
+
+    def test_fromisoformat06(self):
+        dt = datetime.fromisoformat("2002-03-01T12:59:59Z")
+        self.assertEqual(dt, datetime(2002, 3, 1, 12, 59, 59, tzinfo=timezone.utc))
+        self.assertEqual(dt.utcoffset(), timedelta(0))
+
+    def test_fromisoformat07(self):
+        self.assertEqual(
+            datetime.fromisoformat("2002-03-01 12:59:59.123"),
+            datetime(2002, 3, 1, 12, 59, 59, 123000),
+        )
+
+    def test_fromisoformat08(self):
+        dt = datetime.fromisoformat("2002-03-01T12:59:59-05:30")
+        self.assertEqual(dt.utcoffset(), -timedelta(hours=5, minutes=30))
+        self.assertEqual(dt.isoformat(), "2002-03-01T12:59:59-05:30")
+
+    def test_fromisoformat09(self):
+        for s in ("2002-13-01T12:59:59", "2002-03-01T24:00:00", "2002-03-01T12:59:5x"):
+            with self.assertRaises(ValueError):
+                datetime.fromisoformat(s)
+
+    def test_fromisoformat10(self):
+        for dt in (dt1, dt3, dt4, datetime(1, 1, 1, 0, 0, 0, 1, timezone.utc)):
+            self.assertEqual(datetime.fromisoformat(dt.isoformat()), dt)
+
     def test_year00(self):
         self.assertEqual(dt1.year, 2002)
 
@@ -2144,6 +2175,13 @@ class Test5DateTime(unittest.TestCase):
     def test_isoformat03(self):
         self.assertEqual(str(dt3), "2002-03-01 12:59:59.000100+01:00")
 
+    def test_isoformat04(self):
+        self.assertEqual(dt4.isoformat(), "2002-03-02T17:06:00")
+
+    def test_isoformat05(self):
+        dt = datetime(2002, 3, 2, 17, 6, 0, 5, timezone.utc)
+        self.assertEqual(dt.isoformat(), "2002-03-02T17:06:00.000005+00:00")
+
     @unittest.skipIf(STDLIB, "standard datetime differs")
     def test___repr__00(self):
         self.assertEqual(repr(dt1), dt1r)
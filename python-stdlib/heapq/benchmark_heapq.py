@@ -0,0 +1,85 @@
+# Compare a heap of (deadline, seq, task) tuples with heapq.PriorityQueue,
+# for a timer-queue style workload on 10^5 items.
+
+import heapq
+import random
+import time
+
+try:
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_ms = lambda: int(time.perf_counter() * 1000)
+    ticks_diff = lambda a, b: a - b
+
+N = 100_000
+
+random.seed(1)
+deadlines = [random.getrandbits(24) for _ in range(N)]
+
+
+def timeit(name, f):
+    t = ticks_ms()
+    f()
+    print("%-36s %6d ms" % (name, ticks_diff(ticks_ms(), t)))
+
+
+def tuples():
+    h = []
+    for seq, d in enumerate(deadlines):
+        heapq.heappush(h, (d, seq, None))
+    while h:
+        heapq.heappop(h)
+
+
+def queue():
+    q = heapq.PriorityQueue()
+    for d in deadlines:
+        q.push(None, d)
+    while q:
+        q.pop()
+
+
+def cancel_tuples():
+    # Without handles, cancelling means a linear search and a re-heapify.
+    h = []
+    for seq, d in enumerate(deadlines[:10000]):
+        heapq.heappush(h, (d, seq, None))
+    for i in range(100):
+        del h[h.index((deadlines[i], i, None))]
+        heapq.heapify(h)
+
+
+def cancel_queue():
+    q = heapq.PriorityQueue()
+    handles = [q.push(None, d) for d in deadlines[:10000]]
+    for i in range(100):
+        q.remove(handles[i])
+
+
+def decrease_queue():
+    q = heapq.PriorityQueue()
+    handles = [q.push(None, d) for d in deadlines]
+    for h in handles[::10]:
+        q.decrease_key(h, h[0] // 2)
+
+
+def merge():
+    runs = [sorted(deadlines[i::10]) for i in range(10)]
+    for _ in heapq.merge(*runs):
+        pass
+
+
+def merge_key():
+    runs = [sorted(deadlines[i::10], key=lambda d: -d) for i in range(10)]
+    for _ in heapq.merge(*runs, key=lambda d: -d):
+        pass
+
+
+timeit("push/pop %d tuples" % N, tuples)
+timeit("push/pop %d PriorityQueue" % N, queue)
+timeit("cancel 100 of 10000, tuples", cancel_tuples)
+timeit("cancel 100 of 10000, PriorityQueue", cancel_queue)
+timeit("decrease_key %d of %d" % (N // 10, N), decrease_queue)
+timeit("merge 10 runs", merge)
+timeit("merge 10 runs with key", merge_key)
@@ -134,10 +134,9 @@ __all__ = [
     "nlargest",
     "nsmallest",
     "heappushpop",
+    "PriorityQueue",
 ]
 
-# from itertools import count, tee, chain
-
 
 def heappush(heap, item):
     """Push item onto heap, maintaining the heap invariant."""
@@ -202,6 +201,14 @@ def _heappushpop_max(heap, item):
     return item
 
 
+def _heapreplace_max(heap, item):
+    """Maxheap version of a heappop followed by a heappush."""
+    returnitem = heap[0]  # raises appropriate IndexError if heap is empty
+    heap[0] = item
+    _siftup_max(heap, 0)
+    return returnitem
+
+
 def _heapify_max(x):
     """Transform list into a maxheap, in-place, in O(len(x)) time."""
     n = len(x)
@@ -209,48 +216,6 @@ def _heapify_max(x):
         _siftup_max(x, i)
 
 
-def nlargest(n, iterable):
-    """Find the n largest elements in a dataset.
-
-    Equivalent to:  sorted(iterable, reverse=True)[:n]
-    """
-    from itertools import islice, count, tee, chain
-
-    if n < 0:
-        return []
-    it = iter(iterable)
-    result = list(islice(it, n))
-    if not result:
-        return result
-    heapify(result)
-    _heappushpop = heappushpop
-    for elem in it:
-        _heappushpop(result, elem)
-    result.sort(reverse=True)
-    return result
-
-
-def nsmallest(n, iterable):
-    """Find the n smallest elements in a dataset.
-
-    Equivalent to:  sorted(iterable)[:n]
-    """
-    from itertools import islice, count, tee, chain
-
-    if n < 0:
-        return []
-    it = iter(iterable)
-    result = list(islice(it, n))
-    if not result:
-        return result
-    _heapify_max(result)
-    _heappushpop = _heappushpop_max
-    for elem in it:
-        _heappushpop(result, elem)
-    result.sort()
-    return result
-
-
 # 'heap' is a heap at all indices >= startpos, except possibly for pos.  pos
 # is the index of a leaf with a possibly out-of-order value.  Restore the
 # heap invariant.
@@ -375,7 +340,7 @@ except ImportError:
     pass
 
 
-def merge(*iterables):
+def merge(*iterables, key=None, reverse=False):
     """Merge multiple sorted inputs into a single sorted output.
 
     Similar to `sorted(itertools.chain(*iterables))` but returns a generator,
@@ -385,38 +350,95 @@ def merge(*iterables):
     >>> list(merge([1,3,5,7], [0,2,4,8], [5,10,15,20], [], [25]))
     [0, 1, 2, 3, 4, 5, 5, 7, 8, 10, 15, 20, 25]
 
-    """
-    _heappop, _heapreplace, _StopIteration = heappop, heapreplace, StopIteration
-    _len = len
+    If *key* is not None, applies a key function to each element to determine
+    its sort order.
 
+    >>> list(merge(['dog', 'horse'], ['cat', 'fish', 'kangaroo'], key=len))
+    ['dog', 'cat', 'fish', 'horse', 'kangaroo']
+
+    """
     h = []
     h_append = h.append
-    for itnum, it in enumerate(map(iter, iterables)):
+
+    if reverse:
+        _heapify = _heapify_max
+        _heappop = _heappop_max
+        _heapreplace = _heapreplace_max
+        direction = -1
+    else:
+        _heapify = heapify
+        _heappop = heappop
+        _heapreplace = heapreplace
+        direction = 1
+
+    if key is None:
+        for order, it in enumerate(map(iter, iterables)):
+            try:
+                next = it.__next__
+                h_append([next(), order * direction, next])
+            except StopIteration:
+                pass
+        _heapify(h)
+        while len(h) > 1:
+            try:
+                while True:
+                    value, order, next = s = h[0]
+                    yield value
+                    s[0] = next()  # raises StopIteration when exhausted
+                    _heapreplace(h, s)  # restore heap condition
+            except StopIteration:
+                _heappop(h)  # remove empty iterator
+        if h:
+            # fast case when only a single iterator remains
+            value, order, next = h[0]
+            yield value
+            yield from next.__self__
+        return
+
+    for order, it in enumerate(map(iter, iterables)):
         try:
             next = it.__next__
-            h_append([next(), itnum, next])
-        except _StopIteration:
+            value = next()
+            h_append([key(value), order * direction, value, next])
+        except StopIteration:
             pass
-    heapify(h)
-
-    while _len(h) > 1:
+    _heapify(h)
+    while len(h) > 1:
         try:
             while True:
-                v, itnum, next = s = h[0]
-                yield v
-                s[0] = next()  # raises StopIteration when exhausted
-                _heapreplace(h, s)  # restore heap condition
-        except _StopIteration:
-            _heappop(h)  # remove empty iterator
+                key_value, order, value, next = s = h[0]
+                yield value
+                value = next()
+                s[0] = key(value)
+                s[2] = value
+                _heapreplace(h, s)
+        except StopIteration:
+            _heappop(h)
     if h:
-        # fast case when only a single iterator remains
-        v, itnum, next = h[0]
-        yield v
+        key_value, order, value, next = h[0]
+        yield value
         yield from next.__self__
 
 
-# Extend the implementations of nsmallest and nlargest to use a key= argument
-_nsmallest = nsmallest
+def _heappop_max(heap):
+    """Maxheap version of a heappop."""
+    lastelt = heap.pop()  # raises appropriate IndexError if heap is empty
+    if heap:
+        returnitem = heap[0]
+        heap[0] = lastelt
+        _siftup_max(heap, 0)
+        return returnitem
+    return lastelt
+
+
+# Algorithm notes for nlargest() and nsmallest()
+# ==============================================
+#
+# Make a single pass over the data while keeping the k most extreme values
+# in a heap.  Memory consumption is limited to keeping k values in a list.
+# Each element is decorated with its position in the input, which keeps the
+# sort stable and means elements themselves are never compared once their
+# keys tie.
 
 
 def nsmallest(n, iterable, key=None):
@@ -424,17 +446,15 @@ def nsmallest(n, iterable, key=None):
 
     Equivalent to:  sorted(iterable, key=key)[:n]
     """
-    from itertools import islice, count, tee, chain
 
-    # Short-cut for n==1 is to use min() when len(iterable)>0
+    # Short-cut for n==1 is to use min()
     if n == 1:
-        it = iter(iterable)
-        head = list(islice(it, 1))
-        if not head:
-            return []
+        sentinel = object()
         if key is None:
-            return [min(chain(head, it))]
-        return [min(chain(head, it), key=key)]
+            result = min(iterable, default=sentinel)
+        else:
+            result = min(iterable, default=sentinel, key=key)
+        return [] if result is sentinel else [result]
 
     # When n>=size, it's faster to use sorted()
     try:
@@ -446,19 +466,39 @@ def nsmallest(n, iterable, key=None):
             return sorted(iterable, key=key)[:n]
 
     # When key is none, use simpler decoration
+    it = iter(iterable)
     if key is None:
-        it = zip(iterable, count())  # decorate
-        result = _nsmallest(n, it)
-        return [r[0] for r in result]  # undecorate
+        # put the range(n) first so that zip() doesn't
+        # consume one too many elements from the iterator
+        result = [(elem, i) for i, elem in zip(range(n), it)]
+        if not result:
+            return result
+        _heapify_max(result)
+        top = result[0][0]
+        order = n
+        for elem in it:
+            if elem < top:
+                _heapreplace_max(result, (elem, order))
+                top = result[0][0]
+                order += 1
+        result.sort()
+        return [r[0] for r in result]
 
     # General case, slowest method
-    in1, in2 = tee(iterable)
-    it = zip(map(key, in1), count(), in2)  # decorate
-    result = _nsmallest(n, it)
-    return [r[2] for r in result]  # undecorate
-
-
-_nlargest = nlargest
+    result = [(key(elem), i, elem) for i, elem in zip(range(n), it)]
+    if not result:
+        return result
+    _heapify_max(result)
+    top = result[0][0]
+    order = n
+    for elem in it:
+        k = key(elem)
+        if k < top:
+            _heapreplace_max(result, (k, order, elem))
+            top = result[0][0]
+            order += 1
+    result.sort()
+    return [r[2] for r in result]
 
 
 def nlargest(n, iterable, key=None):
@@ -467,17 +507,14 @@ def nlargest(n, iterable, key=None):
     Equivalent to:  sorted(iterable, key=key, reverse=True)[:n]
     """
 
-    from itertools import islice, count, tee, chain
-
-    # Short-cut for n==1 is to use max() when len(iterable)>0
+    # Short-cut for n==1 is to use max()
     if n == 1:
-        it = iter(iterable)
-        head = list(islice(it, 1))
-        if not head:
-            return []
+        sentinel = object()
         if key is None:
-            return [max(chain(head, it))]
-        return [max(chain(head, it), key=key)]
+            result = max(iterable, default=sentinel)
+        else:
+            result = max(iterable, default=sentinel, key=key)
+        return [] if result is sentinel else [result]
 
     # When n>=size, it's faster to use sorted()
     try:
@@ -489,16 +526,173 @@ def nlargest(n, iterable, key=None):
             return sorted(iterable, key=key, reverse=True)[:n]
 
     # When key is none, use simpler decoration
+    it = iter(iterable)
     if key is None:
-        it = zip(iterable, count(0, -1))  # decorate
-        result = _nlargest(n, it)
-        return [r[0] for r in result]  # undecorate
+        result = [(elem, i) for i, elem in zip(range(0, -n, -1), it)]
+        if not result:
+            return result
+        heapify(result)
+        top = result[0][0]
+        order = -n
+        for elem in it:
+            if top < elem:
+                heapreplace(result, (elem, order))
+                top = result[0][0]
+                order -= 1
+        result.sort(reverse=True)
+        return [r[0] for r in result]
 
     # General case, slowest method
-    in1, in2 = tee(iterable)
-    it = zip(map(key, in1), count(0, -1), in2)  # decorate
-    result = _nlargest(n, it)
-    return [r[2] for r in result]  # undecorate
+    result = [(key(elem), i, elem) for i, elem in zip(range(0, -n, -1), it)]
+    if not result:
+        return result
+    heapify(result)
+    top = result[0][0]
+    order = -n
+    for elem in it:
+        k = key(elem)
+        if top < k:
+            heapreplace(result, (k, order, elem))
+            top = result[0][0]
+            order -= 1
+    result.sort(reverse=True)
+    return [r[2] for r in result]
+
+
+# Fields of a PriorityQueue entry, which is also the handle returned by push().
+_PRIORITY = 0
+_SEQ = 1
+_ITEM = 2
+_POS = 3
+
+
+class PriorityQueue:
+    """A heap of items with separate priorities, supporting removal and
+    decrease_key() by the handle that push() returns.
+
+    Only the priorities are compared, with ties popped in insertion order,
+    so items need not be orderable.
+    """
+
+    def __init__(self):
+        self._heap = []
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def __bool__(self):
+        return bool(self._heap)
+
+    def __contains__(self, handle):
+        pos = handle[_POS]
+        return 0 <= pos < len(self._heap) and self._heap[pos] is handle
+
+    def push(self, item, priority):
+        """Add item and return a handle for it."""
+        heap = self._heap
+        entry = [priority, self._seq, item, len(heap)]
+        self._seq += 1
+        heap.append(entry)
+        self._siftdown(0, entry[_POS])
+        return entry
+
+    def peek(self):
+        """Return (priority, item) for the smallest priority, without removing it."""
+        entry = self._heap[0]  # raises appropriate IndexError if empty
+        return entry[_PRIORITY], entry[_ITEM]
+
+    def pop(self):
+        """Remove and return (priority, item) for the smallest priority."""
+        entry = self._heap[0]  # raises appropriate IndexError if empty
+        self._delete(0)
+        return entry[_PRIORITY], entry[_ITEM]
+
+    def remove(self, handle):
+        """Remove the item for handle from the queue."""
+        if handle not in self:
+            raise ValueError("handle not in queue")
+        self._delete(handle[_POS])
+
+    def decrease_key(self, handle, priority):
+        """Lower the priority of the item for handle."""
+        if handle not in self:
+            raise ValueError("handle not in queue")
+        if handle[_PRIORITY] < priority:
+            raise ValueError("new priority is larger")
+        handle[_PRIORITY] = priority
+        self._siftdown(0, handle[_POS])
+
+    def clear(self):
+        for entry in self._heap:
+            entry[_POS] = -1
+        self._heap = []
+
+    def _delete(self, pos):
+        heap = self._heap
+        heap[pos][_POS] = -1
+        last = heap.pop()
+        if pos < len(heap):
+            heap[pos] = last
+            last[_POS] = pos
+            # The moved entry may need to go either way.
+            if pos and _lt(last, heap[(pos - 1) >> 1]):
+                self._siftdown(0, pos)
+            else:
+                self._siftup(pos)
+
+    # These follow the module-level _siftdown() and _siftup(), comparing only
+    # priorities (then insertion order) and keeping each entry's position up
+    # to date.  The comparison is written out inline as it is the hot path.
+
+    def _siftdown(self, startpos, pos):
+        heap = self._heap
+        newitem = heap[pos]
+        priority = newitem[_PRIORITY]
+        seq = newitem[_SEQ]
+        while pos > startpos:
+            parentpos = (pos - 1) >> 1
+            parent = heap[parentpos]
+            p = parent[_PRIORITY]
+            if priority < p or (seq < parent[_SEQ] and not p < priority):
+                heap[pos] = parent
+                parent[_POS] = pos
+                pos = parentpos
+                continue
+            break
+        heap[pos] = newitem
+        newitem[_POS] = pos
+
+    def _siftup(self, pos):
+        heap = self._heap
+        endpos = len(heap)
+        startpos = pos
+        newitem = heap[pos]
+        childpos = 2 * pos + 1
+        while childpos < endpos:
+            rightpos = childpos + 1
+            if rightpos < endpos:
+                left = heap[childpos]
+                right = heap[rightpos]
+                pl = left[_PRIORITY]
+                pr = right[_PRIORITY]
+                if pr < pl or (right[_SEQ] < left[_SEQ] and not pl < pr):
+                    childpos = rightpos
+            child = heap[childpos]
+            heap[pos] = child
+            child[_POS] = pos
+            pos = childpos
+            childpos = 2 * pos + 1
+        heap[pos] = newitem
+        newitem[_POS] = pos
+        self._siftdown(startpos, pos)
+
+
+def _lt(a, b):
+    # Whether PriorityQueue entry a goes before b.
+    pa = a[_PRIORITY]
+    pb = b[_PRIORITY]
+    return pa < pb or (a[_SEQ] < b[_SEQ] and not pb < pa)
 
 
 if __name__ == "__main__":
@@ -1,3 +1,3 @@
-metadata(version="0.9.3")
+metadata(version="0.10.0")
 
 module("heapq.py")
@@ -6,3 +6,38 @@ heapq.heappush(h, (10.1, 0))
 heapq.heappush(h, (1.1, 1))
 print(h)
 assert h == [(1.1, 1), (10.1, 0)]
+
+assert heapq.nsmallest(3, [5, 1, 4, 2, 3]) == [1, 2, 3]
+assert heapq.nlargest(2, iter([5, 1, 4, 2, 3])) == [5, 4]
+assert heapq.nlargest(2, ["bb", "a", "ccc"], key=len) == ["ccc", "bb"]
+assert heapq.nsmallest(1, []) == []
+assert heapq.nsmallest(2, iter([(1, "x"), (1, "y"), (0, "z")]), key=lambda t: t[0]) == [
+    (0, "z"),
+    (1, "x"),
+]
+
+assert list(heapq.merge([1, 3, 5], [2, 4], [])) == [1, 2, 3, 4, 5]
+assert list(heapq.merge([5, 3, 1], [4, 2], reverse=True)) == [5, 4, 3, 2, 1]
+assert list(heapq.merge(["dog", "horse"], ["cat", "fish", "kangaroo"], key=len)) == [
+    "dog",
+    "cat",
+    "fish",
+    "horse",
+    "kangaroo",
+]
+
+q = heapq.PriorityQueue()
+handles = [q.push(name, prio) for name, prio in (("a", 5), ("b", 3), ("c", 5), ("d", 1))]
+assert len(q) == 4
+assert q.peek() == (1, "d")
+q.decrease_key(handles[2], 2)
+q.remove(handles[1])
+assert handles[1] not in q
+try:
+    q.remove(handles[1])
+    assert False
+except ValueError:
+    pass
+q.push("e", 5)
+assert [q.pop() for _ in range(len(q))] == [(1, "d"), (2, "c"), (5, "a"), (5, "e")]
+assert not q
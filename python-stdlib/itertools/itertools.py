@@ -37,24 +37,48 @@ def islice(p, start, stop=(), step=1):
     if stop == ():
         stop = start
         start = 0
+    if start is None:
+        start = 0
     # TODO: optimizing or breaking semantics?
-    if start >= stop:
+    if stop is not None and start >= stop:
         return
     it = iter(p)
-    for i in range(start):
-        next(it)
-
-    while True:
-        yield next(it)
-        for i in range(step - 1):
+    try:
+        for i in range(start):
             next(it)
-        start += step
-        if start >= stop:
-            return
+
+        while True:
+            yield next(it)
+            for i in range(step - 1):
+                next(it)
+            start += step
+            if stop is not None and start >= stop:
+                return
+    except StopIteration:
+        return
 
 
 def tee(iterable, n=2):
-    return [iter(iterable)] * n
+    # The iterators share a singly-linked list of [value, next] cells, which
+    # is extended by whichever iterator is in front.  A cell is freed once
+    # the last iterator has moved past it, so memory use is bounded by how
+    # far apart the iterators are, not by the length of the input.
+    it = iter(iterable)
+    head = [None, None]
+    return tuple(_tee(it, head) for _ in range(n))
+
+
+def _tee(it, link):
+    while True:
+        nxt = link[1]
+        if nxt is None:
+            try:
+                value = next(it)
+            except StopIteration:
+                return
+            nxt = link[1] = [value, None]
+        link = nxt
+        yield link[0]
 
 
 def starmap(function, iterable):
@@ -72,3 +96,178 @@ def accumulate(iterable, func=lambda x, y: x + y):
     for element in it:
         acc = func(acc, element)
         yield acc
+
+
+def _identity(x):
+    return x
+
+
+def groupby(iterable, key=None):
+    keyfunc = _identity if key is None else key
+    iterator = iter(iterable)
+    exhausted = False
+
+    def _grouper(target_key):
+        nonlocal curr_value, curr_key, exhausted
+        yield curr_value
+        for curr_value in iterator:
+            curr_key = keyfunc(curr_value)
+            if curr_key != target_key:
+                return
+            yield curr_value
+        exhausted = True
+
+    try:
+        curr_value = next(iterator)
+    except StopIteration:
+        return
+    curr_key = keyfunc(curr_value)
+
+    while not exhausted:
+        target_key = curr_key
+        curr_group = _grouper(target_key)
+        yield curr_key, curr_group
+        # Skip whatever the caller didn't consume of this group.
+        if curr_key == target_key:
+            for _ in curr_group:
+                pass
+
+
+def product(*iterables, repeat=1):
+    # The inputs have to be stored, but the results are produced one at a
+    # time by advancing the indices like an odometer.
+    pools = [tuple(pool) for pool in iterables] * repeat
+    for pool in pools:
+        if not pool:
+            return
+    n = len(pools)
+    indices = [0] * n
+    while True:
+        yield tuple(pool[i] for pool, i in zip(pools, indices))
+        for k in range(n - 1, -1, -1):
+            indices[k] += 1
+            if indices[k] < len(pools[k]):
+                break
+            indices[k] = 0
+        else:
+            return
+
+
+def permutations(iterable, r=None):
+    pool = tuple(iterable)
+    n = len(pool)
+    r = n if r is None else r
+    if r > n:
+        return
+    indices = list(range(n))
+    cycles = list(range(n, n - r, -1))
+    yield tuple(pool[i] for i in indices[:r])
+    while n:
+        for i in range(r - 1, -1, -1):
+            cycles[i] -= 1
+            if cycles[i] == 0:
+                indices.append(indices.pop(i))
+                cycles[i] = n - i
+            else:
+                j = cycles[i]
+                indices[i], indices[-j] = indices[-j], indices[i]
+                yield tuple(pool[i] for i in indices[:r])
+                break
+        else:
+            return
+
+
+def combinations(iterable, r):
+    pool = tuple(iterable)
+    n = len(pool)
+    if r > n:
+        return
+    indices = list(range(r))
+    yield tuple(pool[i] for i in indices)
+    while True:
+        for i in range(r - 1, -1, -1):
+            if indices[i] != i + n - r:
+                break
+        else:
+            return
+        indices[i] += 1
+        for j in range(i + 1, r):
+            indices[j] = indices[j - 1] + 1
+        yield tuple(pool[i] for i in indices)
+
+
+def zip_longest(*iterables, fillvalue=None):
+    iterators = [iter(it) for it in iterables]
+    active = len(iterators)
+    if not active:
+        return
+    while True:
+        values = []
+        for i, it in enumerate(iterators):
+            try:
+                value = next(it)
+            except StopIteration:
+                active -= 1
+                if not active:
+                    return
+                iterators[i] = repeat(fillvalue)
+                value = fillvalue
+            values.append(value)
+        yield tuple(values)
+
+
+def pairwise(iterable):
+    it = iter(iterable)
+    try:
+        a = next(it)
+    except StopIteration:
+        return
+    for b in it:
+        yield a, b
+        a = b
+
+
+def batched(iterable, n):
+    # Checked here rather than in the generator, so that the error is
+    # raised by the call, as in CPython.
+    if n < 1:
+        raise ValueError("n must be at least one")
+    return _batched(iter(iterable), n)
+
+
+def _batched(it, n):
+    while True:
+        batch = tuple(islice(it, n))
+        if not batch:
+            return
+        yield batch
+
+
+def compress(data, selectors):
+    for d, s in zip(data, selectors):
+        if s:
+            yield d
+
+
+def dropwhile(predicate, iterable):
+    it = iter(iterable)
+    for x in it:
+        if not predicate(x):
+            yield x
+            break
+    yield from it
+
+
+def takewhile(predicate, iterable):
+    for x in iterable:
+        if not predicate(x):
+            return
+        yield x
+
+
+def filterfalse(predicate, iterable):
+    if predicate is None:
+        predicate = bool
+    for x in iterable:
+        if not predicate(x):
+            yield x
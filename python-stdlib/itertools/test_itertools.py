@@ -22,3 +22,66 @@ assert list(itertools.accumulate([0])) == [0]
 assert list(itertools.accumulate([0, 2, 3])) == [0, 2, 5]
 assert list(itertools.accumulate(reversed([0, 2, 3]))) == [3, 5, 5]
 assert list(itertools.accumulate([1, 2, 3], lambda x, y: x * y)) == [1, 2, 6]
+
+assert list(itertools.islice(range(10), 7, None)) == [7, 8, 9]
+assert list(itertools.islice(range(3), 5)) == [0, 1, 2]
+
+a, b = itertools.tee(iter([1, 2, 3]))
+assert next(a) == 1
+assert list(b) == [1, 2, 3]
+assert list(a) == [2, 3]
+a, b, c = itertools.tee(g(), 3)
+assert list(itertools.islice(a, 3)) == list(itertools.islice(b, 3)) == [123, 123, 123]
+assert next(c) == 123
+
+groups = [(k, list(v)) for k, v in itertools.groupby("aaabbcaa")]
+assert groups == [("a", ["a"] * 3), ("b", ["b"] * 2), ("c", ["c"]), ("a", ["a"] * 2)]
+assert [k for k, v in itertools.groupby([1, 3, 2, 4, 5], lambda x: x % 2)] == [1, 0, 1]
+assert list(itertools.groupby([])) == []
+
+assert list(itertools.product("ab", range(2))) == [("a", 0), ("a", 1), ("b", 0), ("b", 1)]
+assert len(list(itertools.product(range(3), repeat=3))) == 27
+assert list(itertools.product()) == [()]
+assert list(itertools.product("ab", [])) == []
+
+assert list(itertools.permutations(range(3), 2)) == [
+    (0, 1),
+    (0, 2),
+    (1, 0),
+    (1, 2),
+    (2, 0),
+    (2, 1),
+]
+assert len(list(itertools.permutations(range(4)))) == 24
+assert list(itertools.permutations(range(2), 3)) == []
+
+assert list(itertools.combinations("abcd", 2)) == [
+    ("a", "b"),
+    ("a", "c"),
+    ("a", "d"),
+    ("b", "c"),
+    ("b", "d"),
+    ("c", "d"),
+]
+assert list(itertools.combinations(range(3), 0)) == [()]
+assert list(itertools.combinations(range(3), 4)) == []
+
+assert list(itertools.zip_longest("abc", [1], fillvalue=0)) == [("a", 1), ("b", 0), ("c", 0)]
+assert list(itertools.zip_longest()) == []
+
+assert list(itertools.pairwise("abc")) == [("a", "b"), ("b", "c")]
+assert list(itertools.pairwise("a")) == []
+
+assert list(itertools.batched(range(7), 3)) == [(0, 1, 2), (3, 4, 5), (6,)]
+assert list(itertools.islice(itertools.batched(g(), 2), 2)) == [(123, 123), (123, 123)]
+try:
+    itertools.batched("abc", 0)
+    assert False, "ValueError expected"
+except ValueError:
+    pass
+
+assert list(itertools.compress("abcdef", [1, 0, 1, 0, 1, 1])) == ["a", "c", "e", "f"]
+assert list(itertools.dropwhile(lambda x: x < 5, [1, 4, 6, 4, 1])) == [6, 4, 1]
+assert list(itertools.takewhile(lambda x: x < 5, [1, 4, 6, 4, 1])) == [1, 4]
+assert list(itertools.filterfalse(lambda x: x % 2, range(10))) == [0, 2, 4, 6, 8]
+assert list(itertools.filterfalse(None, [0, 1, "", "a"])) == [0, ""]
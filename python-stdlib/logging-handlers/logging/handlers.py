@@ -0,0 +1,326 @@
+"""Additional handlers for the logging module.
+
+QueueHandler and QueueListener decouple logging calls from the (possibly
+slow) handlers that write records out.  The QueueHandler copies each record
+into a preallocated ring buffer and an asyncio task run by the QueueListener
+drains it to the real handlers, so writing to a UART or to flash never
+blocks the code doing the logging.  When the buffer is full new records are
+dropped and counted rather than waited for.
+
+    import asyncio, logging, logging.handlers
+
+    queue = logging.handlers.RecordQueue(32)
+    listener = logging.handlers.QueueListener(queue, logging.StreamHandler())
+    logging.getLogger().addHandler(logging.handlers.QueueHandler(queue))
+
+    async def main():
+        listener.start()
+        logging.warning("logged without blocking")
+        ...
+        listener.stop()
+
+RotatingFileHandler and TimedRotatingFileHandler write to a file that is
+rotated once it reaches a given size or age.  The size is tracked as records
+are written (the file is only stat'ed when opened), rotation renames files
+rather than copying them, and rotated files can optionally be gzip
+compressed.  Records can also be buffered in RAM and written out in larger
+chunks to reduce the number of writes to flash:
+
+    handler = logging.handlers.RotatingFileHandler(
+        "app.log", maxBytes=16384, backupCount=3, compress=True, bufferSize=512
+    )
+"""
+
+import asyncio
+import logging
+import os
+import time
+
+
+class RecordQueue:
+    # Fixed-size ring of preallocated LogRecord slots.  put_nowait() copies a
+    # record into the next free slot and the consumer reads the oldest slot
+    # with peek() and only releases it with pop() once it has been handled,
+    # so a slot is never overwritten while it is being emitted.
+    def __init__(self, maxsize=16):
+        self._slots = [logging.LogRecord() for _ in range(maxsize)]
+        self._head = 0
+        self._len = 0
+        self._event = asyncio.Event()
+        # Number of records discarded because the queue was full.
+        self.dropped = 0
+
+    def qsize(self):
+        return self._len
+
+    def empty(self):
+        return self._len == 0
+
+    def full(self):
+        return self._len == len(self._slots)
+
+    def put_nowait(self, record):
+        n = len(self._slots)
+        if self._len == n:
+            self.dropped += 1
+            return
+        slot = self._slots[(self._head + self._len) % n]
+        slot.name = record.name
+        slot.levelno = record.levelno
+        slot.levelname = record.levelname
+        slot.msg = record.msg
+        slot.args = record.args
+        slot.message = record.message
+        slot.ct = record.ct
+        slot.asctime = record.asctime
+        self._len += 1
+        self._event.set()
+
+    def peek(self):
+        return self._slots[self._head] if self._len else None
+
+    def pop(self):
+        if self._len:
+            self._head = (self._head + 1) % len(self._slots)
+            self._len -= 1
+
+    async def wait(self):
+        await self._event.wait()
+        self._event.clear()
+
+
+class QueueHandler(logging.Handler):
+    def __init__(self, queue):
+        super().__init__()
+        self.queue = queue
+
+    def emit(self, record):
+        if record.levelno >= self.level:
+            self.queue.put_nowait(record)
+
+
+class QueueListener:
+    def __init__(self, queue, *handlers, respect_handler_level=False):
+        self.queue = queue
+        self.handlers = handlers
+        self.respect_handler_level = respect_handler_level
+        self._task = None
+
+    def handle(self, record):
+        for h in self.handlers:
+            if not self.respect_handler_level or record.levelno >= h.level:
+                h.emit(record)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        # Cancel the draining task and write out whatever is still queued.
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        q = self.queue
+        while q._len:
+            self.handle(q.peek())
+            q.pop()
+
+    async def _run(self):
+        q = self.queue
+        while True:
+            await q.wait()
+            while q._len:
+                self.handle(q.peek())
+                q.pop()
+                # Let other tasks run between (potentially slow) writes.
+                await asyncio.sleep(0)
+
+
+def _exists(path):
+    try:
+        os.stat(path)
+        return True
+    except OSError:
+        return False
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _rename(src, dst):
+    # Not all filesystems allow renaming over an existing file.
+    _remove(dst)
+    os.rename(src, dst)
+
+
+def _compress(src, dst):
+    import deflate
+
+    buf = bytearray(256)
+    mv = memoryview(buf)
+    with open(src, "rb") as f:
+        with deflate.DeflateIO(open(dst, "wb"), deflate.GZIP, 0, True) as g:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                g.write(mv[:n])
+    os.remove(src)
+
+
+class BaseRotatingHandler(logging.FileHandler):
+    # Common behaviour of the rotating handlers: optional buffering of
+    # formatted records (written out once bufferSize characters are pending
+    # or a record at or above flushLevel arrives), and moving the current
+    # file aside when shouldRollover() says so.
+    def __init__(self, filename, mode, encoding, compress, bufferSize, flushLevel):
+        super().__init__(filename, mode, encoding)
+        self.baseFilename = filename
+        self.encoding = encoding
+        self.compress = compress
+        self.bufferSize = bufferSize
+        self.flushLevel = flushLevel
+        self._buf = []
+        self._buflen = 0
+
+    def flush(self):
+        if self._buf:
+            self.stream.write("".join(self._buf))
+            self._buf = []
+            self._buflen = 0
+        self.stream.flush()
+
+    def close(self):
+        self.flush()
+        super().close()
+
+    def shouldRollover(self, record, size):
+        return False
+
+    def rotate(self, source, dest):
+        if self.compress:
+            _compress(source, dest + ".gz")
+        else:
+            _rename(source, dest)
+
+    def doRollover(self):
+        self.flush()
+        self.stream.close()
+        self.rotateFiles()
+        self.stream = open(self.baseFilename, "w", encoding=self.encoding)
+
+    def emit(self, record):
+        if record.levelno >= self.level:
+            s = self.format(record) + self.terminator
+            n = len(s)
+            if self.shouldRollover(record, n):
+                self.doRollover()
+            if self.bufferSize:
+                self._buf.append(s)
+                self._buflen += n
+                if self._buflen >= self.bufferSize or record.levelno >= self.flushLevel:
+                    self.flush()
+            else:
+                self.stream.write(s)
+
+
+class RotatingFileHandler(BaseRotatingHandler):
+    def __init__(
+        self,
+        filename,
+        mode="a",
+        maxBytes=0,
+        backupCount=0,
+        encoding="UTF-8",
+        *,
+        compress=False,
+        bufferSize=0,
+        flushLevel=logging.ERROR,
+    ):
+        super().__init__(filename, mode, encoding, compress, bufferSize, flushLevel)
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        # Track the file size as records are written rather than calling
+        # stat() for each one.  This counts characters, so it undercounts
+        # the size in bytes of non-ASCII text.
+        self._size = os.stat(filename)[6]
+
+    def shouldRollover(self, record, size):
+        self._size += size
+        if self.maxBytes > 0 and self._size > self.maxBytes and self._size > size:
+            self._size = size
+            return True
+        return False
+
+    def rotateFiles(self):
+        base = self.baseFilename
+        if self.backupCount > 0:
+            ext = ".gz" if self.compress else ""
+            for i in range(self.backupCount - 1, 0, -1):
+                src = "%s.%d%s" % (base, i, ext)
+                if _exists(src):
+                    _rename(src, "%s.%d%s" % (base, i + 1, ext))
+            self.rotate(base, base + ".1")
+
+
+_INTERVALS = {"S": 1, "M": 60, "H": 3600, "D": 86400, "MIDNIGHT": 86400}
+
+
+class TimedRotatingFileHandler(BaseRotatingHandler):
+    def __init__(
+        self,
+        filename,
+        when="h",
+        interval=1,
+        backupCount=0,
+        encoding="UTF-8",
+        utc=False,
+        *,
+        compress=False,
+        bufferSize=0,
+        flushLevel=logging.ERROR,
+    ):
+        self.when = when.upper()
+        if self.when not in _INTERVALS:
+            raise ValueError("invalid rollover interval: " + when)
+        super().__init__(filename, "a", encoding, compress, bufferSize, flushLevel)
+        self.interval = _INTERVALS[self.when] * interval
+        self.backupCount = backupCount
+        self.utc = utc
+        self.rolloverAt = self.computeRollover(time.time())
+
+    def _timetuple(self, t):
+        return time.gmtime(t) if self.utc else time.localtime(t)
+
+    def computeRollover(self, t):
+        t = int(t)
+        if self.when == "MIDNIGHT":
+            tm = self._timetuple(t)
+            return t - tm[3] * 3600 - tm[4] * 60 - tm[5] + self.interval
+        return t + self.interval
+
+    def shouldRollover(self, record, size):
+        return record.ct >= self.rolloverAt
+
+    def rotateFiles(self):
+        # Rotated files are named after the start of the interval they cover.
+        base = self.baseFilename
+        t = self.rolloverAt - self.interval
+        self.rotate(base, base + ".%04d-%02d-%02d_%02d-%02d-%02d" % self._timetuple(t)[:6])
+        if self.backupCount > 0:
+            for name in self.getFilesToDelete():
+                _remove(name)
+        self.rolloverAt = self.computeRollover(time.time())
+
+    def getFilesToDelete(self):
+        # The timestamp suffix sorts chronologically, so the oldest files
+        # come first.
+        i = self.baseFilename.rfind("/") + 1
+        dirname = self.baseFilename[:i]
+        prefix = self.baseFilename[i:] + "."
+        names = sorted(name for name in os.listdir(dirname or ".") if name.startswith(prefix))
+        return [dirname + name for name in names[: max(0, len(names) - self.backupCount)]]
@@ -0,0 +1,4 @@
+metadata(description="Additional handlers for the logging module.", version="0.2.2")
+
+require("logging")
+package("logging")
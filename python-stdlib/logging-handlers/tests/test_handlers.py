@@ -0,0 +1,208 @@
+import asyncio
+import io
+import logging
+import logging.handlers
+import os
+import unittest
+
+try:
+    import deflate
+except ImportError:
+    deflate = None
+
+
+def _make_logger(name, *handlers):
+    log = logging.getLogger(name)
+    log.setLevel(logging.DEBUG)
+    log.handlers = []
+    for h in handlers:
+        log.addHandler(h)
+    return log
+
+
+def _stream_handler():
+    stream = io.StringIO()
+    handler = logging.StreamHandler(stream)
+    handler.setFormatter(logging.Formatter("%(levelname)s:%(message)s"))
+    return stream, handler
+
+
+class TestQueueHandler(unittest.TestCase):
+    def test_records_are_copied(self):
+        queue = logging.handlers.RecordQueue(4)
+        log = _make_logger("test_copied", logging.handlers.QueueHandler(queue))
+        log.info("one")
+        log.warning("two")
+        self.assertEqual(queue.qsize(), 2)
+        self.assertEqual(queue.peek().message, "one")
+        self.assertEqual(queue.peek().levelname, "INFO")
+        queue.pop()
+        self.assertEqual(queue.peek().message, "two")
+        queue.pop()
+        self.assertTrue(queue.empty())
+        self.assertIsNone(queue.peek())
+
+    def test_drops_when_full(self):
+        queue = logging.handlers.RecordQueue(2)
+        log = _make_logger("test_drops", logging.handlers.QueueHandler(queue))
+        for i in range(5):
+            log.info("msg %d", i)
+        self.assertTrue(queue.full())
+        self.assertEqual(queue.dropped, 3)
+        self.assertEqual(queue.peek().message, "msg 0")
+
+    def test_ring_wraps(self):
+        queue = logging.handlers.RecordQueue(3)
+        log = _make_logger("test_wraps", logging.handlers.QueueHandler(queue))
+        result = []
+        for i in range(10):
+            log.info("msg %d", i)
+            result.append(queue.peek().message)
+            queue.pop()
+        self.assertEqual(result, ["msg %d" % i for i in range(10)])
+        self.assertEqual(queue.dropped, 0)
+
+    def test_handler_level(self):
+        queue = logging.handlers.RecordQueue(4)
+        handler = logging.handlers.QueueHandler(queue)
+        handler.setLevel(logging.ERROR)
+        log = _make_logger("test_level", handler)
+        log.warning("ignored")
+        log.error("queued")
+        self.assertEqual(queue.qsize(), 1)
+
+
+class TestQueueListener(unittest.TestCase):
+    def test_listener_drains(self):
+        stream, target = _stream_handler()
+        queue = logging.handlers.RecordQueue(8)
+        listener = logging.handlers.QueueListener(queue, target)
+        log = _make_logger("test_drain", logging.handlers.QueueHandler(queue))
+
+        async def main():
+            listener.start()
+            log.info("a")
+            log.error("b")
+            self.assertEqual(stream.getvalue(), "")
+            for _ in range(4):
+                await asyncio.sleep(0)
+            self.assertEqual(stream.getvalue(), "INFO:a\nERROR:b\n")
+            log.debug("c")
+            listener.stop()
+
+        asyncio.run(main())
+        self.assertEqual(stream.getvalue(), "INFO:a\nERROR:b\nDEBUG:c\n")
+        self.assertTrue(queue.empty())
+
+    def test_respect_handler_level(self):
+        stream, target = _stream_handler()
+        target.setLevel(logging.ERROR)
+        queue = logging.handlers.RecordQueue(8)
+        listener = logging.handlers.QueueListener(queue, target, respect_handler_level=True)
+        log = _make_logger("test_respect", logging.handlers.QueueHandler(queue))
+        log.info("a")
+        log.error("b")
+        listener.stop()
+        self.assertEqual(stream.getvalue(), "ERROR:b\n")
+
+
+class TestRotatingFileHandler(unittest.TestCase):
+    FILENAME = "test_rotating.log"
+
+    def tearDown(self):
+        for name in os.listdir("."):
+            if name.startswith(self.FILENAME):
+                os.remove(name)
+
+    def _read(self, name):
+        with open(name) as f:
+            return f.read()
+
+    def _log(self, handler, *msgs):
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = _make_logger("test_rotating", handler)
+        for msg in msgs:
+            log.info(msg)
+        handler.close()
+
+    def test_rotate(self):
+        handler = logging.handlers.RotatingFileHandler(
+            self.FILENAME, mode="w", maxBytes=10, backupCount=2
+        )
+        self._log(handler, "aaaa", "bbbb", "cccc", "dddd", "eeee")
+        self.assertEqual(self._read(self.FILENAME), "eeee\n")
+        self.assertEqual(self._read(self.FILENAME + ".1"), "cccc\ndddd\n")
+        self.assertEqual(self._read(self.FILENAME + ".2"), "aaaa\nbbbb\n")
+        self.assertNotIn(self.FILENAME + ".3", os.listdir("."))
+
+    def test_append_counts_existing_size(self):
+        with open(self.FILENAME, "w") as f:
+            f.write("0123456789")
+        handler = logging.handlers.RotatingFileHandler(self.FILENAME, maxBytes=12, backupCount=1)
+        self._log(handler, "aaaa")
+        self.assertEqual(self._read(self.FILENAME), "aaaa\n")
+        self.assertEqual(self._read(self.FILENAME + ".1"), "0123456789")
+
+    def test_no_backups_truncates(self):
+        handler = logging.handlers.RotatingFileHandler(self.FILENAME, mode="w", maxBytes=6)
+        self._log(handler, "aaaa", "bbbb")
+        self.assertEqual(self._read(self.FILENAME), "bbbb\n")
+        self.assertEqual(os.listdir(".").count(self.FILENAME), 1)
+
+    def test_buffered(self):
+        handler = logging.handlers.RotatingFileHandler(self.FILENAME, mode="w", bufferSize=8)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = _make_logger("test_buffered", handler)
+        log.info("aa")
+        self.assertEqual(self._read(self.FILENAME), "")
+        log.info("bbbb")
+        self.assertEqual(self._read(self.FILENAME), "aa\nbbbb\n")
+        log.info("cc")
+        log.error("dd")
+        self.assertEqual(self._read(self.FILENAME), "aa\nbbbb\ncc\ndd\n")
+        handler.close()
+
+    @unittest.skipUnless(deflate and hasattr(deflate.DeflateIO, "write"), "needs deflate")
+    def test_compress(self):
+        handler = logging.handlers.RotatingFileHandler(
+            self.FILENAME, mode="w", maxBytes=10, backupCount=2, compress=True
+        )
+        self._log(handler, "aaaa", "bbbb", "cccc", "dddd", "eeee")
+        self.assertEqual(self._read(self.FILENAME), "eeee\n")
+        self.assertIn(self.FILENAME + ".1.gz", os.listdir("."))
+        self.assertIn(self.FILENAME + ".2.gz", os.listdir("."))
+        self.assertNotIn(self.FILENAME + ".1", os.listdir("."))
+
+
+class TestTimedRotatingFileHandler(unittest.TestCase):
+    FILENAME = "test_timed.log"
+
+    def tearDown(self):
+        for name in os.listdir("."):
+            if name.startswith(self.FILENAME):
+                os.remove(name)
+
+    def test_rotate(self):
+        handler = logging.handlers.TimedRotatingFileHandler(
+            self.FILENAME, when="S", interval=1000, backupCount=2
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        log = _make_logger("test_timed", handler)
+        log.info("first")
+        for i in range(4):
+            # Pretend the interval has elapsed.
+            handler.rolloverAt -= 1000 + i
+            log.info("msg %d", i)
+        handler.close()
+        names = [name for name in os.listdir(".") if name.startswith(self.FILENAME + ".")]
+        self.assertEqual(len(names), 2)
+        with open(self.FILENAME) as f:
+            self.assertEqual(f.read(), "msg 3\n")
+
+    def test_invalid_when(self):
+        with self.assertRaises(ValueError):
+            logging.handlers.TimedRotatingFileHandler(self.FILENAME, when="X")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,408 @@
+from micropython import const
+import io
+import sys
+import time
+
+CRITICAL = const(50)
+ERROR = const(40)
+WARNING = const(30)
+INFO = const(20)
+DEBUG = const(10)
+NOTSET = const(0)
+
+_DEFAULT_LEVEL = const(WARNING)
+
+_level_dict = {
+    CRITICAL: "CRITICAL",
+    ERROR: "ERROR",
+    WARNING: "WARNING",
+    INFO: "INFO",
+    DEBUG: "DEBUG",
+    NOTSET: "NOTSET",
+}
+
+_loggers = {}
+_stream = sys.stderr
+
+# Loggers cache their effective level and the list of handlers to call.  The
+# caches are invalidated by bumping this counter whenever the configuration
+# of any logger changes, by setting its level, handlers or propagate, via
+# setLevel(), addHandler() or removeHandler(), or when a new logger is added
+# to the hierarchy.
+_generation = 0
+
+
+def _changed():
+    global _generation
+    _generation += 1
+
+
+_default_fmt = "%(levelname)s:%(name)s:%(message)s"
+_default_datefmt = "%Y-%m-%d %H:%M:%S"
+
+
+class LogRecord:
+    def set(self, name, level, msg, args=()):
+        self.name = name
+        self.levelno = level
+        self.levelname = _level_dict[level]
+        # The unformatted message and its arguments are kept for handlers
+        # that encode them separately.
+        if args and isinstance(args[0], dict):
+            args = args[0]
+        self.msg = msg
+        self.args = args
+        self.message = msg % args if args else msg
+        self._ct = None
+        self.asctime = None
+
+    # The creation time is only looked up when a formatter or handler asks
+    # for it, so records that are never timestamped don't pay for it.
+    @property
+    def ct(self):
+        if self._ct is None:
+            self._ct = time.time()
+        return self._ct
+
+    @ct.setter
+    def ct(self, ct):
+        self._ct = ct
+
+    @property
+    def msecs(self):
+        ct = self.ct
+        return int((ct - int(ct)) * 1000)
+
+
+class Handler:
+    def __init__(self, level=NOTSET):
+        self.level = level
+        self.formatter = None
+
+    def close(self):
+        pass
+
+    def setLevel(self, level):
+        self.level = level
+
+    def setFormatter(self, formatter):
+        self.formatter = formatter
+
+    def format(self, record):
+        return self.formatter.format(record)
+
+
+class StreamHandler(Handler):
+    def __init__(self, stream=None):
+        super().__init__()
+        self.stream = _stream if stream is None else stream
+        self.terminator = "\n"
+
+    def close(self):
+        if hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def emit(self, record):
+        if record.levelno >= self.level:
+            self.stream.write(self.format(record) + self.terminator)
+
+
+class FileHandler(StreamHandler):
+    def __init__(self, filename, mode="a", encoding="UTF-8"):
+        super().__init__(stream=open(filename, mode=mode, encoding=encoding))
+
+    def close(self):
+        super().close()
+        self.stream.close()
+
+
+def _compile(fmt):
+    # Split a %-style format string into a positional template and the
+    # names of the record attributes it refers to, e.g.
+    # "%(levelname)s:%(message)s" -> ("%s:%s", ("levelname", "message")).
+    template = []
+    fields = []
+    i = j = 0
+    while True:
+        j = fmt.find("%", j)
+        if j < 0:
+            break
+        if fmt.startswith("%%", j):
+            # A literal "%", left as it is for the % operator.
+            j += 2
+            continue
+        if not fmt.startswith("%(", j):
+            j += 1
+            continue
+        k = fmt.find(")", j)
+        if k < 0:
+            break
+        template.append(fmt[i : j + 1])
+        fields.append(fmt[j + 2 : k])
+        i = j = k + 1
+    template.append(fmt[i:])
+    return "".join(template), tuple(fields)
+
+
+class Formatter:
+    def __init__(self, fmt=None, datefmt=None):
+        self.fmt = _default_fmt if fmt is None else fmt
+        self.datefmt = _default_datefmt if datefmt is None else datefmt
+        self._template, self._fields = _compile(self.fmt)
+
+    def usesTime(self):
+        return "asctime" in self._fields
+
+    def formatTime(self, datefmt, record):
+        if hasattr(time, "strftime"):
+            return time.strftime(datefmt, time.localtime(record.ct))
+        return None
+
+    def format(self, record):
+        if self.usesTime():
+            record.asctime = self.formatTime(self.datefmt, record)
+        # Only the fields used by the format string are looked up.
+        return self._template % tuple(getattr(record, f) for f in self._fields)
+
+
+class Logger:
+    def __init__(self, name, level=NOTSET):
+        self.name = name
+        self.level = level
+        self.handlers = []
+        self.parent = None
+        self.propagate = True
+        self.record = LogRecord()
+        self._generation = -1
+
+    # Setting any of these invalidates the cached effective level and
+    # handlers, of this logger and of its descendants.
+    @property
+    def level(self):
+        return self._level
+
+    @level.setter
+    def level(self, level):
+        self._level = level
+        _changed()
+
+    @property
+    def handlers(self):
+        return self._handlers
+
+    @handlers.setter
+    def handlers(self, handlers):
+        self._handlers = handlers
+        _changed()
+
+    @property
+    def propagate(self):
+        return self._propagate
+
+    @propagate.setter
+    def propagate(self, propagate):
+        self._propagate = propagate
+        _changed()
+
+    def _update(self):
+        # The effective level is the first level set on this logger or its
+        # ancestors, and the handlers are those of this logger and of its
+        # ancestors up to the first one which doesn't propagate.
+        level = NOTSET
+        logger = self
+        while logger and not level:
+            level = logger.level
+            logger = logger.parent
+        handlers = []
+        logger = self
+        while logger:
+            handlers.extend(logger.handlers)
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        self._effective_level = level or _DEFAULT_LEVEL
+        self._effective_handlers = handlers or [lastResort]
+        self._generation = _generation
+
+    def setLevel(self, level):
+        self.level = level
+
+    def isEnabledFor(self, level):
+        return level >= self.getEffectiveLevel()
+
+    def getEffectiveLevel(self):
+        if self._generation != _generation:
+            self._update()
+        return self._effective_level
+
+    def getChild(self, suffix):
+        if self.parent is None:
+            return getLogger(suffix)
+        return getLogger(self.name + "." + suffix)
+
+    def log(self, level, msg, *args):
+        if self._generation != _generation:
+            self._update()
+        if level >= self._effective_level:
+            record = None
+            for h in self._effective_handlers:
+                if level >= h.level:
+                    # Defer formatting the message until a handler wants it.
+                    if record is None:
+                        record = self.record
+                        record.set(self.name, level, msg, args)
+                    h.emit(record)
+
+    def debug(self, msg, *args):
+        self.log(DEBUG, msg, *args)
+
+    def info(self, msg, *args):
+        self.log(INFO, msg, *args)
+
+    def warning(self, msg, *args):
+        self.log(WARNING, msg, *args)
+
+    def error(self, msg, *args):
+        self.log(ERROR, msg, *args)
+
+    def critical(self, msg, *args):
+        self.log(CRITICAL, msg, *args)
+
+    def exception(self, msg, *args, exc_info=True):
+        self.log(ERROR, msg, *args)
+        tb = None
+        if isinstance(exc_info, BaseException):
+            tb = exc_info
+        elif hasattr(sys, "exc_info"):
+            tb = sys.exc_info()[1]
+        if tb:
+            buf = io.StringIO()
+            sys.print_exception(tb, buf)
+            self.log(ERROR, buf.getvalue())
+
+    def addHandler(self, handler):
+        self.handlers.append(handler)
+        _changed()
+
+    def removeHandler(self, handler):
+        if handler in self.handlers:
+            self.handlers.remove(handler)
+            _changed()
+
+    def hasHandlers(self):
+        logger = self
+        while logger:
+            if logger.handlers:
+                return True
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        return False
+
+
+def _root():
+    root = _loggers.get("root")
+    if root is None:
+        root = _loggers["root"] = Logger("root", WARNING)
+    return root
+
+
+def getLogger(name=None):
+    if name is None or name == "root":
+        return _root()
+    logger = _loggers.get(name)
+    if logger is None:
+        logger = _loggers[name] = Logger(name)
+        # Find the closest existing ancestor in the dotted hierarchy.
+        parent = name
+        while logger.parent is None:
+            i = parent.rfind(".")
+            if i < 0:
+                logger.parent = _root()
+            else:
+                parent = parent[:i]
+                logger.parent = _loggers.get(parent)
+        # Adopt existing descendants whose parent is further up the tree.
+        prefix = name + "."
+        for child in _loggers.values():
+            if child.name.startswith(prefix) and not child.parent.name.startswith(prefix):
+                child.parent = logger
+        _changed()
+    return logger
+
+
+def log(level, msg, *args):
+    getLogger().log(level, msg, *args)
+
+
+def debug(msg, *args):
+    getLogger().debug(msg, *args)
+
+
+def info(msg, *args):
+    getLogger().info(msg, *args)
+
+
+def warning(msg, *args):
+    getLogger().warning(msg, *args)
+
+
+def error(msg, *args):
+    getLogger().error(msg, *args)
+
+
+def critical(msg, *args):
+    getLogger().critical(msg, *args)
+
+
+def exception(msg, *args, exc_info=True):
+    getLogger().exception(msg, *args, exc_info=exc_info)
+
+
+def shutdown():
+    for k, logger in _loggers.items():
+        for h in logger.handlers:
+            h.close()
+        _loggers.pop(logger, None)
+
+
+def addLevelName(level, name):
+    _level_dict[level] = name
+
+
+def basicConfig(
+    filename=None,
+    filemode="a",
+    format=None,
+    datefmt=None,
+    level=WARNING,
+    stream=None,
+    encoding="UTF-8",
+    force=False,
+):
+    logger = _root()
+
+    if force or not logger.handlers:
+        for h in logger.handlers:
+            h.close()
+        logger.handlers = []
+
+        if filename is None:
+            handler = StreamHandler(stream)
+        else:
+            handler = FileHandler(filename, filemode, encoding)
+
+        handler.setLevel(level)
+        handler.setFormatter(Formatter(format, datefmt))
+
+        logger.setLevel(level)
+        logger.addHandler(handler)
+
+
+# Used when no handlers are found for a logger.
+lastResort = StreamHandler()
+lastResort.setLevel(WARNING)
+lastResort.setFormatter(Formatter())
+
+if hasattr(sys, "atexit"):
+    sys.atexit(shutdown)
@@ -0,0 +1,170 @@
+import io
+import logging
+import unittest
+
+
+class CountingHandler(logging.Handler):
+    def __init__(self, level=logging.NOTSET):
+        super().__init__(level)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelname, record.message))
+
+
+class Arg:
+    # Counts how many times it is formatted into a message.
+    def __init__(self):
+        self.count = 0
+
+    def __str__(self):
+        self.count += 1
+        return "arg"
+
+
+def _make_logger(name, *handlers):
+    log = logging.getLogger(name)
+    log.setLevel(logging.DEBUG)
+    log.handlers = []
+    for h in handlers:
+        log.addHandler(h)
+    return log
+
+
+class TestFormatter(unittest.TestCase):
+    def _record(self, level=logging.INFO, message="hello"):
+        record = logging.LogRecord()
+        record.set("test", level, message)
+        return record
+
+    def test_default(self):
+        self.assertEqual(logging.Formatter().format(self._record()), "INFO:test:hello")
+
+    def test_fields(self):
+        f = logging.Formatter("[%(levelno)3d] %(name)-6s|%(message)s %%")
+        self.assertEqual(f.format(self._record()), "[ 20] test  |hello %")
+        self.assertFalse(f.usesTime())
+
+    def test_escaped_percent(self):
+        f = logging.Formatter("%%(name)s %(message)s 100%%")
+        self.assertEqual(f.format(self._record()), "%(name)s hello 100%")
+        self.assertEqual(f._fields, ("message",))
+
+    def test_no_fields(self):
+        self.assertEqual(logging.Formatter("plain").format(self._record()), "plain")
+
+    def test_msecs(self):
+        record = self._record()
+        record.ct = 12.345
+        f = logging.Formatter("%(msecs)03d")
+        self.assertEqual(f.format(record), "345")
+
+    def test_time_is_lazy(self):
+        record = self._record()
+        logging.Formatter("%(message)s").format(record)
+        self.assertIsNone(record._ct)
+        self.assertIsNotNone(record.ct)
+
+
+class TestLazyMessage(unittest.TestCase):
+    def test_not_formatted_below_handler_level(self):
+        handler = CountingHandler(logging.WARNING)
+        log = _make_logger("test_lazy", handler)
+        arg = Arg()
+        log.debug("value %s", arg)
+        self.assertEqual(arg.count, 0)
+        self.assertEqual(handler.records, [])
+        log.warning("value %s", arg)
+        self.assertEqual(arg.count, 1)
+        self.assertEqual(handler.records, [("WARNING", "value arg")])
+
+    def test_formatted_once(self):
+        handlers = (CountingHandler(), CountingHandler())
+        log = _make_logger("test_once", *handlers)
+        arg = Arg()
+        log.info("value %s", arg)
+        self.assertEqual(arg.count, 1)
+        for h in handlers:
+            self.assertEqual(h.records, [("INFO", "value arg")])
+
+    def test_dict_args(self):
+        handler = CountingHandler()
+        log = _make_logger("test_dict", handler)
+        log.info("%(a)s-%(b)s", {"a": 1, "b": 2})
+        self.assertEqual(handler.records, [("INFO", "1-2")])
+
+    def test_stream_handler(self):
+        stream = io.StringIO()
+        handler = logging.StreamHandler(stream)
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        log = _make_logger("test_stream", handler)
+        log.info("a %d", 1)
+        self.assertEqual(stream.getvalue(), "INFO a 1\n")
+
+
+class TestHierarchy(unittest.TestCase):
+    def test_parents(self):
+        c = logging.getLogger("h1.b.c")
+        self.assertIs(c.parent, logging.getLogger())
+        a = logging.getLogger("h1")
+        self.assertIs(c.parent, a)
+        b = logging.getLogger("h1.b")
+        self.assertIs(c.parent, b)
+        self.assertIs(b.parent, a)
+        self.assertIs(a.getChild("b"), b)
+        self.assertIs(logging.getLogger("h1.bb").parent, a)
+
+    def test_effective_level(self):
+        a = logging.getLogger("h2")
+        c = logging.getLogger("h2.b.c")
+        a.setLevel(logging.ERROR)
+        self.assertEqual(c.getEffectiveLevel(), logging.ERROR)
+        self.assertFalse(c.isEnabledFor(logging.WARNING))
+        a.setLevel(logging.DEBUG)
+        self.assertEqual(c.getEffectiveLevel(), logging.DEBUG)
+        logging.getLogger("h2.b").setLevel(logging.INFO)
+        self.assertEqual(c.getEffectiveLevel(), logging.INFO)
+        c.setLevel(logging.CRITICAL)
+        self.assertEqual(c.getEffectiveLevel(), logging.CRITICAL)
+
+    def test_propagate(self):
+        ha = CountingHandler()
+        hc = CountingHandler()
+        a = _make_logger("h3", ha)
+        c = _make_logger("h3.b.c", hc)
+        c.info("one")
+        self.assertEqual(ha.records, [("INFO", "one")])
+        self.assertEqual(hc.records, [("INFO", "one")])
+        c.propagate = False
+        c.removeHandler(hc)
+        self.assertFalse(c.hasHandlers())
+        c.addHandler(hc)
+        c.info("two")
+        self.assertEqual(len(ha.records), 1)
+        self.assertEqual(len(hc.records), 2)
+        a.removeHandler(ha)
+        a.info("three")
+        self.assertEqual(len(ha.records), 1)
+
+    def test_attributes_invalidate_cache(self):
+        ha = CountingHandler()
+        hc = CountingHandler()
+        _make_logger("h4", ha)
+        c = _make_logger("h4.c", hc)
+        c.info("one")
+        c.propagate = False
+        c.info("two")
+        self.assertEqual(len(ha.records), 1)
+        self.assertEqual(len(hc.records), 2)
+        c.level = logging.ERROR
+        c.info("three")
+        self.assertEqual(len(hc.records), 2)
+        c.handlers = []
+        c.propagate = True
+        c.error("four")
+        self.assertEqual(len(ha.records), 2)
+        self.assertEqual(len(hc.records), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+# Compare the size and speed of the binary pickle format with the repr()/eval()
+# format used by earlier versions of this module.
+
+import pickle
+import time
+
+try:
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_us = lambda: int(time.perf_counter() * 1000000)
+    ticks_diff = lambda a, b: a - b
+
+
+def repr_dumps(obj):
+    return repr(obj).encode()
+
+
+def repr_loads(data):
+    return eval(data.decode(), {})
+
+
+def timeit(f, arg, n):
+    t = ticks_us()
+    for _ in range(n):
+        f(arg)
+    return ticks_diff(ticks_us(), t) // n
+
+
+def bench(name, obj, n=10):
+    binary = pickle.dumps(obj)
+    text = repr_dumps(obj)
+    assert pickle.loads(binary) == obj
+    print("%s:" % name)
+    print("  size    pickle %8d bytes   repr %8d bytes" % (len(binary), len(text)))
+    print(
+        "  dumps   pickle %8d us      repr %8d us"
+        % (timeit(pickle.dumps, obj, n), timeit(repr_dumps, obj, n))
+    )
+    print(
+        "  loads   pickle %8d us      repr %8d us"
+        % (timeit(pickle.loads, binary, n), timeit(repr_loads, text, n))
+    )
+
+
+# A state dict with repeated keys, as typically persisted between reboots.
+readings = [
+    {"sensor": "temperature", "value": 20.5 + i / 10, "ts": 700000000 + i, "ok": True}
+    for i in range(200)
+]
+bench("list of 200 dicts", readings)
+bench("10000 small ints", list(range(10000)), 5)
+bench("100 x 100 byte strings", [bytes(100)] * 100)
+nested = []
+for i in range(50):
+    nested = [i, "level", nested]
+bench("50 levels of nesting", nested)
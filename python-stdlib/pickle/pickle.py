@@ -1,22 +1,563 @@
-HIGHEST_PROTOCOL = 0
+"""Subset of the CPython pickle module.
 
+Objects are serialised using the binary pickle format (protocol 3 or 4 when
+writing, protocols 2 to 5 when reading), so pickles can be exchanged with
+CPython.  The supported types are None, bool, int, float, str, bytes,
+bytearray, list, tuple, dict, set and frozenset, plus objects that are
+pickled as a reference to a global (e.g. a class or function) and objects
+implementing __reduce__.
 
-def dump(obj, f, proto=0):
-    f.write(repr(obj))
+Shared and recursive references are preserved using a memo, and pickles
+are read and written incrementally by the Pickler and Unpickler classes.
 
+When loading, globals are only looked up if they are in a small allowlist
+of safe builtins.  To allow others, subclass Unpickler and override
+find_class().
 
-def dumps(obj, proto=0):
-    return repr(obj).encode()
+Data written by earlier versions of this module, which used repr(), is
+not loaded by load() or loads().  loads_legacy() loads it, using eval(), so
+it must only be given trusted data.
+"""
 
+from micropython import const
+import io
+import struct
 
-def load(f):
-    s = f.read()
-    return loads(s)
+HIGHEST_PROTOCOL = const(4)
+DEFAULT_PROTOCOL = const(4)
 
+# Highest protocol version which can be loaded (without out-of-band buffers).
+_HIGHEST_LOAD_PROTOCOL = const(5)
 
-def loads(s):
+# Opcodes.
+_MARK = const(0x28)  # (
+_STOP = const(0x2E)  # .
+_POP = const(0x30)  # 0
+_POP_MARK = const(0x31)  # 1
+_BINFLOAT = const(0x47)  # G
+_BININT = const(0x4A)  # J
+_BININT1 = const(0x4B)  # K
+_BININT2 = const(0x4D)  # M
+_NONE = const(0x4E)  # N
+_REDUCE = const(0x52)  # R
+_BINUNICODE = const(0x58)  # X
+_EMPTY_LIST = const(0x5D)  # ]
+_APPEND = const(0x61)  # a
+_BUILD = const(0x62)  # b
+_GLOBAL = const(0x63)  # c
+_APPENDS = const(0x65)  # e
+_BINGET = const(0x68)  # h
+_LONG_BINGET = const(0x6A)  # j
+_BINPUT = const(0x71)  # q
+_LONG_BINPUT = const(0x72)  # r
+_SETITEM = const(0x73)  # s
+_TUPLE = const(0x74)  # t
+_SETITEMS = const(0x75)  # u
+_EMPTY_DICT = const(0x7D)  # }
+_EMPTY_TUPLE = const(0x29)  # )
+_BINBYTES = const(0x42)  # B
+_SHORT_BINBYTES = const(0x43)  # C
+_PROTO = const(0x80)
+_NEWOBJ = const(0x81)
+_TUPLE1 = const(0x85)
+_TUPLE2 = const(0x86)
+_TUPLE3 = const(0x87)
+_NEWTRUE = const(0x88)
+_NEWFALSE = const(0x89)
+_LONG1 = const(0x8A)
+_LONG4 = const(0x8B)
+_SHORT_BINUNICODE = const(0x8C)
+_BINUNICODE8 = const(0x8D)
+_BINBYTES8 = const(0x8E)
+_EMPTY_SET = const(0x8F)
+_ADDITEMS = const(0x90)
+_FROZENSET = const(0x91)
+_STACK_GLOBAL = const(0x93)
+_MEMOIZE = const(0x94)
+_FRAME = const(0x95)
+_BYTEARRAY8 = const(0x96)
+
+# Flush the output buffer to the file once it grows beyond this size.
+_FLUSH_SIZE = const(4096)
+
+# Items are written in batches of this size by APPENDS/SETITEMS/ADDITEMS.
+_BATCHSIZE = const(1000)
+
+
+class PickleError(Exception):
+    pass
+
+
+class PicklingError(PickleError):
+    pass
+
+
+class UnpicklingError(PickleError):
+    pass
+
+
+def _encode_long(x):
+    # Little-endian two's complement, using as few bytes as possible.
+    b = bytearray()
+    while True:
+        b.append(x & 0xFF)
+        x >>= 8
+        if (x == 0 and not b[-1] & 0x80) or (x == -1 and b[-1] & 0x80):
+            return b
+
+
+def _decode_long(b):
+    x = int.from_bytes(b, "little")
+    if b and b[-1] & 0x80:
+        x -= 1 << (8 * len(b))
+    return x
+
+
+class Pickler:
+    def __init__(self, file, protocol=None):
+        if protocol is None:
+            protocol = DEFAULT_PROTOCOL
+        if not 3 <= protocol <= HIGHEST_PROTOCOL:
+            raise ValueError("unsupported pickle protocol: %d" % protocol)
+        self.file = file
+        self.proto = protocol
+        self.memo = {}
+        # Keeps memoized objects alive so their ids are not reused.
+        self._memo_objs = []
+        self._buf = bytearray()
+
+    def clear_memo(self):
+        self.memo = {}
+        self._memo_objs = []
+
+    def dump(self, obj):
+        self._buf.append(_PROTO)
+        self._buf.append(self.proto)
+        self.save(obj)
+        self._buf.append(_STOP)
+        self._flush()
+
+    def _flush(self):
+        self.file.write(self._buf)
+        self._buf = bytearray()
+
+    def _write_op(self, op, data):
+        buf = self._buf
+        buf.append(op)
+        buf.extend(data)
+        if len(buf) > _FLUSH_SIZE:
+            self._flush()
+
+    def _write_op1(self, op, arg):
+        self._buf.append(op)
+        self._buf.append(arg)
+
+    def _write(self, data):
+        self._buf.extend(data)
+        if len(self._buf) > _FLUSH_SIZE:
+            self._flush()
+
+    def memoize(self, obj):
+        idx = len(self._memo_objs)
+        self.memo[id(obj)] = idx
+        self._memo_objs.append(obj)
+        if self.proto >= 4:
+            self._buf.append(_MEMOIZE)
+        elif idx < 256:
+            self._write_op1(_BINPUT, idx)
+        else:
+            self._write_op(_LONG_BINPUT, struct.pack("<I", idx))
+
+    def _get(self, idx):
+        if idx < 256:
+            self._write_op1(_BINGET, idx)
+        else:
+            self._write_op(_LONG_BINGET, struct.pack("<I", idx))
+
+    def save(self, obj):
+        t = type(obj)
+        # Atoms that are never memoized.
+        if obj is None:
+            self._buf.append(_NONE)
+        elif t is bool:
+            self._buf.append(_NEWTRUE if obj else _NEWFALSE)
+        elif t is int:
+            self.save_int(obj)
+        elif t is float:
+            self._write_op(_BINFLOAT, struct.pack(">d", obj))
+        else:
+            idx = self.memo.get(id(obj))
+            if idx is not None:
+                self._get(idx)
+            elif t is str:
+                self.save_str(obj)
+            elif t is bytes:
+                self.save_bytes(obj)
+            elif t is list:
+                self.save_list(obj)
+            elif t is dict:
+                self.save_dict(obj)
+            elif t is tuple:
+                self.save_tuple(obj)
+            elif t is set:
+                self.save_set(obj)
+            elif t is frozenset:
+                self.save_frozenset(obj)
+            elif t is bytearray:
+                self.save_reduce(bytearray, (bytes(obj),), obj=obj)
+            elif t is type or callable(obj) and hasattr(obj, "__name__"):
+                self.save_global(obj)
+            elif hasattr(obj, "__reduce__"):
+                self.save_reduce(*obj.__reduce__(), obj=obj)
+            else:
+                raise PicklingError("can't pickle %s object" % t.__name__)
+
+    def save_int(self, obj):
+        if 0 <= obj < 0x100:
+            self._write_op1(_BININT1, obj)
+        elif 0 <= obj < 0x10000:
+            self._write_op(_BININT2, struct.pack("<H", obj))
+        elif -0x80000000 <= obj <= 0x7FFFFFFF:
+            self._write_op(_BININT, struct.pack("<i", obj))
+        else:
+            data = _encode_long(obj)
+            if len(data) < 256:
+                self._write_op1(_LONG1, len(data))
+            else:
+                self._write_op(_LONG4, struct.pack("<i", len(data)))
+            self._write(data)
+
+    def save_str(self, obj):
+        data = obj.encode()
+        n = len(data)
+        if n < 256 and self.proto >= 4:
+            self._write_op1(_SHORT_BINUNICODE, n)
+        else:
+            self._write_op(_BINUNICODE, struct.pack("<I", n))
+        self._write(data)
+        self.memoize(obj)
+
+    def save_bytes(self, obj):
+        n = len(obj)
+        if n < 256:
+            self._write_op1(_SHORT_BINBYTES, n)
+        else:
+            self._write_op(_BINBYTES, struct.pack("<I", n))
+        self._write(obj)
+        self.memoize(obj)
+
+    def _batch(self, items, op):
+        # Write items between a MARK and `op`, in batches.
+        save = self.save
+        n = 0
+        for item in items:
+            if n == 0:
+                self._buf.append(_MARK)
+            save(item)
+            n += 1
+            if n == _BATCHSIZE:
+                self._buf.append(op)
+                n = 0
+        if n:
+            self._buf.append(op)
+
+    def save_list(self, obj):
+        self._buf.append(_EMPTY_LIST)
+        self.memoize(obj)
+        self._batch(obj, _APPENDS)
+
+    def save_dict(self, obj):
+        self._buf.append(_EMPTY_DICT)
+        self.memoize(obj)
+        save = self.save
+        n = 0
+        for k, v in obj.items():
+            if n == 0:
+                self._buf.append(_MARK)
+            save(k)
+            save(v)
+            n += 1
+            if n == _BATCHSIZE:
+                self._buf.append(_SETITEMS)
+                n = 0
+        if n:
+            self._buf.append(_SETITEMS)
+
+    def save_tuple(self, obj):
+        n = len(obj)
+        if n == 0:
+            self._buf.append(_EMPTY_TUPLE)
+            return
+        if n > 3:
+            self._buf.append(_MARK)
+        for item in obj:
+            self.save(item)
+        idx = self.memo.get(id(obj))
+        if idx is not None:
+            # The tuple was pickled while pickling its items, because it is
+            # part of a cycle, so discard the items and use the memo.
+            if n > 3:
+                self._buf.append(_POP_MARK)
+            else:
+                for _ in range(n):
+                    self._buf.append(_POP)
+            self._get(idx)
+            return
+        self._buf.append((_TUPLE, _TUPLE1, _TUPLE2, _TUPLE3)[n] if n <= 3 else _TUPLE)
+        self.memoize(obj)
+
+    def save_set(self, obj):
+        if self.proto < 4:
+            self.save_reduce(set, (list(obj),), obj=obj)
+            return
+        self._buf.append(_EMPTY_SET)
+        self.memoize(obj)
+        self._batch(obj, _ADDITEMS)
+
+    def save_frozenset(self, obj):
+        if self.proto < 4:
+            self.save_reduce(frozenset, (list(obj),), obj=obj)
+            return
+        self._buf.append(_MARK)
+        for item in obj:
+            self.save(item)
+        self._buf.append(_FROZENSET)
+        self.memoize(obj)
+
+    def save_global(self, obj):
+        module = getattr(obj, "__module__", None) or "builtins"
+        name = obj.__name__
+        if self.proto >= 4:
+            self.save(module)
+            self.save(name)
+            self._buf.append(_STACK_GLOBAL)
+        else:
+            self._write_op(_GLOBAL, ("%s\n%s\n" % (module, name)).encode())
+        self.memoize(obj)
+
+    def save_reduce(self, func, args, state=None, obj=None):
+        self.save(func)
+        self.save(tuple(args))
+        self._buf.append(_REDUCE)
+        if obj is not None:
+            self.memoize(obj)
+        if state is not None:
+            self.save(state)
+            self._buf.append(_BUILD)
+
+
+def _codecs_encode(s, encoding):
+    # Protocol 2 pickles bytes as _codecs.encode(s, "latin1").
+    if encoding == "latin1":
+        return bytes(ord(c) for c in s)
+    return s.encode(encoding)
+
+
+def _builtin(name):
+    import builtins
+
+    return getattr(builtins, name)
+
+
+# Globals that Unpickler.find_class() allows by default.
+_SAFE_GLOBALS = {
+    "builtins": ("bytearray", "bytes", "complex", "frozenset", "list", "set", "tuple"),
+    "collections": ("OrderedDict", "deque"),
+}
+
+
+class Unpickler:
+    def __init__(self, file):
+        self._read = file.read
+        self.memo = {}
+
+    def find_class(self, module, name):
+        if module == "__builtin__":
+            module = "builtins"
+        if module == "_codecs" and name == "encode":
+            return _codecs_encode
+        if name in _SAFE_GLOBALS.get(module, ()):
+            if module == "builtins":
+                return _builtin(name)
+            return getattr(__import__(module), name)
+        raise UnpicklingError("global '%s.%s' is forbidden" % (module, name))
+
+    def _readn(self, n):
+        data = self._read(n)
+        if len(data) < n:
+            raise EOFError
+        return data
+
+    def load(self):
+        read = self._readn
+        stack = []
+        marks = []
+        memo = self.memo
+        # Only protocols 2 and above are supported, and these start with
+        # PROTO, so anything else isn't a pickle that can be loaded.
+        if read(1)[0] != _PROTO:
+            raise UnpicklingError("unsupported pickle format")
+        if read(1)[0] > _HIGHEST_LOAD_PROTOCOL:
+            raise ValueError("unsupported pickle protocol")
+        while True:
+            op = read(1)[0]
+            if op == _STOP:
+                return stack.pop()
+            elif op == _MARK:
+                marks.append(len(stack))
+            elif op == _BININT1:
+                stack.append(read(1)[0])
+            elif op == _SHORT_BINUNICODE:
+                stack.append(str(read(read(1)[0]), "utf-8"))
+            elif op == _MEMOIZE:
+                memo[len(memo)] = stack[-1]
+            elif op == _BINGET:
+                stack.append(memo[read(1)[0]])
+            elif op == _BINPUT:
+                memo[read(1)[0]] = stack[-1]
+            elif op == _APPENDS:
+                i = marks.pop()
+                stack[i - 1].extend(stack[i:])
+                del stack[i:]
+            elif op == _SETITEMS:
+                i = marks.pop()
+                d = stack[i - 1]
+                for j in range(i, len(stack), 2):
+                    d[stack[j]] = stack[j + 1]
+                del stack[i:]
+            elif op == _EMPTY_LIST:
+                stack.append([])
+            elif op == _EMPTY_DICT:
+                stack.append({})
+            elif op == _BININT2:
+                stack.append(struct.unpack("<H", read(2))[0])
+            elif op == _BININT:
+                stack.append(struct.unpack("<i", read(4))[0])
+            elif op == _BINFLOAT:
+                stack.append(struct.unpack(">d", read(8))[0])
+            elif op == _NONE:
+                stack.append(None)
+            elif op == _NEWTRUE:
+                stack.append(True)
+            elif op == _NEWFALSE:
+                stack.append(False)
+            elif op == _BINUNICODE:
+                stack.append(str(read(struct.unpack("<I", read(4))[0]), "utf-8"))
+            elif op == _BINUNICODE8:
+                stack.append(str(read(struct.unpack("<Q", read(8))[0]), "utf-8"))
+            elif op == _SHORT_BINBYTES:
+                stack.append(bytes(read(read(1)[0])))
+            elif op == _BINBYTES:
+                stack.append(bytes(read(struct.unpack("<I", read(4))[0])))
+            elif op == _BINBYTES8:
+                stack.append(bytes(read(struct.unpack("<Q", read(8))[0])))
+            elif op == _LONG1:
+                stack.append(_decode_long(read(read(1)[0])))
+            elif op == _LONG4:
+                stack.append(_decode_long(read(struct.unpack("<i", read(4))[0])))
+            elif op == _EMPTY_TUPLE:
+                stack.append(())
+            elif op == _TUPLE1:
+                stack[-1] = (stack[-1],)
+            elif op == _TUPLE2:
+                b = stack.pop()
+                stack[-1] = (stack[-1], b)
+            elif op == _TUPLE3:
+                c = stack.pop()
+                b = stack.pop()
+                stack[-1] = (stack[-1], b, c)
+            elif op == _TUPLE:
+                i = marks.pop()
+                t = tuple(stack[i:])
+                del stack[i:]
+                stack.append(t)
+            elif op == _APPEND:
+                v = stack.pop()
+                stack[-1].append(v)
+            elif op == _SETITEM:
+                v = stack.pop()
+                k = stack.pop()
+                stack[-1][k] = v
+            elif op == _EMPTY_SET:
+                stack.append(set())
+            elif op == _ADDITEMS:
+                i = marks.pop()
+                stack[i - 1].update(stack[i:])
+                del stack[i:]
+            elif op == _FROZENSET:
+                i = marks.pop()
+                s = frozenset(stack[i:])
+                del stack[i:]
+                stack.append(s)
+            elif op == _LONG_BINGET:
+                stack.append(memo[struct.unpack("<I", read(4))[0]])
+            elif op == _LONG_BINPUT:
+                memo[struct.unpack("<I", read(4))[0]] = stack[-1]
+            elif op == _POP:
+                if marks and marks[-1] == len(stack):
+                    marks.pop()
+                else:
+                    stack.pop()
+            elif op == _POP_MARK:
+                del stack[marks.pop() :]
+            elif op == _GLOBAL:
+                module = self._readline()
+                stack.append(self.find_class(module, self._readline()))
+            elif op == _STACK_GLOBAL:
+                name = stack.pop()
+                stack[-1] = self.find_class(stack[-1], name)
+            elif op == _REDUCE:
+                args = stack.pop()
+                stack[-1] = stack[-1](*args)
+            elif op == _NEWOBJ:
+                args = stack.pop()
+                cls = stack[-1]
+                stack[-1] = cls.__new__(cls, *args)
+            elif op == _BUILD:
+                state = stack.pop()
+                obj = stack[-1]
+                if hasattr(obj, "__setstate__"):
+                    obj.__setstate__(state)
+                else:
+                    for k, v in state.items():
+                        setattr(obj, k, v)
+            elif op == _BYTEARRAY8:
+                stack.append(bytearray(read(struct.unpack("<Q", read(8))[0])))
+            elif op == _PROTO:
+                if read(1)[0] > _HIGHEST_LOAD_PROTOCOL:
+                    raise ValueError("unsupported pickle protocol")
+            elif op == _FRAME:
+                # Frames are only a hint for buffering, ignore them.
+                read(8)
+            else:
+                raise UnpicklingError("invalid load key, '\\x%02x'" % op)
+
+    def _readline(self):
+        line = bytearray()
+        while True:
+            c = self._readn(1)
+            if c == b"\n":
+                return str(line, "utf-8")
+            line.extend(c)
+
+
+def dump(obj, file, protocol=None):
+    Pickler(file, protocol).dump(obj)
+
+
+def dumps(obj, protocol=None):
+    f = io.BytesIO()
+    Pickler(f, protocol).dump(obj)
+    return f.getvalue()
+
+
+def loads_legacy(s):
+    # Loads data written by earlier versions of this module, with repr().
+    # This uses eval(), which runs any code in the data, so it is unsafe
+    # unless the data is trusted.
     d = {}
-    s = s.decode()
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode()
     if "(" in s:
         qualname = s.split("(", 1)[0]
         if "." in qualname:
@@ -24,3 +565,11 @@ def loads(s):
             mod = __import__(pkg)
             d[pkg] = mod
     return eval(s, d)
+
+
+def load(file):
+    return Unpickler(file).load()
+
+
+def loads(data):
+    return Unpickler(io.BytesIO(data)).load()
@@ -18,8 +18,83 @@ roundtrip((1,))
 roundtrip([1, 2])
 roundtrip({1: 2, 3: 4})
 
+# Data that isn't a binary pickle is never evaluated.
+for data in (b"1; import micropython", b"__import__('sys').exit(1)"):
+    try:
+        pickle.loads(data)
+        assert 0, "UnpicklingError expected"
+    except pickle.UnpicklingError:
+        pass
+
+# Unless it is asked for, for data written by earlier versions.
+assert pickle.loads_legacy(b"[1, 'a', (2.5, None)]") == [1, "a", (2.5, None)]
+
+roundtrip(None)
+roundtrip(True)
+roundtrip(False)
+roundtrip(0)
+roundtrip(-1)
+roundtrip(255)
+roundtrip(256)
+roundtrip(65536)
+roundtrip(-(2**31))
+roundtrip(2**31)
+roundtrip(2**100)
+roundtrip(-(2**100))
+roundtrip(-2.5)
+roundtrip("")
+roundtrip("é€" * 100)
+roundtrip(b"")
+roundtrip(b"\x00\xff" * 200)
+roundtrip(bytearray(b"abc"))
+roundtrip(())
+roundtrip((1, 2, 3, 4, 5))
+roundtrip(list(range(2500)))
+roundtrip({str(i): i for i in range(1500)})
+roundtrip({1, 2, 3})
+roundtrip(frozenset((4, 5)))
+roundtrip({"a": [1, (2, "b")], "c": {"d": None, "e": [b"f", 1.5]}})
+
+# Shared and recursive references are preserved.
+shared = [1, 2]
+t = pickle.loads(pickle.dumps([shared, shared, (shared,)]))
+assert t[0] is t[1] and t[0] is t[2][0]
+rec = [1]
+rec.append(rec)
+t = pickle.loads(pickle.dumps(rec))
+assert t[1] is t
+rec = ([],)
+rec[0].append(rec)
+t = pickle.loads(pickle.dumps(rec))
+assert t[0][0] is t
+
+# Repeated strings are only written once.
+s = "a somewhat long string"
+assert len(pickle.dumps([s] * 10)) < 2 * len(pickle.dumps(s))
+
+# Protocol 3 output.
+assert pickle.dumps([1, "x", {1, 2}], 3)[:2] == b"\x80\x03"
+assert pickle.loads(pickle.dumps([1, "x", {1, 2}], 3)) == [1, "x", {1, 2}]
+
+# Pickles written by CPython.
+assert pickle.loads(
+    b"\x80\x02]q\x00(K\x01X\x01\x00\x00\x00aq\x01c__builtin__\nset\nq\x02]q\x03K\x02a\x85q\x04Rq\x05e."
+) == [1, "a", {2}]
+assert pickle.loads(
+    b"\x80\x04\x95\x1a\x00\x00\x00\x00\x00\x00\x00}\x94(\x8c\x01a\x94K\x01\x8c\x01b\x94]\x94(G?\xf8\x00\x00\x00\x00\x00\x00\x88eu."
+) == {"a": 1, "b": [1.5, True]}
+
+# Globals are only loaded if they are allowed.
 try:
-    pickle.loads(b"1; import micropython")
-    assert 0, "SyntaxError expected"
-except SyntaxError:
+    pickle.loads(b"\x80\x04\x8c\x02os\x8c\x06system\x93.")
+    assert 0, "UnpicklingError expected"
+except pickle.UnpicklingError:
     pass
+
+# Streaming several pickles through one file.
+f = io.BytesIO()
+pickle.dump([1, 2], f)
+pickle.Pickler(f).dump("two")
+f.seek(0)
+assert pickle.load(f) == [1, 2]
+assert pickle.Unpickler(f).load() == "two"
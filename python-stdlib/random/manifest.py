@@ -1,3 +1,5 @@
-metadata(version="0.2.0")
+metadata(version="0.3.0")
+
+require("bisect")
 
 module("random.py")
@@ -1,7 +1,12 @@
+import urandom as _urandom
 from urandom import *
 
 _getrandbits32 = getrandbits
 
+# Dividing 53 random bits by this gives a float in [0, 1).  There are no
+# float literals in this module, so that it loads on builds without floats.
+_BPF = 1 << 53
+
 
 def getrandbits(bits: int) -> int:
     n = bits // 32
@@ -16,29 +21,225 @@ def getrandbits(bits: int) -> int:
     return d
 
 
-def randrange(start, stop=None):
-    if stop is None:
-        stop = start
-        start = 0
-    upper = stop - start
+def _bits(n):
+    # The number of random bits needed to draw values in range(n).
     bits = 0
     pwr2 = 1
-    while upper > pwr2:
+    while n > pwr2:
         pwr2 <<= 1
         bits += 1
-    while True:
-        r = getrandbits(bits)
-        if r < upper:
-            break
-    return r + start
+    return bits
+
+
+class _Random:
+    # Everything here is built on getrandbits() and random(), so a source
+    # of randomness only has to provide those.
+
+    def __init__(self):
+        self._gauss_next = None
+
+    def random(self):
+        return self.getrandbits(53) / _BPF
+
+    def _randbelow(self, n):
+        getrandbits = self.getrandbits
+        bits = _bits(n)
+        while True:
+            r = getrandbits(bits)
+            if r < n:
+                return r
+
+    def randrange(self, start, stop=None):
+        if stop is None:
+            stop = start
+            start = 0
+        upper = stop - start
+        if upper <= 0:
+            raise ValueError("empty range for randrange()")
+        return self._randbelow(upper) + start
+
+    def randint(self, start, stop):
+        return self.randrange(start, stop + 1)
+
+    def choice(self, seq):
+        if not seq:
+            raise IndexError("cannot choose from an empty sequence")
+        return seq[self._randbelow(len(seq))]
+
+    def shuffle(self, seq):
+        randbelow = self._randbelow
+        for i in range(len(seq) - 1, 0, -1):
+            j = randbelow(i + 1)
+            seq[i], seq[j] = seq[j], seq[i]
+
+    def sample(self, population, k):
+        n = len(population)
+        if not 0 <= k <= n:
+            raise ValueError("sample larger than population or is negative")
+        randbelow = self._randbelow
+        result = []
+        if 4 * k > n:
+            # A partial shuffle of a copy of the population.
+            pool = list(population)
+            for i in range(k):
+                j = randbelow(n - i)
+                result.append(pool[j])
+                pool[j] = pool[n - i - 1]
+        else:
+            # Small samples of large populations: remember the chosen
+            # indices rather than copying the population.
+            selected = set()
+            for i in range(k):
+                j = randbelow(n)
+                while j in selected:
+                    j = randbelow(n)
+                selected.add(j)
+                result.append(population[j])
+        return result
+
+    def choices(self, population, weights=None, *, cum_weights=None, k=1):
+        n = len(population)
+        random = self.random
+        if cum_weights is None:
+            if weights is None:
+                return [population[int(random() * n)] for i in range(k)]
+            cum_weights = []
+            total = 0
+            for w in weights:
+                total += w
+                cum_weights.append(total)
+        elif weights is not None:
+            raise TypeError("cannot specify both weights and cumulative weights")
+        if len(cum_weights) != n:
+            raise ValueError("the number of weights does not match the population")
+        total = cum_weights[-1]
+        if total <= 0:
+            raise ValueError("total of weights must be greater than zero")
+        from bisect import bisect_right
+
+        hi = n - 1
+        return [population[bisect_right(cum_weights, random() * total, 0, hi)] for i in range(k)]
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def gauss(self, mu=0, sigma=1):
+        # Box-Muller, which produces values in pairs.
+        z = self._gauss_next
+        self._gauss_next = None
+        if z is None:
+            import math
+
+            x2pi = self.random() * 2 * math.pi
+            g2rad = math.sqrt(-2 * math.log(1 - self.random()))
+            z = math.cos(x2pi) * g2rad
+            self._gauss_next = math.sin(x2pi) * g2rad
+        return mu + z * sigma
+
+    # Batch versions that fill an existing array (or list) in one pass,
+    # without a method call per item.  They return the array.
+
+    def fill_random(self, arr):
+        random = self.random
+        for i in range(len(arr)):
+            arr[i] = random()
+        return arr
+
+    def fill_randrange(self, arr, start, stop=None):
+        if stop is None:
+            stop = start
+            start = 0
+        upper = stop - start
+        if upper <= 0:
+            raise ValueError("empty range for randrange()")
+        getrandbits = self.getrandbits
+        bits = _bits(upper)
+        for i in range(len(arr)):
+            r = getrandbits(bits)
+            while r >= upper:
+                r = getrandbits(bits)
+            arr[i] = r + start
+        return arr
+
+    def fill_gauss(self, arr, mu=0, sigma=1):
+        import math
+
+        random = self.random
+        cos = math.cos
+        sin = math.sin
+        sqrt = math.sqrt
+        log = math.log
+        twopi = 2 * math.pi
+        n = len(arr)
+        for i in range(0, n, 2):
+            x2pi = random() * twopi
+            g2rad = sqrt(-2 * log(1 - random()))
+            arr[i] = mu + cos(x2pi) * g2rad * sigma
+            if i + 1 < n:
+                arr[i + 1] = mu + sin(x2pi) * g2rad * sigma
+        return arr
+
+
+class _Builtin(_Random):
+    # The built-in PRNG, shared with seed().
+    getrandbits = staticmethod(getrandbits)
+
+
+# Those functions that the built-in module provides (depending on how it
+# was built) are faster, so are kept in place of the ones above.
+for _name in ("random", "randrange", "randint", "choice", "uniform"):
+    if hasattr(_urandom, _name):
+        setattr(_Builtin, _name, staticmethod(getattr(_urandom, _name)))
+
+
+class SystemRandom(_Random):
+    # Random numbers from os.urandom(), which are suitable for security
+    # purposes.  The bytes are read _POOL at a time, so that small requests
+    # don't each cost a system call.  Like CPython's, it can't be seeded.
+
+    _POOL = 256
+
+    def __init__(self, x=None):
+        from os import urandom
+
+        super().__init__()
+        self._urandom = urandom
+        self._buf = b""
+        self._pos = 0
+
+    def seed(self, *args, **kwargs):
+        pass
+
+    def _bytes(self, n):
+        pos = self._pos
+        if pos + n > len(self._buf):
+            if n > self._POOL:
+                return self._urandom(n)
+            self._buf = self._urandom(self._POOL)
+            pos = 0
+        self._pos = pos + n
+        return self._buf[pos : pos + n]
 
+    def getrandbits(self, k):
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        n = (k + 7) >> 3
+        return int.from_bytes(self._bytes(n), "little") >> (n * 8 - k)
 
-def randint(start, stop):
-    return randrange(start, stop + 1)
+    def random(self):
+        return (int.from_bytes(self._bytes(7), "little") >> 3) / _BPF
 
 
-def shuffle(seq):
-    l = len(seq)
-    for i in range(l):
-        j = randrange(l)
-        seq[i], seq[j] = seq[j], seq[i]
+_inst = _Builtin()
+random = _inst.random
+randrange = _inst.randrange
+randint = _inst.randint
+choice = _inst.choice
+shuffle = _inst.shuffle
+sample = _inst.sample
+choices = _inst.choices
+uniform = _inst.uniform
+gauss = _inst.gauss
+fill_random = _inst.fill_random
+fill_randrange = _inst.fill_randrange
+fill_gauss = _inst.fill_gauss
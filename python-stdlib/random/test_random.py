@@ -0,0 +1,70 @@
+import random
+from array import array
+
+random.seed(1)
+
+for n in range(1, 40):
+    assert 0 <= random.randrange(n) < n
+    assert 5 <= random.randint(5, 5 + n) <= 5 + n
+    assert 0.0 <= random.random() < 1.0
+    assert 2.0 <= random.uniform(2, 3) <= 3.0
+
+try:
+    random.randrange(0)
+    assert False
+except ValueError:
+    pass
+
+l = list(range(100))
+random.shuffle(l)
+assert sorted(l) == list(range(100))
+
+population = list(range(1000))
+for k in (0, 1, 10, 500, 1000):
+    s = random.sample(population, k)
+    assert len(s) == k and len(set(s)) == k and all(0 <= x < 1000 for x in s)
+try:
+    random.sample(population, 1001)
+    assert False
+except ValueError:
+    pass
+
+assert len(random.choices("abc", k=20)) == 20
+c = random.choices("abc", [0, 1, 3], k=1000)
+assert "a" not in c and 100 < c.count("b") < 400
+c = random.choices("abc", cum_weights=[1, 1, 2], k=100)
+assert set(c) <= set("ac")
+try:
+    random.choices("abc", [1, 2])
+    assert False
+except ValueError:
+    pass
+
+g = [random.gauss(10.0, 2.0) for _ in range(2000)]
+assert 9.8 < sum(g) / len(g) < 10.2
+
+a = random.fill_randrange(array("H", [0] * 1000), 10, 20)
+assert all(10 <= x < 20 for x in a) and len(set(a)) == 10
+a = random.fill_random(array("d", [0.0] * 1000))
+assert all(0.0 <= x < 1.0 for x in a) and len(set(a)) == 1000
+a = random.fill_gauss(array("f", [0.0] * 2001), 5.0, 1.0)
+assert 4.9 < sum(a) / len(a) < 5.1
+
+r = random.SystemRandom()
+for k in (0, 1, 7, 8, 9, 53, 64, 1000, 5000):
+    assert 0 <= r.getrandbits(k) < 1 << k
+assert len(set(r.getrandbits(64) for _ in range(100))) == 100
+assert 0.0 <= r.random() < 1.0
+assert 0 <= r.randrange(10, 20) - 10 < 10
+assert sorted(r.sample(range(50), 50)) == list(range(50))
+l = list(range(100))
+r.shuffle(l)
+assert sorted(l) == list(range(100))
+assert len(r.fill_randrange(array("I", [0] * 100), 1 << 30)) == 100
+
+# The built-in module's functions are used where it has them.
+import urandom
+
+for name in ("random", "randrange", "randint", "choice", "uniform"):
+    if hasattr(urandom, name):
+        assert getattr(random, name) is getattr(urandom, name), name
@@ -1,13 +1,136 @@
+"""Extends the built-in struct module with the Struct class and iter_unpack().
+
+In addition to the CPython API, Struct.view() gives indexed access to an
+array of fixed-size records in a buffer, decoding only the records and
+fields that are accessed:
+
+    s = struct.Struct("<IhH")
+    records = s.view(buf)
+    total = sum(records.column(1))
+"""
+
 from ustruct import *
 
 
+def _fields(format):
+    # Split a format into the byte order prefix and one single-item format
+    # per value returned by unpack(), with the offset of each value.
+    prefix = ""
+    if format and format[0] in "@=<>!":
+        prefix = format[0]
+        format = format[1:]
+    fields = []
+    done = prefix
+    count = ""
+    for c in format:
+        if c in "0123456789":
+            count += c
+            continue
+        if c.isspace():
+            continue
+        n = int(count) if count else 1
+        count = ""
+        if c == "s":
+            items = [str(n) + c]
+        elif c == "x":
+            done += str(n) + c
+            continue
+        else:
+            items = [c] * n
+        for item in items:
+            # Computed this way to account for native alignment.
+            offset = calcsize(done + item) - calcsize(prefix + item)
+            fields.append((offset, prefix + item))
+            done += item
+    return fields
+
+
 class Struct:
     def __init__(self, format):
         self.format = format
         self.size = calcsize(format)
+        self._fields = None
+
+    def pack(self, *vals):
+        return pack(self.format, *vals)
+
+    def pack_into(self, buffer, offset, *vals):
+        pack_into(self.format, buffer, offset, *vals)
 
     def unpack(self, buf):
         return unpack(self.format, buf)
 
-    def pack(self, *vals):
-        return pack(self.format, *vals)
+    def unpack_from(self, buffer, offset=0):
+        return unpack_from(self.format, buffer, offset)
+
+    def iter_unpack(self, buffer):
+        # Checked here rather than in the generator, so that the error is
+        # raised by the call, as in CPython.
+        size = self.size
+        n = len(buffer)
+        if not size or n % size:
+            raise ValueError("buffer size must be a multiple of %d" % size)
+        return _iter_unpack(self.format, buffer, n, size)
+
+    def view(self, buffer, offset=0, count=None):
+        if self._fields is None:
+            self._fields = _fields(self.format)
+        return RecordView(self, buffer, offset, count)
+
+
+def _iter_unpack(fmt, buffer, n, size):
+    for offset in range(0, n, size):
+        yield unpack_from(fmt, buffer, offset)
+
+
+class RecordView:
+    # A read-only sequence of the records in a buffer, decoded on access.
+    def __init__(self, s, buffer, offset, count):
+        self._format = s.format
+        self._size = s.size
+        self._fields = s._fields
+        self._buffer = buffer
+        self._offset = offset
+        if count is None:
+            count = (len(buffer) - offset) // s.size
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def _record_offset(self, i):
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError("record index out of range")
+        return self._offset + i * self._size
+
+    def __getitem__(self, i):
+        return unpack_from(self._format, self._buffer, self._record_offset(i))
+
+    def __iter__(self):
+        fmt = self._format
+        buf = self._buffer
+        offset = self._offset
+        for i in range(self._count):
+            yield unpack_from(fmt, buf, offset)
+            offset += self._size
+
+    def field(self, i, field):
+        # Decode a single field of record i.
+        offset, fmt = self._fields[field]
+        return unpack_from(fmt, self._buffer, self._record_offset(i) + offset)[0]
+
+    def column(self, field):
+        # Iterate over a single field of every record.
+        offset, fmt = self._fields[field]
+        offset += self._offset
+        buf = self._buffer
+        size = self._size
+        for i in range(self._count):
+            yield unpack_from(fmt, buf, offset)[0]
+            offset += size
+
+
+def iter_unpack(format, buffer):
+    return Struct(format).iter_unpack(buffer)
@@ -0,0 +1,48 @@
+import struct
+import unittest
+
+
+class TestStruct(unittest.TestCase):
+    def test_pack_unpack(self):
+        s = struct.Struct("<IhH")
+        self.assertEqual(s.size, 8)
+        data = s.pack(1, -2, 3)
+        self.assertEqual(data, b"\x01\x00\x00\x00\xfe\xff\x03\x00")
+        self.assertEqual(s.unpack(data), (1, -2, 3))
+
+    def test_pack_into_unpack_from(self):
+        s = struct.Struct("<HB")
+        buf = bytearray(8)
+        s.pack_into(buf, 2, 0x1234, 5)
+        self.assertEqual(buf, b"\x00\x00\x34\x12\x05\x00\x00\x00")
+        self.assertEqual(s.unpack_from(buf, 2), (0x1234, 5))
+        self.assertEqual(s.unpack_from(memoryview(buf)[2:]), (0x1234, 5))
+
+    def test_iter_unpack(self):
+        s = struct.Struct("<hB")
+        buf = s.pack(1, 2) + s.pack(-3, 4)
+        self.assertEqual(list(s.iter_unpack(buf)), [(1, 2), (-3, 4)])
+        self.assertEqual(list(struct.iter_unpack("<hB", memoryview(buf))), [(1, 2), (-3, 4)])
+        with self.assertRaises(ValueError):
+            s.iter_unpack(buf[:-1])
+
+    def test_view(self):
+        s = struct.Struct("<I2hx4s")
+        buf = bytearray(2)
+        for i in range(5):
+            buf += s.pack(i, -i, i * 10, b"ab%02d" % i)
+        v = s.view(buf, 2)
+        self.assertEqual(len(v), 5)
+        self.assertEqual(v[1], (1, -1, 10, b"ab01"))
+        self.assertEqual(v[-1], (4, -4, 40, b"ab04"))
+        self.assertEqual(list(v), [s.unpack_from(buf, 2 + i * s.size) for i in range(5)])
+        self.assertEqual(v.field(3, 2), 30)
+        self.assertEqual(v.field(3, 3), b"ab03")
+        self.assertEqual(list(v.column(1)), [0, -1, -2, -3, -4])
+        self.assertEqual(len(s.view(buf, 2, 2)), 2)
+        with self.assertRaises(IndexError):
+            v[5]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,26 @@
+# Compare generating UUIDs one at a time with uuid.batch(), which draws the
+# randomness for all of them with a single os.urandom() call.
+
+import time
+import uuid
+
+try:
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_us = lambda: int(time.perf_counter() * 1000000)
+    ticks_diff = lambda a, b: a - b
+
+
+def bench(name, f, n):
+    t = ticks_us()
+    f(n)
+    print("%-12s %8d ns/uuid" % (name, ticks_diff(ticks_us(), t) * 1000 // n))
+
+
+N = 2000
+bench("uuid4", lambda n: [uuid.uuid4() for _ in range(n)], N)
+bench("batch(4)", lambda n: uuid.batch(n), N)
+bench("uuid7", lambda n: [uuid.uuid7() for _ in range(n)], N)
+bench("batch(7)", lambda n: uuid.batch(n, 7), N)
+bench("uuid1", lambda n: [uuid.uuid1() for _ in range(n)], N)
@@ -25,6 +25,53 @@ class TestUUID(unittest.TestCase):
         u2 = uuid.UUID(bytes.fromhex(u1.hex))
         self.assertEqual(u1.hex, u2.hex)
 
+    def test_parse(self):
+        h = "12345678-1234-5678-1234-567812345678"
+        u = uuid.UUID(h)
+        self.assertEqual(str(u), h)
+        self.assertEqual(uuid.UUID("{" + h + "}"), u)
+        self.assertEqual(uuid.UUID("urn:uuid:" + h), u)
+        self.assertEqual(uuid.UUID(h.replace("-", "")), u)
+        self.assertEqual(uuid.UUID(hex=h.upper()), u)
+        self.assertEqual(uuid.UUID(bytes=u.bytes), u)
+        self.assertEqual(uuid.UUID(int=u.int), u)
+        self.assertEqual(u.int, 0x12345678123456781234567812345678)
+        self.assertEqual(u.urn, "urn:uuid:" + h)
+        self.assertEqual(len({u, uuid.UUID(h)}), 1)
+        with self.assertRaises(ValueError):
+            uuid.UUID("12345678-1234-5678-1234-56781234567")
+        with self.assertRaises(ValueError):
+            uuid.UUID("12345678-1234-5678-1234-56781234567x")
+
+    def test_uuid1(self):
+        us = [uuid.uuid1() for _ in range(10)]
+        self.assertEqual(len(set(us)), 10)
+        self.assertEqual(us[0].version, 1)
+        u = uuid.uuid1(node=0x123456789ABC, clock_seq=0x1234)
+        self.assertTrue(u.hex.endswith("9234123456789abc"))
+
+    @unittest.skipUnless(hasattr(__import__("hashlib"), "sha1"), "needs hashlib.sha1")
+    def test_uuid5(self):
+        u = uuid.uuid5(uuid.NAMESPACE_DNS, "python.org")
+        self.assertEqual(str(u), "886313e1-3b8a-5372-9b90-0c9aee199e5d")
+        self.assertEqual(u.version, 5)
+
+    def test_uuid7(self):
+        us = [uuid.uuid7() for _ in range(100)]
+        self.assertEqual(sorted(us), us)
+        self.assertEqual(len(set(us)), 100)
+        self.assertEqual(us[0].version, 7)
+
+    def test_batch(self):
+        us = uuid.batch(50)
+        self.assertEqual(len(set(us)), 50)
+        for u in us:
+            self.assertEqual(u.version, 4)
+        us = uuid.batch(50, 7)
+        self.assertEqual(sorted(us), us)
+        self.assertTrue(uuid.uuid7() > us[-1])
+        self.assertEqual(uuid.batch(0), [])
+
 
 if __name__ == "__main__":
     unittest.main()
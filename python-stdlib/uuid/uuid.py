@@ -1,16 +1,53 @@
 import os
+import time
 
 
 class UUID:
-    def __init__(self, bytes):
+    def __init__(self, hex=None, bytes=None, *, int=None, version=None):
+        if hex is not None and not isinstance(hex, str):
+            # Backwards compatibility: the raw bytes used to be the first argument.
+            hex, bytes = None, hex
+        if hex is not None:
+            hex = hex.replace("urn:", "").replace("uuid:", "").strip("{}").replace("-", "")
+            if len(hex) != 32:
+                raise ValueError("badly formed hexadecimal UUID string")
+            bytes = _fromhex(hex)
+        elif int is not None:
+            if not 0 <= int < 1 << 128:
+                raise ValueError("int is out of range (need a 128-bit value)")
+            bytes = int.to_bytes(16, "big")
+        elif bytes is None:
+            raise TypeError("one of the hex, bytes or int arguments must be given")
         if len(bytes) != 16:
             raise ValueError("bytes arg must be 16 bytes long")
+        if version is not None:
+            if not 1 <= version <= 8:
+                raise ValueError("illegal version number")
+            bytes = bytearray(bytes)
+            _set_version(bytes, 0, version)
+        if not isinstance(bytes, _bytes):
+            bytes = _bytes(bytes)
         self.bytes = bytes
 
     @property
     def hex(self):
         return self.bytes.hex()
 
+    @property
+    def int(self):
+        return _int.from_bytes(self.bytes, "big")
+
+    @property
+    def urn(self):
+        return "urn:uuid:" + str(self)
+
+    @property
+    def version(self):
+        # Only meaningful for RFC 4122/9562 UUIDs.
+        if self.bytes[8] & 0xC0 == 0x80:
+            return self.bytes[6] >> 4
+        return None
+
     def __str__(self):
         h = self.hex
         return "-".join((h[0:8], h[8:12], h[12:16], h[16:20], h[20:32]))
@@ -18,10 +55,164 @@ class UUID:
     def __repr__(self):
         return "UUID('{}')".format(self)
 
+    def __eq__(self, other):
+        if isinstance(other, UUID):
+            return self.bytes == other.bytes
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, UUID):
+            return self.bytes < other.bytes
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.bytes)
+
+
+# The builtins shadowed by UUID.__init__ arguments.
+_bytes = bytes
+_int = int
+
+
+def _fromhex(h):
+    try:
+        return _bytes.fromhex(h)
+    except ValueError:
+        raise ValueError("badly formed hexadecimal UUID string")
+
+
+def _set_version(b, i, version):
+    # Set the version and RFC 4122 variant bits of the UUID at b[i:i + 16].
+    b[i + 6] = (b[i + 6] & 0x0F) | (version << 4)
+    b[i + 8] = (b[i + 8] & 0x3F) | 0x80
+
+
+NAMESPACE_DNS = UUID("6ba7b810-9dad-11d1-80b4-00c04fd430c8")
+NAMESPACE_URL = UUID("6ba7b811-9dad-11d1-80b4-00c04fd430c8")
+NAMESPACE_OID = UUID("6ba7b812-9dad-11d1-80b4-00c04fd430c8")
+NAMESPACE_X500 = UUID("6ba7b814-9dad-11d1-80b4-00c04fd430c8")
+
+# Seconds from the epoch of the time module to 1970-01-01 (on some ports the
+# epoch is 2000-01-01).
+_UNIX_OFFSET = 946684800 if time.gmtime(0)[0] == 2000 else 0
+
+# 100 ns intervals from 1582-10-15 (the UUID epoch) to 1970-01-01.
+_UUID1_OFFSET = 0x01B21DD213814000
+
+
+def _time_ns():
+    try:
+        return time.time_ns() + _UNIX_OFFSET * 1_000_000_000
+    except AttributeError:
+        return int((time.time() + _UNIX_OFFSET) * 1_000_000_000)
+
+
+_node = None
+_last_uuid1 = 0
+
+
+def uuid1(node=None, clock_seq=None):
+    """Generates a time-based UUID.
+
+    Without a node, a random 48-bit node ID with the multicast bit set is
+    used, as recommended by RFC 4122 when no MAC address is available.
+    """
+    global _node, _last_uuid1
+    timestamp = _time_ns() // 100 + _UUID1_OFFSET
+    # Keep successive UUIDs distinct even if the clock is coarse.
+    if timestamp <= _last_uuid1:
+        timestamp = _last_uuid1 + 1
+    _last_uuid1 = timestamp
+    if clock_seq is None:
+        clock_seq = _int.from_bytes(os.urandom(2), "big")
+    if node is None:
+        if _node is None:
+            _node = _int.from_bytes(os.urandom(6), "big") | 0x010000000000
+        node = _node
+    time_low = timestamp & 0xFFFFFFFF
+    time_mid = (timestamp >> 32) & 0xFFFF
+    time_hi = (timestamp >> 48) & 0x0FFF
+    n = (
+        time_low << 96
+        | time_mid << 80
+        | time_hi << 64
+        | (clock_seq & 0x3FFF) << 48
+        | (node & 0xFFFFFFFFFFFF)
+    )
+    return UUID(int=n, version=1)
+
 
 def uuid4():
     """Generates a random UUID compliant to RFC 4122 pg.14"""
     random = bytearray(os.urandom(16))
-    random[6] = (random[6] & 0x0F) | 0x40
-    random[8] = (random[8] & 0x3F) | 0x80
+    _set_version(random, 0, 4)
     return UUID(bytes(random))
+
+
+def uuid5(namespace, name):
+    """Generates a UUID from the SHA-1 hash of a namespace UUID and a name."""
+    import hashlib
+
+    if isinstance(name, str):
+        name = name.encode()
+    digest = bytearray(hashlib.sha1(namespace.bytes + name).digest()[:16])
+    _set_version(digest, 0, 5)
+    return UUID(bytes(digest))
+
+
+_last_ms = 0
+_counter = 0
+
+# UUIDv7 uses 42 of the 74 random bits as a counter, so that UUIDs generated
+# within the same millisecond still sort in order of creation.
+_COUNTER_MAX = (1 << 42) - 1
+
+
+def _uuid7(rand, i):
+    # Builds a UUIDv7 from the 10 random bytes at rand[i:i + 10].
+    global _last_ms, _counter
+    ms = _time_ns() // 1_000_000
+    if ms > _last_ms:
+        # Seed the counter with its top bit clear, leaving room to count up.
+        _counter = _int.from_bytes(rand[i : i + 6], "big") >> 7
+    else:
+        ms = _last_ms
+        _counter += 1
+        if _counter > _COUNTER_MAX:
+            ms += 1
+            _counter = _int.from_bytes(rand[i : i + 6], "big") >> 7
+    _last_ms = ms
+    tail = _int.from_bytes(rand[i + 6 : i + 10], "big")
+    n = (
+        (ms & 0xFFFFFFFFFFFF) << 80
+        | 7 << 76
+        | (_counter >> 30) << 64
+        | 2 << 62
+        | (_counter & 0x3FFFFFFF) << 32
+        | tail
+    )
+    return UUID(n.to_bytes(16, "big"))
+
+
+def uuid7():
+    """Generates a time-ordered UUID (RFC 9562).
+
+    UUIDs generated by this process are strictly increasing, even within
+    the same millisecond.
+    """
+    return _uuid7(os.urandom(10), 0)
+
+
+def batch(n, version=4):
+    """Generates a list of n random (version 4) or time-ordered (version 7)
+    UUIDs, drawing all of their randomness with a single os.urandom() call.
+    """
+    if version == 4:
+        buf = bytearray(os.urandom(16 * n))
+        for i in range(0, 16 * n, 16):
+            _set_version(buf, i, 4)
+        return [UUID(buf[i : i + 16]) for i in range(0, 16 * n, 16)]
+    if version == 7:
+        buf = os.urandom(10 * n)
+        return [_uuid7(buf, i) for i in range(0, 10 * n, 10)]
+    raise ValueError("version must be 4 or 7")
@@ -0,0 +1,6 @@
+metadata(version="0.1.0", description="IANA time zone support for datetime.")
+
+require("bisect")
+require("datetime")
+
+module("zoneinfo.py")
@@ -0,0 +1,155 @@
+import io
+import os
+import struct
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import zoneinfo
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+
+def _tzif(trans, idx, types, footer):
+    # A version 2 TZif file; types are (utcoff, isdst, abbr).
+    chars = b"".join(t[2] + b"\0" for t in types)
+    out = b"TZif2" + bytes(15) + struct.pack(">6l", 0, 0, 0, 0, 1, 1) + bytes(7)
+    out += b"TZif2" + bytes(15) + struct.pack(">6l", 0, 0, 0, len(trans), len(types), len(chars))
+    out += struct.pack(">%dq" % len(trans), *trans) + bytes(idx)
+    pos = 0
+    for utcoff, isdst, abbr in types:
+        out += struct.pack(">lBB", utcoff, isdst, pos)
+        pos += len(abbr) + 1
+    return out + chars + b"\n" + footer + b"\n"
+
+
+BERLIN = _tzif([], [], [(3600, 0, b"CET")], b"CET-1CEST,M3.5.0,M10.5.0/3")
+
+# New York with the 2023 transitions in the table, then the rule.
+NEW_YORK = _tzif(
+    [1678604400, 1699164000],
+    [1, 0],
+    [(-18000, 0, b"EST"), (-14400, 1, b"EDT")],
+    b"EST5EDT,M3.2.0,M11.1.0",
+)
+
+# Negative DST, as used for Europe/Dublin.
+DUBLIN = _tzif([], [], [(3600, 0, b"IST")], b"IST-1GMT0,M10.5.0,M3.5.0/1")
+
+# A table without a rule.
+KOLKATA = _tzif([-891579600, -872058600], [1, 0], [(19800, 0, b"IST"), (23400, 1, b"+0630")], b"")
+
+
+def _zone(data, key=None):
+    return ZoneInfo.from_file(io.BytesIO(data), key)
+
+
+class TestRule(unittest.TestCase):
+    def test_offsets(self):
+        tz = _zone(BERLIN)
+        winter = datetime(2024, 1, 15, 12, tzinfo=tz)
+        summer = datetime(2024, 7, 15, 12, tzinfo=tz)
+        self.assertEqual(winter.utcoffset(), timedelta(hours=1))
+        self.assertEqual(winter.dst(), timedelta(0))
+        self.assertEqual(winter.tzname(), "CET")
+        self.assertEqual(summer.utcoffset(), timedelta(hours=2))
+        self.assertEqual(summer.dst(), timedelta(hours=1))
+        self.assertEqual(summer.tzname(), "CEST")
+        self.assertEqual(summer.isoformat(), "2024-07-15T12:00:00+02:00")
+
+    def test_gap_and_fold(self):
+        tz = _zone(BERLIN)
+        # Clocks go forward at 02:00 on 2024-03-31.
+        gap = datetime(2024, 3, 31, 2, 30, tzinfo=tz)
+        self.assertEqual(gap.utcoffset(), timedelta(hours=1))
+        self.assertEqual(gap.replace(fold=1).utcoffset(), timedelta(hours=2))
+        # And back at 03:00 on 2024-10-27.
+        fold = datetime(2024, 10, 27, 2, 30, tzinfo=tz)
+        self.assertEqual(fold.utcoffset(), timedelta(hours=2))
+        self.assertEqual(fold.replace(fold=1).utcoffset(), timedelta(hours=1))
+
+    def test_fromutc(self):
+        tz = _zone(BERLIN)
+        first = datetime(2024, 10, 27, 0, 30, tzinfo=timezone.utc).astimezone(tz)
+        second = datetime(2024, 10, 27, 1, 30, tzinfo=timezone.utc).astimezone(tz)
+        self.assertEqual((first.hour, first.minute, first.fold), (2, 30, 0))
+        self.assertEqual((second.hour, second.minute, second.fold), (2, 30, 1))
+        after = datetime(2024, 3, 31, 1, 0, tzinfo=timezone.utc).astimezone(tz)
+        self.assertEqual(after.hour, 3)
+
+    def test_negative_dst(self):
+        tz = _zone(DUBLIN)
+        self.assertEqual(datetime(2024, 1, 1, tzinfo=tz).tzname(), "GMT")
+        self.assertEqual(datetime(2024, 1, 1, tzinfo=tz).utcoffset(), timedelta(0))
+        self.assertEqual(datetime(2024, 7, 1, tzinfo=tz).tzname(), "IST")
+        self.assertEqual(datetime(2024, 7, 1, tzinfo=tz).utcoffset(), timedelta(hours=1))
+
+
+class TestTable(unittest.TestCase):
+    def test_before_and_after_table(self):
+        tz = _zone(NEW_YORK)
+        self.assertEqual(datetime(2023, 1, 1, tzinfo=tz).tzname(), "EST")
+        self.assertEqual(datetime(2023, 7, 1, tzinfo=tz).tzname(), "EDT")
+        self.assertEqual(datetime(2023, 11, 10, tzinfo=tz).tzname(), "EST")
+        self.assertEqual(datetime(2024, 7, 1, tzinfo=tz).tzname(), "EDT")
+        self.assertEqual(datetime(2024, 7, 1, tzinfo=tz).dst(), timedelta(hours=1))
+
+    def test_table_fold(self):
+        tz = _zone(NEW_YORK)
+        ts = 1699164000
+        first = datetime.fromtimestamp(ts - 1800, tz)
+        second = datetime.fromtimestamp(ts + 1800, tz)
+        self.assertEqual((first.hour, first.minute, first.fold), (1, 30, 0))
+        self.assertEqual((second.hour, second.minute, second.fold), (1, 30, 1))
+        self.assertEqual(first.timestamp(), ts - 1800)
+        self.assertEqual(second.timestamp(), ts + 1800)
+
+    def test_no_rule(self):
+        tz = _zone(KOLKATA)
+        self.assertEqual(datetime(1940, 1, 1, tzinfo=tz).tzname(), "IST")
+        self.assertEqual(datetime(1942, 1, 1, tzinfo=tz).tzname(), "+0630")
+        self.assertEqual(datetime(1942, 1, 1, tzinfo=tz).dst(), timedelta(hours=1))
+        self.assertEqual(
+            datetime(2024, 1, 1, tzinfo=tz).utcoffset(), timedelta(hours=5, minutes=30)
+        )
+        self.assertEqual(datetime(2024, 1, 1, tzinfo=tz).dst(), timedelta(0))
+
+    def test_fixed(self):
+        tz = _zone(_tzif([], [], [(19800, 0, b"IST")], b"IST-5:30"))
+        self.assertEqual(tz.utcoffset(None), timedelta(hours=5, minutes=30))
+        self.assertIsNone(_zone(BERLIN).utcoffset(None))
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.dir = "zoneinfo_test"
+        os.mkdir(self.dir)
+        os.mkdir(self.dir + "/Europe")
+        with open(self.dir + "/Europe/Berlin", "wb") as f:
+            f.write(BERLIN)
+        zoneinfo.reset_tzpath([self.dir])
+        ZoneInfo.clear_cache()
+
+    def tearDown(self):
+        zoneinfo.reset_tzpath()
+        ZoneInfo.clear_cache()
+        os.remove(self.dir + "/Europe/Berlin")
+        os.rmdir(self.dir + "/Europe")
+        os.rmdir(self.dir)
+
+    def test_cache(self):
+        tz = ZoneInfo("Europe/Berlin")
+        self.assertEqual(tz.key, "Europe/Berlin")
+        self.assertEqual(str(tz), "Europe/Berlin")
+        self.assertIs(ZoneInfo("Europe/Berlin"), tz)
+        self.assertIsNot(ZoneInfo.no_cache("Europe/Berlin"), tz)
+        ZoneInfo.clear_cache(only_keys=["Europe/Berlin"])
+        self.assertIsNot(ZoneInfo("Europe/Berlin"), tz)
+
+    def test_not_found(self):
+        with self.assertRaises(ZoneInfoNotFoundError):
+            ZoneInfo("Europe/Nowhere")
+        with self.assertRaises(ValueError):
+            ZoneInfo("../Europe/Berlin")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,158 @@
+# Compile IANA time zones into a "tzdata" package of Python modules that the
+# zoneinfo module can load on devices without a zoneinfo directory.
+#
+# Runs on the host with CPython, reading the system's TZif files:
+#
+#     python tzcompile.py -o tzdata Europe/Berlin America/New_York
+#     python tzcompile.py -o tzdata --start 2020 --all
+#
+# Each zone becomes a module holding a slim TZif file with only the
+# transitions from the start year onwards; later times are covered by the
+# zone's POSIX TZ rule.  Copy the output to the device with mpremote, or host
+# it and install it with mip using the generated package.json:
+#
+#     mpremote cp -r tzdata :
+#     mpremote mip install github:user/repo/tzdata
+
+import argparse
+import calendar
+import io
+import json
+import os
+import struct
+import zoneinfo
+from datetime import datetime
+
+
+def module_name(key):
+    # Must match zoneinfo._module_name().
+    return key.replace("/", "__").replace("-", "_").replace("+", "_plus_")
+
+
+def all_keys(root):
+    keys = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in ("posix", "right")]
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as f:
+                if f.read(4) != b"TZif":
+                    continue
+            key = os.path.relpath(path, root)
+            if key[0].isupper():
+                keys.append(key)
+    return sorted(keys)
+
+
+def read_tzif(data):
+    # Returns (transitions, type indices, types, footer) from the 64-bit block.
+    if data[:4] != b"TZif" or data[4] < 0x32:
+        raise ValueError("need TZif version 2 or later")
+    counts = struct.unpack_from(">6l", data, 20)
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    pos = 44 + timecnt * 5 + typecnt * 6 + charcnt + leapcnt * 8 + isstdcnt + isutcnt
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = struct.unpack_from(
+        ">6l", data, pos + 20
+    )
+    pos += 44
+    trans = list(struct.unpack_from(">%dq" % timecnt, data, pos))
+    pos += timecnt * 8
+    idx = list(data[pos : pos + timecnt])
+    pos += timecnt
+    types = []
+    for i in range(typecnt):
+        utcoff, isdst, abbrind = struct.unpack_from(">lBB", data, pos + i * 6)
+        abbr = data[pos + typecnt * 6 + abbrind :].split(b"\0", 1)[0]
+        types.append((utcoff, isdst, abbr))
+    pos += typecnt * 6 + charcnt + leapcnt * 12 + isstdcnt + isutcnt
+    footer = data[pos + 1 : data.index(b"\n", pos + 1)]
+    return trans, idx, types, footer
+
+
+def write_tzif(trans, idx, types, footer):
+    # A version 2 file with an empty 32-bit block, as written by "zic -b slim".
+    abbrs = []
+    for t in types:
+        if t[2] not in abbrs:
+            abbrs.append(t[2])
+    chars = b"".join(a + b"\0" for a in abbrs)
+    out = [b"TZif2" + bytes(15), struct.pack(">6l", 0, 0, 0, 0, 1, 1), bytes(7)]
+    out.append(b"TZif2" + bytes(15))
+    out.append(struct.pack(">6l", 0, 0, 0, len(trans), len(types), len(chars)))
+    out.append(struct.pack(">%dq" % len(trans), *trans))
+    out.append(bytes(idx))
+    for utcoff, isdst, abbr in types:
+        out.append(struct.pack(">lBB", utcoff, isdst, chars.index(abbr + b"\0")))
+    out.append(chars)
+    out.append(b"\n" + footer + b"\n")
+    return b"".join(out)
+
+
+def compile_zone(data, start):
+    trans, idx, types, footer = read_tzif(data)
+    cutoff = calendar.timegm((start, 1, 1, 0, 0, 0))
+    keep = 0
+    while keep < len(trans) and trans[keep] < cutoff:
+        keep += 1
+    # Keep the transition into the type in effect at the cutoff, so that its
+    # DST amount can still be derived.  The type before it goes first, as it
+    # is used for earlier times, then the types still referenced.
+    keep = max(keep - 1, 0)
+    order = [idx[keep - 1] if keep else 0]
+    for i in idx[keep:]:
+        if i not in order:
+            order.append(i)
+    trans = trans[keep:]
+    idx = [order.index(i) for i in idx[keep:]]
+    types = [types[i] for i in order]
+    # Drop trailing transitions that the POSIX TZ rule reproduces.
+    while trans and footer and _rule_matches(trans, idx, types, footer):
+        trans.pop()
+        idx.pop()
+    return write_tzif(trans, idx, types, footer)
+
+
+def _rule_matches(trans, idx, types, footer):
+    # Check that the rule alone gives the types from the second to last
+    # transition on, sampling twice a day between the last two transitions.
+    tz = zoneinfo.ZoneInfo.from_file(io.BytesIO(write_tzif([], [], types[:1], footer)))
+    start = trans[-2] if len(trans) > 1 else trans[-1] - 366 * 86400
+    before = types[idx[-2]] if len(idx) > 1 else types[0]
+    points = [(t, before) for t in range(start, trans[-1], 43200)]
+    points += [(trans[-1] - 1, before), (trans[-1], types[idx[-1]])]
+    for t, (utcoff, isdst, abbr) in points:
+        dt = datetime.fromtimestamp(t, tz)
+        if dt.utcoffset().total_seconds() != utcoff or dt.tzname() != abbr.decode():
+            return False
+    return True
+
+
+def main():
+    cmd = argparse.ArgumentParser(description=__doc__)
+    cmd.add_argument("-o", "--output", default="tzdata", help="output package directory")
+    cmd.add_argument("--zoneinfo", default="/usr/share/zoneinfo", help="TZif source directory")
+    cmd.add_argument("--start", type=int, default=2000, help="first year with exact history")
+    cmd.add_argument("--all", action="store_true", help="compile every zone in the directory")
+    cmd.add_argument("keys", nargs="*", help="zone keys, e.g. Europe/Berlin")
+    args = cmd.parse_args()
+
+    keys = all_keys(args.zoneinfo) if args.all else args.keys
+    os.makedirs(args.output, exist_ok=True)
+    urls = [["__init__.py", "__init__.py"]]
+    with open(os.path.join(args.output, "__init__.py"), "w"):
+        pass
+    for key in keys:
+        with open(os.path.join(args.zoneinfo, key), "rb") as f:
+            data = compile_zone(f.read(), args.start)
+        name = module_name(key) + ".py"
+        with open(os.path.join(args.output, name), "w") as f:
+            f.write("# %s, generated by tzcompile.py\nTZIF = %r\n" % (key, data))
+        urls.append([name, name])
+    pkg = {"urls": [["tzdata/" + dst, src] for dst, src in urls], "version": "0.1"}
+    with open(os.path.join(args.output, "package.json"), "w") as f:
+        json.dump(pkg, f, indent=2)
+    print("%d zones written to %s" % (len(keys), args.output))
+
+
+if __name__ == "__main__":
+    main()
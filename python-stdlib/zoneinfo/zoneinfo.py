@@ -0,0 +1,395 @@
+# IANA time zone support, a subset of CPython's zoneinfo module.
+#
+# Zones are loaded from TZif files found on TZPATH or, failing that, from
+# modules of the "tzdata" package generated by tzcompile.py.  Each zone is
+# read once into array-backed transition tables; lookups are a binary search
+# over those tables and return preallocated offset objects.
+
+from array import array
+from bisect import bisect_right
+from datetime import timedelta, tzinfo
+import struct
+
+TZPATH = ("/usr/share/zoneinfo", "/usr/lib/zoneinfo", "/usr/share/lib/zoneinfo", "/etc/zoneinfo")
+
+# Days from 0001-01-01 to 1970-01-01, as returned by date.toordinal() - 1.
+_EPOCH_ORD = 719163
+_DAYS_BEFORE_MONTH = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334)
+
+
+class ZoneInfoNotFoundError(KeyError):
+    pass
+
+
+def reset_tzpath(to=None):
+    global TZPATH
+    TZPATH = tuple(to) if to is not None else reset_tzpath.default
+
+
+reset_tzpath.default = TZPATH
+
+
+def _module_name(key):
+    # Map a zone key to the name of its module in the tzdata package.
+    return key.replace("/", "__").replace("-", "_").replace("+", "_plus_")
+
+
+def _load_data(key):
+    if key.startswith("/") or ".." in key.split("/"):
+        raise ValueError("invalid key")
+    for path in TZPATH:
+        try:
+            with open(path + "/" + key, "rb") as f:
+                return f.read()
+        except OSError:
+            pass
+    try:
+        mod = __import__("tzdata." + _module_name(key), None, None, ("TZIF",))
+        return mod.TZIF
+    except (ImportError, AttributeError):
+        pass
+    raise ZoneInfoNotFoundError("No time zone found with key " + key)
+
+
+def _ts(dt):
+    # Seconds since 1970-01-01 of the naive (wall) fields of dt.
+    return (dt.toordinal() - _EPOCH_ORD) * 86400 + dt.hour * 3600 + dt.minute * 60 + dt.second
+
+
+_NO_TTINFO = (None, None, None, None)
+
+
+def _ttinfo(utcoff, dstoff, abbr):
+    return (timedelta(seconds=utcoff), timedelta(seconds=dstoff), abbr, utcoff)
+
+
+class ZoneInfo(tzinfo):
+    _cache = {}
+
+    def __new__(cls, key):
+        zone = cls._cache.get(key)
+        if zone is None:
+            zone = cls._cache[key] = cls.no_cache(key)
+        return zone
+
+    @classmethod
+    def no_cache(cls, key):
+        zone = tzinfo.__new__(cls)
+        zone._key = key
+        zone._load(_load_data(key))
+        return zone
+
+    @classmethod
+    def from_file(cls, fobj, key=None):
+        zone = tzinfo.__new__(cls)
+        zone._key = key
+        zone._load(fobj.read())
+        return zone
+
+    @classmethod
+    def clear_cache(cls, *, only_keys=None):
+        if only_keys is None:
+            cls._cache.clear()
+        else:
+            for key in only_keys:
+                cls._cache.pop(key, None)
+
+    @property
+    def key(self):
+        return self._key
+
+    def __str__(self):
+        return str(self._key)
+
+    def __repr__(self):
+        if self._key is None:
+            return "zoneinfo.ZoneInfo.from_file()"
+        return "zoneinfo.ZoneInfo(key={!r})".format(self._key)
+
+    def _load(self, data):
+        if data[:4] != b"TZif":
+            raise ValueError("invalid TZif data")
+        version = data[4]
+        counts = struct.unpack_from(">6l", data, 20)
+        pos = 44
+        if version >= 0x32:
+            # Skip the 32-bit data block and use the 64-bit one that follows.
+            pos += _body_size(counts, 4)
+            counts = struct.unpack_from(">6l", data, pos + 20)
+            pos += 44
+            size = 8
+        else:
+            size = 4
+        isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+        trans = array("q", struct.unpack_from(">%d%s" % (timecnt, "lq"[size == 8]), data, pos))
+        pos += timecnt * size
+        idx = data[pos : pos + timecnt]
+        pos += timecnt
+        types = []
+        for i in range(typecnt):
+            types.append(struct.unpack_from(">lBB", data, pos + i * 6))
+        pos += typecnt * 6
+        chars = data[pos : pos + charcnt]
+        pos += _body_size(counts, size) - timecnt * (size + 1) - typecnt * 6
+
+        footer = None
+        if version >= 0x32:
+            end = data.find(b"\n", pos + 1)
+            if end > pos + 1:
+                footer = _TZStr(data[pos + 1 : end].decode())
+
+        # TZif only records whether a type is DST; take the DST amount as the
+        # difference to the standard offset of an adjacent transition.
+        dstoffs = [0] * typecnt
+        for n in range(1, timecnt):
+            i = idx[n]
+            if not types[i][1] or dstoffs[i]:
+                continue
+            for j in (idx[n - 1], idx[n + 1] if n + 1 < timecnt else i):
+                if not types[j][1]:
+                    dstoffs[i] = types[i][0] - types[j][0]
+                    if dstoffs[i]:
+                        break
+        ttinfos = []
+        for i, (utcoff, isdst, abbrind) in enumerate(types):
+            dstoff = 0
+            if isdst:
+                dstoff = dstoffs[i] or 3600
+            abbr = chars[abbrind : chars.find(b"\0", abbrind)].decode()
+            ttinfos.append(_ttinfo(utcoff, dstoff, abbr))
+
+        self._trans_utc = trans
+        self._ttinfos = tuple(ttinfos[i] for i in idx)
+        before = ttinfos[0] if ttinfos else None
+        for t in ttinfos:
+            if not t[1]:
+                before = t
+                break
+        if before is None:
+            before = footer.std
+        self._before = before
+        self._footer = footer
+        # Only a zone with a single fixed offset has an answer for dt=None.
+        self._fixed = _NO_TTINFO
+        if not trans and (footer is None or footer._rules is None):
+            self._fixed = before if footer is None else footer.std
+
+        # Wall-clock transition times for fold=0 and fold=1.  Across a gap or
+        # fold the earlier instant is used for one and the later for the other.
+        wall0 = array("q", trans)
+        wall1 = array("q", trans)
+        prev = before[3]
+        for i, t in enumerate(self._ttinfos):
+            off = t[3]
+            wall0[i] += max(prev, off)
+            wall1[i] += min(prev, off)
+            prev = off
+        self._trans_wall = (wall0, wall1)
+
+    def _find(self, dt):
+        if dt is None:
+            return self._fixed
+        ts = _ts(dt)
+        wall = self._trans_wall[dt.fold]
+        i = bisect_right(wall, ts)
+        if i == len(wall) and self._footer is not None:
+            return self._footer.find(ts, dt.year, dt.fold)
+        return self._ttinfos[i - 1] if i else self._before
+
+    def utcoffset(self, dt):
+        return self._find(dt)[0]
+
+    def dst(self, dt):
+        return self._find(dt)[1]
+
+    def tzname(self, dt):
+        return self._find(dt)[2]
+
+    def fromutc(self, dt):
+        if dt.tzinfo is not self:
+            raise ValueError("dt.tzinfo is not self")
+        ts = _ts(dt)
+        trans = self._trans_utc
+        i = bisect_right(trans, ts)
+        fold = 0
+        if i == len(trans) and self._footer is not None:
+            tti, fold = self._footer.find_utc(ts, dt.year)
+        elif i:
+            tti = self._ttinfos[i - 1]
+            prev = self._ttinfos[i - 2] if i > 1 else self._before
+            # After a backward transition the first wall times repeat.
+            shift = prev[3] - tti[3]
+            fold = shift > 0 and ts < trans[i - 1] + shift
+        else:
+            tti = self._before
+        dt += tti[0]
+        return dt.replace(fold=1) if fold else dt
+
+
+def _body_size(counts, size):
+    isutcnt, isstdcnt, leapcnt, timecnt, typecnt, charcnt = counts
+    return timecnt * (size + 1) + typecnt * 6 + charcnt + leapcnt * (size + 4) + isstdcnt + isutcnt
+
+
+# POSIX TZ strings, used for times after the last transition.
+
+
+def _is_leap(year):
+    return year % 4 == 0 and (year % 100 != 0 or year % 400 == 0)
+
+
+def _year_start(year):
+    # Days from 1970-01-01 to January 1st of year.
+    y = year - 1
+    return y * 365 + y // 4 - y // 100 + y // 400 + 1 - _EPOCH_ORD
+
+
+class _TZStr:
+    def __init__(self, s):
+        std_abbr, i = _parse_abbr(s, 0)
+        std_off, i = _parse_offset(s, i)
+        std_off = -std_off
+        self.std = _ttinfo(std_off, 0, std_abbr)
+        self._rules = None
+        if i == len(s):
+            return
+        dst_abbr, i = _parse_abbr(s, i)
+        if i < len(s) and s[i] != ",":
+            dst_off, i = _parse_offset(s, i)
+            dst_off = -dst_off
+        else:
+            dst_off = std_off + 3600
+        self.dst = _ttinfo(dst_off, dst_off - std_off, dst_abbr)
+        self._diff = dst_off - std_off
+        if i == len(s) or s[i] != ",":
+            raise ValueError("unsupported TZ string " + s)
+        start, i = _parse_rule(s, i + 1)
+        if i == len(s) or s[i] != ",":
+            raise ValueError("invalid TZ string " + s)
+        end, i = _parse_rule(s, i + 1)
+        if i != len(s):
+            raise ValueError("invalid TZ string " + s)
+        self._rules = (start, end)
+        self._year = None
+
+    def _transitions(self, year):
+        # Wall-clock start and end of DST in year, each in the offset in
+        # effect just before it.  The result for the last year is cached.
+        if year != self._year:
+            days = _year_start(year)
+            self._trans = tuple(_rule_day(r, year, days) * 86400 + r[4] for r in self._rules)
+            self._year = year
+        return self._trans
+
+    def find(self, ts, year, fold):
+        if self._rules is None:
+            return self.std
+        start, end = self._transitions(year)
+        diff = self._diff
+        # With fold=0 the period with the smaller offset runs from the end of
+        # the gap to the end of the fold; with fold=1 from the start of the
+        # gap to the start of the fold.
+        if fold == (diff >= 0):
+            end -= diff
+        else:
+            start += diff
+        if start < end:
+            isdst = start <= ts < end
+        else:
+            isdst = not (end <= ts < start)
+        return self.dst if isdst else self.std
+
+    def find_utc(self, ts, year):
+        if self._rules is None:
+            return self.std, 0
+        start, end = self._transitions(year)
+        start -= self.std[3]
+        end -= self.dst[3]
+        if start < end:
+            isdst = start <= ts < end
+        else:
+            isdst = not (end <= ts < start)
+        diff = self._diff
+        if diff > 0:
+            fold = end <= ts < end + diff
+        else:
+            fold = start <= ts < start - diff
+        return self.dst if isdst else self.std, fold
+
+
+def _parse_abbr(s, i):
+    if s[i] == "<":
+        j = s.index(">", i)
+        return s[i + 1 : j], j + 1
+    j = i
+    while j < len(s) and s[j].isalpha():
+        j += 1
+    if j - i < 3:
+        raise ValueError("invalid TZ string " + s)
+    return s[i:j], j
+
+
+def _parse_offset(s, i):
+    # [+|-]hh[:mm[:ss]] in seconds.
+    sign = 1
+    if s[i] in "+-":
+        if s[i] == "-":
+            sign = -1
+        i += 1
+    value = 0
+    for scale in (3600, 60, 1):
+        j = i
+        while j < len(s) and s[j].isdigit():
+            j += 1
+        if j == i:
+            raise ValueError("invalid TZ string " + s)
+        value += int(s[i:j]) * scale
+        i = j
+        if i == len(s) or s[i] != ":":
+            break
+        i += 1
+    return sign * value, i
+
+
+def _parse_rule(s, i):
+    # Returns (kind, a, b, c, time) where kind is "J", "n" or "M".
+    if s[i] == "M":
+        j = i + 1
+        while j < len(s) and s[j] not in ",/":
+            j += 1
+        m, w, d = s[i + 1 : j].split(".")
+        rule = ["M", int(m), int(w), int(d), 7200]
+    else:
+        kind = "n"
+        if s[i] == "J":
+            kind = "J"
+            i += 1
+        j = i
+        while j < len(s) and s[j].isdigit():
+            j += 1
+        rule = [kind, int(s[i:j]), 0, 0, 7200]
+    if j < len(s) and s[j] == "/":
+        rule[4], j = _parse_offset(s, j + 1)
+    return tuple(rule), j
+
+
+def _rule_day(rule, year, days):
+    # Days from 1970-01-01 to the day selected by rule in year, which starts
+    # `days` days after the epoch.
+    kind, a, b, c, _ = rule
+    if kind == "J":
+        return days + a - 1 + (a >= 60 and _is_leap(year))
+    if kind == "n":
+        return days + a
+    # Day c (0 = Sunday) of week b (5 = last) of month a.
+    leap = a > 2 and _is_leap(year)
+    first = days + _DAYS_BEFORE_MONTH[a] + leap
+    # 1970-01-01 was a Thursday.
+    day = first + (c - (first + 4)) % 7 + (b - 1) * 7
+    if a == 12:
+        mdays = 31
+    else:
+        mdays = _DAYS_BEFORE_MONTH[a + 1] - _DAYS_BEFORE_MONTH[a] + (a == 2 and _is_leap(year))
+    if day >= first + mdays:
+        day -= 7
+    return day
@@ -39,14 +39,28 @@ function ci_package_tests_setup_lib {
     export MICROPYPATH
     mkdir -p "${VIRTUAL_ENV}/lib"
     $CP micropython/ucontextlib/ucontextlib.py "${VIRTUAL_ENV}/lib/"
+    $CP python-stdlib/bisect/bisect.py "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/collections/collections "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/collections-chainmap/collections "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/collections-counter/collections "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/collections-deque/collections "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/collections-ordereddict/collections "${VIRTUAL_ENV}/lib/"
+    $CP python-stdlib/datetime/datetime.py "${VIRTUAL_ENV}/lib/"
     $CP python-stdlib/fnmatch/fnmatch.py "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/hashlib-core/hashlib "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/hashlib-sha224/hashlib "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/hashlib-sha256/hashlib "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/hashlib-sha384/hashlib "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/hashlib-sha512/hashlib "${VIRTUAL_ENV}/lib/"
+    $CP python-stdlib/heapq/heapq.py "${VIRTUAL_ENV}/lib/"
+    $CP python-stdlib/itertools/itertools.py "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/logging/logging "${VIRTUAL_ENV}/lib/"
+    $CP -r python-stdlib/logging-handlers/logging "${VIRTUAL_ENV}/lib/"
+    $CP -r micropython/logging-cbor/logging "${VIRTUAL_ENV}/lib/"
+    $CP -r python-ecosys/cbor2/cbor2 "${VIRTUAL_ENV}/lib/"
     $CP python-stdlib/shutil/shutil.py "${VIRTUAL_ENV}/lib/"
     $CP python-stdlib/tempfile/tempfile.py "${VIRTUAL_ENV}/lib/"
+    $CP python-stdlib/types/types.py "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/unittest/unittest "${VIRTUAL_ENV}/lib/"
     $CP -r python-stdlib/unittest-discover/unittest "${VIRTUAL_ENV}/lib/"
     $CP unix-ffi/ffilib/ffilib.py "${VIRTUAL_ENV}/lib/"
@@ -57,23 +71,33 @@ function ci_package_tests_run {
     export MICROPYPATH
     for test in \
         micropython/drivers/storage/sdcard/sdtest.py \
+        micropython/logging-cbor/tests/test_cbor.py \
         micropython/umqtt.simple/test_umqtt_simple.py \
         micropython/xmltok/test_xmltok.py \
         python-ecosys/requests/test_requests.py \
         python-stdlib/argparse/test_argparse.py \
         python-stdlib/base64/test_base64.py \
         python-stdlib/binascii/test_binascii.py \
+        python-stdlib/collections-chainmap/tests/test_chainmap.py \
+        python-stdlib/collections-counter/tests/test_counter.py \
         python-stdlib/collections-defaultdict/test_defaultdict.py \
+        python-stdlib/collections-deque/tests/test_deque.py \
+        python-stdlib/collections-ordereddict/tests/test_ordereddict.py \
+        python-stdlib/copy/test_copy.py \
         python-stdlib/functools/test_partial.py \
         python-stdlib/functools/test_reduce.py \
         python-stdlib/heapq/test_heapq.py \
         python-stdlib/hmac/test_hmac.py \
         python-stdlib/itertools/test_itertools.py \
+        python-stdlib/logging/test_logging.py \
+        python-stdlib/logging-handlers/tests/test_handlers.py \
         python-stdlib/operator/test_operator.py \
         python-stdlib/os-path/test_path.py \
         python-stdlib/pickle/test_pickle.py \
         python-stdlib/pprint/test_pprint.py \
+        python-stdlib/random/test_random.py \
         python-stdlib/string/test_translate.py \
+        python-stdlib/struct/test_struct.py \
         python-stdlib/unittest/tests/exception.py \
         unix-ffi/gettext/test_gettext.py \
         unix-ffi/pwd/test_getpwnam.py \
@@ -81,6 +105,7 @@ function ci_package_tests_run {
         unix-ffi/sqlite3/test_sqlite3.py \
         unix-ffi/sqlite3/test_sqlite3_2.py \
         unix-ffi/sqlite3/test_sqlite3_3.py \
+        unix-ffi/sqlite3/test_sqlite3_4.py \
         unix-ffi/time/test_strftime.py \
         ; do
         echo "Running test $test"
@@ -109,6 +134,7 @@ function ci_package_tests_run {
         python-stdlib/unittest/tests \
         python-stdlib/unittest-discover/tests \
         python-stdlib/uuid \
+        python-stdlib/zoneinfo \
         ; do
         (cd $path && "${MICROPYTHON}" -m unittest)
         if [ $? -ne 0 ]; then false; return; fi
@@ -0,0 +1,154 @@
+# An asyncio IO queue for the unix port that waits with epoll.
+#
+# asyncio's own IO queue uses select.poll, which passes every registered
+# stream to the kernel on each wait, and registers and unregisters a
+# stream each time a task waits on it.  This one keeps each stream
+# registered with epoll from one wait to the next, so a wait costs time in
+# proportion to the number of streams that are ready, not the number
+# registered.  Call install() before any task waits on a stream:
+#
+#     import asyncio
+#     import asyncio_epoll
+#
+#     asyncio_epoll.install()
+#     asyncio.run(main())
+
+import errno
+import select
+from asyncio import core
+
+_IN = select.EPOLLIN
+_OUT = select.EPOLLOUT
+
+# Entry fields.
+_READER = 0
+_WRITER = 1
+_STREAM = 2
+_MASK = 3
+_FD = 4
+
+
+def _fileno(s):
+    return s if isinstance(s, int) else s.fileno()
+
+
+class IOQueue:
+    def __init__(self, maxevents=64):
+        self.poller = select.epoll()
+        self.maxevents = maxevents
+        # fd -> [reader task, writer task, stream, event mask, fd], for each
+        # stream registered with epoll.  The entry is also what epoll gives
+        # back with each event, so that no lookup is needed.
+        self.entries = {}
+        # fd -> entry, for streams that a task is waiting on.  asyncio's
+        # main loop checks this to see if there is anything to wait for.
+        self.map = {}
+
+    def _enqueue(self, s, idx):
+        fd = _fileno(s)
+        entry = self.entries.get(fd)
+        if entry is None or entry[_STREAM] is not s:
+            # A new stream, or the fd of one that has since been closed,
+            # which also took it out of epoll.  This can't be told for a
+            # stream given as an int fd, so see below.
+            entry = [None, None, s, 0, fd]
+            self.entries[fd] = entry
+        else:
+            assert entry[idx] is None
+        entry[idx] = core.cur_task
+        self.map[fd] = entry
+        want = _IN if idx == _READER else _OUT
+        mask = entry[_MASK]
+        if not mask & want or isinstance(s, int):
+            # The interest stays registered after the wait is over, so
+            # only the first wait in each direction costs a system call.
+            # Except for an int fd, which may have been closed and the
+            # number reused since, so is set again on each wait.
+            if mask:
+                try:
+                    self.poller.modify(fd, mask | want, entry)
+                except OSError as e:
+                    if e.args[0] != errno.ENOENT:
+                        raise
+                    self.poller.register(fd, mask | want, entry)
+            else:
+                self.poller.register(fd, want, entry)
+            entry[_MASK] = mask | want
+        # Link task to this IOQueue so it can be removed if needed
+        core.cur_task.data = self
+
+    def queue_read(self, s):
+        self._enqueue(s, _READER)
+
+    def queue_write(self, s):
+        self._enqueue(s, _WRITER)
+
+    def remove(self, task):
+        for fd in self.map:
+            entry = self.map[fd]
+            if entry[_READER] is task:
+                entry[_READER] = None
+            elif entry[_WRITER] is task:
+                entry[_WRITER] = None
+            else:
+                continue
+            if entry[_READER] is None and entry[_WRITER] is None:
+                del self.map[fd]
+            return
+
+    def forget(self, s):
+        # Drops the stream or fd s, which is about to be closed, along with
+        # any task waiting on it.
+        fd = _fileno(s)
+        self.map.pop(fd, None)
+        entry = self.entries.pop(fd, None)
+        if entry is not None and entry[_MASK]:
+            try:
+                self.poller.unregister(fd)
+            except OSError:
+                pass
+
+    def _drop(self, entry, mask):
+        # Stop listening for events that no task is waiting for, which
+        # epoll would otherwise report on every wait.
+        fd = entry[_FD]
+        mask = entry[_MASK] & ~mask
+        entry[_MASK] = mask
+        if mask:
+            self.poller.modify(fd, mask, entry)
+        else:
+            self.poller.unregister(fd)
+            del self.entries[fd]
+
+    def wait_io_event(self, dt):
+        push = core._task_queue.push
+        for entry, ev in self.poller.poll_ms(dt, self.maxevents):
+            idle = 0
+            if ev & ~_OUT:
+                # EPOLLIN or error
+                if entry[_READER] is not None:
+                    push(entry[_READER])
+                    entry[_READER] = None
+                else:
+                    idle = _IN
+            if ev & ~_IN:
+                # EPOLLOUT or error
+                if entry[_WRITER] is not None:
+                    push(entry[_WRITER])
+                    entry[_WRITER] = None
+                else:
+                    idle |= _OUT
+            if entry[_READER] is None and entry[_WRITER] is None:
+                self.map.pop(entry[_FD], None)
+            if idle & entry[_MASK] and dt:
+                # With dt of 0 there are tasks ready to run, which may
+                # include the ones last woken for this stream, about to
+                # wait on it again.  Otherwise all of them have had their
+                # chance to, so no task wants these events.
+                self._drop(entry, idle)
+
+
+def install(maxevents=64):
+    # Replaces asyncio's IO queue.  Streams already being waited on stay
+    # with the old one, so this should be called before any are.
+    core._io_queue = IOQueue(maxevents)
@@ -0,0 +1,63 @@
+# Time request/response round trips on one connection while N other
+# connections sit idle, with each server-side task waiting to read from
+# one, using asyncio's own IO queue and then asyncio_epoll's.  Large N
+# needs a raised limit on open files (ulimit -n).
+
+import asyncio
+from asyncio import core
+import asyncio_epoll
+import time
+
+try:
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_ms = lambda: int(time.perf_counter() * 1000)
+    ticks_diff = lambda a, b: a - b
+
+PORT = 8766
+ROUNDS = 1000
+
+
+async def echo(reader, writer):
+    while True:
+        data = await reader.read(1)
+        if not data:
+            break
+        writer.write(data)
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def main(n):
+    server = await asyncio.start_server(echo, "127.0.0.1", PORT, backlog=128)
+    conns = []
+    try:
+        for i in range(n):
+            conns.append(await asyncio.open_connection("127.0.0.1", PORT))
+        # Let the server accept them all.
+        while len(core._io_queue.map) < n + 1:
+            await asyncio.sleep_ms(10)
+        reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+        t = ticks_ms()
+        for i in range(ROUNDS):
+            writer.write(b"x")
+            await writer.drain()
+            await reader.read(1)
+        print("  %5d idle: %6d ms" % (n, ticks_diff(ticks_ms(), t)))
+        conns.append((reader, writer))
+    except OSError as e:
+        print("  %5d idle: %r" % (n, e))
+    for reader, writer in conns:
+        writer.close()
+        await writer.wait_closed()
+    server.close()
+    await server.wait_closed()
+
+
+for name, queue in (("select.poll", core.IOQueue), ("epoll", asyncio_epoll.IOQueue)):
+    print("%s, %d round trips:" % (name, ROUNDS))
+    for n in (0, 1000, 10000):
+        core._io_queue = queue()
+        asyncio.run(main(n))
@@ -0,0 +1,5 @@
+metadata(version="0.1.0", description="asyncio IO queue for the unix port, using epoll.")
+
+require("select")
+
+module("asyncio_epoll.py")
@@ -0,0 +1,79 @@
+import asyncio
+from asyncio import core
+import asyncio_epoll
+import os
+
+asyncio_epoll.install()
+queue = core._io_queue
+PORT = 8765
+N = 20
+
+
+async def echo(reader, writer):
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        writer.write(line)
+        await writer.drain()
+    writer.close()
+    await writer.wait_closed()
+
+
+async def client(i):
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    for j in range(10):
+        writer.write(b"%d %d\n" % (i, j))
+        await writer.drain()
+        assert await reader.readline() == b"%d %d\n" % (i, j)
+    writer.close()
+    await writer.wait_closed()
+    return i
+
+
+async def idle(reader):
+    await reader.read(1)
+
+
+def readable(fd):
+    yield queue.queue_read(fd)
+
+
+async def read_pipe():
+    # A stream given as an int fd, closed and its number reused, is waited
+    # on again rather than taken to be registered still.
+    for data in (b"x", b"y"):
+        r, w = os.pipe()
+        os.write(w, data)
+        await readable(r)
+        assert os.read(r, 1) == data
+        os.close(r)
+        os.close(w)
+    queue.forget(r)
+    assert r not in queue.entries
+
+
+async def main():
+    server = await asyncio.start_server(echo, "127.0.0.1", PORT)
+    assert await asyncio.gather(*[client(i) for i in range(N)]) == list(range(N))
+
+    # Waiting are the server, its task for the new connection and idle().
+    # A cancelled wait is forgotten.
+    reader, writer = await asyncio.open_connection("127.0.0.1", PORT)
+    task = asyncio.create_task(idle(reader))
+    await asyncio.sleep_ms(10)
+    assert len(queue.map) == 3
+    task.cancel()
+    await asyncio.sleep_ms(10)
+    assert len(queue.map) == 2
+    writer.close()
+    await writer.wait_closed()
+
+    server.close()
+    await server.wait_closed()
+
+    await read_pipe()
+
+
+asyncio.run(main())
+assert not queue.map
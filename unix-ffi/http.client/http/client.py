@@ -78,6 +78,7 @@ import warnings
 __all__ = [
     "HTTPResponse",
     "HTTPConnection",
+    "ConnectionPool",
     "HTTPException",
     "NotConnected",
     "UnknownProtocol",
@@ -302,6 +303,8 @@ class HTTPResponse:
         # self.fp is buffered or not.  So, no self.fp.read() by
         # clients unless they know what they are doing.
         self.fp = sock.makefile("rb")
+        self._sock = sock
+        self._crlf = None
         self.debuglevel = debuglevel
         if strict is not _strict_sentinel:
             warnings.warn(
@@ -476,10 +479,20 @@ class HTTPResponse:
     def _close_conn(self):
         fp = self.fp
         self.fp = None
-        fp.close()
+        if self.will_close is False and not (
+            self.chunk_left == 0 if self.chunked else self.length == 0
+        ):
+            # Closed before the end of the body, which would otherwise be
+            # read as the start of the next response: the connection can't
+            # be used again.
+            self.will_close = True
+            self._sock.close()
+        # Where makefile() returns the socket itself, closing it would also
+        # close a connection that is being kept alive for another request.
+        if fp is not self._sock or self.will_close is not False:
+            fp.close()
 
     def close(self):
-        super().close()  # set "closed" flag
         if self.fp:
             self._close_conn()
 
@@ -489,7 +502,6 @@ class HTTPResponse:
     # the "raw stream" that BufferedReader expects.
 
     def flush(self):
-        super().flush()
         if self.fp:
             self.fp.flush()
 
@@ -517,9 +529,21 @@ class HTTPResponse:
             return b""
 
         if amt is not None:
-            # Amount is given, so call base class version
-            # (which is implemented in terms of self.readinto)
-            return super(HTTPResponse, self).read(amt)
+            if self.chunked:
+                b = bytearray(amt)
+                n = self._readinto_chunked(b)
+                return bytes(memoryview(b)[:n])
+            if self.length is not None and amt > self.length:
+                # clip the read to the "end of response"
+                amt = self.length
+            s = self.fp.read(amt)
+            if not s and amt:
+                self._close_conn()
+            elif self.length is not None:
+                self.length -= len(s)
+                if not self.length:
+                    self._close_conn()
+            return s
         else:
             # Amount is not given (unbounded read) so we must check self.length
             # and self.chunked
@@ -614,10 +638,11 @@ class HTTPResponse:
             value.append(self._safe_read(chunk_left))
 
             # we read the whole chunk, get another
-            self._safe_read(2)  # toss the CRLF at the end of the chunk
+            self._discard_crlf()
             chunk_left = None
 
         self._read_and_discard_trailer()
+        self.chunk_left = 0
 
         # we read everything; close the "file"
         self._close_conn()
@@ -645,7 +670,7 @@ class HTTPResponse:
                 return total_bytes + n
             elif len(mvb) == chunk_left:
                 n = self._safe_readinto(mvb)
-                self._safe_read(2)  # toss the CRLF at the end of the chunk
+                self._discard_crlf()
                 self.chunk_left = None
                 return total_bytes + n
             else:
@@ -655,10 +680,11 @@ class HTTPResponse:
                 total_bytes += n
 
             # we read the whole chunk, get another
-            self._safe_read(2)  # toss the CRLF at the end of the chunk
+            self._discard_crlf()
             chunk_left = None
 
         self._read_and_discard_trailer()
+        self.chunk_left = 0
 
         # we read everything; close the "file"
         self._close_conn()
@@ -679,31 +705,41 @@ class HTTPResponse:
         reading. If the bytes are truly not available (due to EOF), then the
         IncompleteRead exception can be used to detect the problem.
         """
+        chunk = self.fp.read(min(amt, MAXAMOUNT))
+        if len(chunk) == amt:
+            # Usually everything arrives at once, and needn't be joined.
+            return chunk
         s = []
-        while amt > 0:
-            chunk = self.fp.read(min(amt, MAXAMOUNT))
+        while True:
             if not chunk:
                 raise IncompleteRead(b"".join(s), amt)
             s.append(chunk)
             amt -= len(chunk)
-        return b"".join(s)
+            if not amt:
+                return b"".join(s)
+            chunk = self.fp.read(min(amt, MAXAMOUNT))
 
     def _safe_readinto(self, b):
-        """Same as _safe_read, but for reading into a buffer."""
+        """Same as _safe_read, but for reading into a buffer.
+
+        The data goes straight into b, through memoryview slices, which
+        don't copy it."""
+        mvb = b if isinstance(b, memoryview) else memoryview(b)
+        total = len(mvb)
         total_bytes = 0
-        mvb = memoryview(b)
-        while total_bytes < len(b):
-            if MAXAMOUNT < len(mvb):
-                temp_mvb = mvb[0:MAXAMOUNT]
-                n = self.fp.readinto(temp_mvb)
-            else:
-                n = self.fp.readinto(mvb)
+        while total_bytes < total:
+            n = self.fp.readinto(mvb[total_bytes : total_bytes + MAXAMOUNT])
             if not n:
-                raise IncompleteRead(bytes(mvb[0:total_bytes]), len(b))
-            mvb = mvb[n:]
+                raise IncompleteRead(bytes(mvb[0:total_bytes]), total)
             total_bytes += n
         return total_bytes
 
+    def _discard_crlf(self):
+        # Toss the CRLF at the end of a chunk, reusing one small buffer.
+        if self._crlf is None:
+            self._crlf = bytearray(2)
+        self._safe_readinto(self._crlf)
+
     def fileno(self):
         return self.fp.fileno()
 
@@ -781,15 +817,18 @@ class HTTPConnection:
 
         The headers argument should be a mapping of extra HTTP headers
         to send with the CONNECT request.
+
+        The tunnel is set up again whenever the connection is reopened.
         """
-        self._tunnel_host = host
-        self._tunnel_port = port
+        if self.sock:
+            raise RuntimeError("Can't set up tunnel for established connection")
+        self._tunnel_host, self._tunnel_port = self._get_hostport(host, port)
         if headers:
             self._tunnel_headers = headers
         else:
             self._tunnel_headers.clear()
 
-    def _set_hostport(self, host, port):
+    def _get_hostport(self, host, port):
         if port is None:
             i = host.rfind(":")
             j = host.rfind("]")  # ipv6 addresses have [...]
@@ -806,15 +845,18 @@ class HTTPConnection:
                 port = self.default_port
             if host and host[0] == "[" and host[-1] == "]":
                 host = host[1:-1]
-        self.host = host
-        self.port = port
+        return host, port
+
+    def _set_hostport(self, host, port):
+        self.host, self.port = self._get_hostport(host, port)
 
     def set_debuglevel(self, level):
         self.debuglevel = level
 
     def _tunnel(self):
-        self._set_hostport(self._tunnel_host, self._tunnel_port)
-        connect_str = "CONNECT %s:%d HTTP/1.0\r\n" % (self.host, self.port)
+        # self.host and self.port stay those of the proxy, so that the
+        # tunnel can be set up again if the connection is reopened.
+        connect_str = "CONNECT %s:%d HTTP/1.0\r\n" % (self._tunnel_host, self._tunnel_port)
         connect_bytes = connect_str.encode("ascii")
         self.send(connect_bytes)
         for header, value in self._tunnel_headers.items():
@@ -857,6 +899,21 @@ class HTTPConnection:
             self.__response = None
         self.__state = _CS_IDLE
 
+    def _forget_response(self):
+        # If the previous response has been closed, forget about it, and
+        # about the connection too if that was closed with it.
+        response = self.__response
+        if response and response.isclosed():
+            self.__response = None
+            if response.will_close:
+                self.close()
+
+    def _is_idle(self):
+        # True if a new request can be sent, because the previous response
+        # (if any) has been read to the end, or closed with its connection.
+        self._forget_response()
+        return self.__state == _CS_IDLE and self.__response is None
+
     def send(self, data):
         """Send `data' to the server.
         ``data`` can be a string object, a bytes object, an array object, a
@@ -945,8 +1002,7 @@ class HTTPConnection:
         """
 
         # if a prior response has been completed, then forget about it.
-        if self.__response and self.__response.isclosed():
-            self.__response = None
+        self._forget_response()
 
         # in certain cases, we cannot issue another request on this connection.
         # this occurs when:
@@ -1009,22 +1065,29 @@ class HTTPConnection:
                         netloc_enc = netloc.encode("idna")
                     self.putheader("Host", netloc_enc)
                 else:
+                    if self._tunnel_host:
+                        host = self._tunnel_host
+                        port = self._tunnel_port
+                    else:
+                        host = self.host
+                        port = self.port
+
                     try:
-                        host_enc = self.host.encode("ascii")
+                        host_enc = host.encode("ascii")
                     except UnicodeEncodeError:
-                        host_enc = self.host.encode("idna")
+                        host_enc = host.encode("idna")
 
                     # As per RFC 273, IPv6 address should be wrapped with []
                     # when used as Host header
 
-                    if self.host.find(":") >= 0:
+                    if host.find(":") >= 0:
                         host_enc = b"[" + host_enc + b"]"
 
-                    if self.port == self.default_port:
+                    if port == self.default_port:
                         self.putheader("Host", host_enc)
                     else:
                         host_enc = host_enc.decode("ascii")
-                        self.putheader("Host", "%s:%s" % (host_enc, self.port))
+                        self.putheader("Host", "%s:%s" % (host_enc, port))
 
             # note: we are assuming that clients will not attempt to set these
             #       headers since *this* library must deal with the
@@ -1239,11 +1302,12 @@ else:
                 self.sock = sock
                 self._tunnel()
 
-            server_hostname = self.host if ssl.HAS_SNI else None
+            host = self._tunnel_host or self.host
+            server_hostname = host if ssl.HAS_SNI else None
             self.sock = self._context.wrap_socket(sock, server_hostname=server_hostname)
             try:
                 if self._check_hostname:
-                    ssl.match_hostname(self.sock.getpeercert(), self.host)
+                    ssl.match_hostname(self.sock.getpeercert(), host)
             except Exception:
                 self.sock.shutdown(socket.SHUT_RDWR)
                 self.sock.close()
@@ -1252,6 +1316,101 @@ else:
     __all__.append("HTTPSConnection")
 
 
+class ConnectionPool:
+    """Reuses persistent connections for requests to any number of origins.
+
+    request() takes an absolute http:// or https:// URL and returns the
+    response.  Once that has been read to the end, its connection is used
+    for the next request to the same origin, unless the server said it
+    would close it.  Up to maxsize connections are kept for each origin;
+    beyond that, new connections are made for one request each.
+
+    If proxy is given, as "host:port", every connection goes through a
+    CONNECT tunnel to its origin, which is kept along with the connection.
+    Other keyword arguments, such as timeout, are passed on to
+    HTTPConnection or HTTPSConnection.
+
+    If a reused connection turns out to have been closed by the server, a
+    request is sent again on a new one only if its method is in
+    retry_methods, which don't change anything on the server.
+    """
+
+    retry_methods = ("GET", "HEAD", "OPTIONS", "TRACE")
+
+    def __init__(self, maxsize=4, proxy=None, proxy_headers=None, **kwargs):
+        self.maxsize = maxsize
+        self._proxy = proxy
+        self._proxy_headers = proxy_headers
+        self._kwargs = kwargs
+        # (scheme, netloc) -> [connection]
+        self._pools = {}
+
+    def _new_connection(self, scheme, netloc):
+        if scheme == "http":
+            cls = HTTPConnection
+        elif scheme == "https":
+            try:
+                cls = HTTPSConnection
+            except NameError:
+                raise UnknownProtocol(scheme)
+        else:
+            raise InvalidURL("unsupported scheme: %r" % scheme)
+        if self._proxy is None:
+            return cls(netloc, **self._kwargs)
+        conn = cls(self._proxy, **self._kwargs)
+        conn.set_tunnel(netloc, None, self._proxy_headers)
+        return conn
+
+    def connection(self, scheme, netloc):
+        """Return a connection to the given origin that is free for a new
+        request, making one if needed."""
+        key = (scheme, netloc)
+        conns = self._pools.get(key)
+        if conns is None:
+            conns = self._pools[key] = []
+        for conn in conns:
+            if conn._is_idle():
+                return conn
+        conn = self._new_connection(scheme, netloc)
+        if len(conns) < self.maxsize:
+            conns.append(conn)
+        return conn
+
+    def request(self, method, url, body=None, headers={}):
+        """Send a request and return the response."""
+        scheme, netloc, path, query, fragment = urlsplit(url)
+        if not netloc:
+            raise InvalidURL("no host in URL: %r" % url)
+        if query:
+            path += "?" + query
+        conn = self.connection(scheme, netloc)
+        reused = conn.sock is not None
+        try:
+            conn.request(method, path, body, headers)
+            return conn.getresponse()
+        except (BadStatusLine, OSError):
+            conn.close()
+            # A server may close an idle connection at any time.  If it did,
+            # and the request can be sent again, do so on a new connection.
+            # Other requests may have been acted on before the connection
+            # was closed, so aren't repeated.
+            if (
+                not reused
+                or method not in self.retry_methods
+                or not (body is None or isinstance(body, (bytes, str)))
+            ):
+                raise
+        conn.request(method, path, body, headers)
+        return conn.getresponse()
+
+    def close(self):
+        """Close all the connections."""
+        for conns in self._pools.values():
+            for conn in conns:
+                conn.close()
+        self._pools.clear()
+
+
 class HTTPException(Exception):
     # Subclasses that define an __init__ must call Exception.__init__
     # or define self.args.  Otherwise, str() will fail.
@@ -1,4 +1,4 @@
-metadata(version="0.5.1")
+metadata(version="0.6.0")
 
 require("email.parser")
 require("email.message")
@@ -0,0 +1,162 @@
+import _thread
+import socket
+import time
+from http.client import BadStatusLine, ConnectionPool, HTTPConnection
+
+# A local server that counts the connections it accepts.  If a request
+# starts with CONNECT, it acts as a proxy that has opened a tunnel, and
+# goes on to serve the requests sent through it itself.
+accepted = []
+tunnels = []
+
+
+def reply(f, path):
+    if path == "/chunked":
+        f.write(b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n")
+        f.write(b"5\r\nhello\r\n6\r\n world\r\n0\r\n\r\n")
+    elif path == "/close":
+        f.write(b"HTTP/1.1 200 OK\r\nConnection: close\r\nContent-Length: 3\r\n\r\nbye")
+        return False
+    elif path == "/big":
+        # No newline, so that it would be read as one over-long line.
+        f.write(b"HTTP/1.1 200 OK\r\nContent-Length: 100000\r\n\r\n" + b"x" * 100000)
+    elif path == "/drop":
+        # Closes the connection without saying so, as after a timeout.
+        f.write(b"HTTP/1.1 200 OK\r\nContent-Length: 4\r\n\r\ndrop")
+        return False
+    else:
+        body = path.encode()
+        f.write(b"HTTP/1.1 200 OK\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+    return True
+
+
+def handle(conn):
+    f = conn.makefile("rwb", 0)
+    while True:
+        try:
+            line = f.readline()
+        except OSError:
+            # Reset by a client that closed without reading all of a reply.
+            break
+        if not line:
+            break
+        method, path = line.split()[:2]
+        length = 0
+        while True:
+            line = f.readline()
+            if line in (b"\r\n", b""):
+                break
+            if line.lower().startswith(b"content-length:"):
+                length = int(line[15:])
+        f.read(length)
+        if method == b"CONNECT":
+            tunnels.append(path)
+            f.write(b"HTTP/1.0 200 Connection established\r\n\r\n")
+        elif not reply(f, path.decode()):
+            break
+    f.close()
+    conn.close()
+
+
+def serve(s):
+    while True:
+        conn, addr = s.accept()
+        accepted.append(addr)
+        _thread.start_new_thread(handle, (conn,))
+
+
+s = socket.socket()
+s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+s.bind(("127.0.0.1", 0))
+s.listen(8)
+port = s.getsockname()[1]
+_thread.start_new_thread(serve, (s,))
+origin = "http://127.0.0.1:%d" % port
+
+# Requests to one origin reuse one connection, once each response is read.
+pool = ConnectionPool()
+for i in range(50):
+    resp = pool.request("GET", origin + "/n%d?q=1" % i)
+    assert resp.read() == b"/n%d?q=1" % i
+assert len(accepted) == 1
+
+resp = pool.request("GET", origin + "/chunked")
+assert resp.read() == b"hello world"
+resp = pool.request("GET", origin + "/x")
+assert resp.read() == b"/x"
+assert len(accepted) == 1
+
+# A response that hasn't been read holds on to its connection.
+first = pool.request("GET", origin + "/a")
+second = pool.request("GET", origin + "/b")
+assert len(accepted) == 2
+assert second.read() == b"/b" and first.read() == b"/a"
+
+# Connection: close means the next request needs a new connection.
+n = len(accepted)
+assert pool.request("GET", origin + "/close").read() == b"bye"
+assert pool.request("GET", origin + "/y").read() == b"/y"
+assert len(accepted) == n + 1
+
+# readinto() fills the caller's buffer, across chunk boundaries.
+resp = pool.request("GET", origin + "/chunked")
+buf = bytearray(20)
+assert resp.readinto(memoryview(buf)[:8]) == 8
+assert resp.readinto(memoryview(buf)[8:]) == 3
+assert buf[:11] == b"hello world"
+resp = pool.request("GET", origin + "/abcdef")
+assert resp.read(3) == b"/ab" and resp.read(10) == b"cdef"
+pool.close()
+
+# A response closed before its end takes its connection with it, as the
+# rest of the body would be read as the next response.
+pool = ConnectionPool()
+n = len(accepted)
+for path, amt in (("/big", 10), ("/big", 0), ("/chunked", 3)):
+    resp = pool.request("GET", origin + path)
+    resp.read(amt)
+    resp.close()
+    assert pool.request("GET", origin + "/after").read() == b"/after"
+assert len(accepted) == n + 4
+pool.close()
+
+# Only requests that don't change anything are sent again, when a reused
+# connection turns out to have been closed.
+pool = ConnectionPool()
+n = len(accepted)
+assert pool.request("GET", origin + "/drop").read() == b"drop"
+time.sleep(0.1)
+assert pool.request("GET", origin + "/again").read() == b"/again"
+assert len(accepted) == n + 2
+assert pool.request("POST", origin + "/drop", b"1").read() == b"drop"
+time.sleep(0.1)
+try:
+    pool.request("POST", origin + "/again", b"2")
+    assert False
+except (BadStatusLine, OSError):
+    pass
+assert len(accepted) == n + 2
+assert pool.request("POST", origin + "/again", b"3").read() == b"/again"
+assert len(accepted) == n + 3
+pool.close()
+
+# Through a proxy, each connection opens its tunnel once.
+n = len(accepted)
+pool = ConnectionPool(proxy="127.0.0.1:%d" % port)
+for i in range(5):
+    assert pool.request("GET", "http://example.com:8080/t").read() == b"/t"
+assert len(accepted) == n + 1
+assert tunnels == [b"example.com:8080"]
+
+# The tunnel is set up again if the connection is reopened.
+assert pool.request("GET", "http://example.com:8080/close").read() == b"bye"
+assert pool.request("GET", "http://example.com:8080/t").read() == b"/t"
+assert tunnels == [b"example.com:8080"] * 2
+pool.close()
+
+conn = HTTPConnection("127.0.0.1", port)
+conn.set_tunnel("example.com")
+conn.request("GET", "/z")
+assert conn.getresponse().read() == b"/z"
+assert conn.host == "127.0.0.1" and tunnels[-1] == b"example.com:80"
+conn.close()
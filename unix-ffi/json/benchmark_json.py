@@ -0,0 +1,81 @@
+# Time json.loads() against the incremental parser in json.stream on a
+# document of 2000 records.  json.stream reads it in 4 KB chunks, while
+# json.loads() needs all of it, and all of the result, in memory at once.
+# Then time encoding the records back with the generator-based
+# iterencode() and with JSONEncoder.dump().
+
+import gc
+import io
+import json
+import json.stream
+import time
+from json.encoder import JSONEncoder
+
+try:
+    ticks_ms = time.ticks_ms
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_ms = lambda: int(time.perf_counter() * 1000)
+    ticks_diff = lambda a, b: a - b
+
+N = 2000
+REPEAT = 3
+
+doc = json.dumps(
+    {
+        "rows": [
+            {"id": i, "name": "row %d" % i, "tags": ["a", "b\n"], "v": i / 4, "ok": i % 2 == 0}
+            for i in range(N)
+        ]
+    }
+).encode()
+
+
+def loads():
+    return len(json.loads(doc)["rows"])
+
+
+def items():
+    n = 0
+    for row in json.stream.items(io.BytesIO(doc), "rows.item"):
+        n += 1
+    return n
+
+
+def events():
+    n = 0
+    for event in json.stream.basic_parse(io.BytesIO(doc)):
+        n += 1
+    return n
+
+
+def timeit(name, f):
+    gc.collect()
+    t = ticks_ms()
+    for _ in range(REPEAT):
+        n = f()
+    print("%-28s %6d ms  (%d)" % (name, ticks_diff(ticks_ms(), t), n))
+
+
+print("%d bytes" % len(doc))
+timeit("json.loads", loads)
+timeit("json.stream.items", items)
+timeit("json.stream.basic_parse", events)
+
+
+rows = json.loads(doc)["rows"]
+compact = JSONEncoder(separators=(",", ":"))
+
+
+def iterencode():
+    return len("".join(compact.iterencode(rows)))
+
+
+def dump():
+    chunks = []
+    compact.dump(rows, chunks)
+    return len("".join(chunks))
+
+
+timeit("JSONEncoder.iterencode", iterencode)
+timeit("JSONEncoder.dump", dump)
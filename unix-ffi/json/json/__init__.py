@@ -123,6 +123,9 @@ _default_encoder = JSONEncoder(
     separators=None,
     default=None,
 )
+# The encoder for the most compact representation, which is common enough
+# to be worth keeping, together with its cache of encoded keys.
+_compact_encoder = JSONEncoder(separators=(",", ":"))
 
 
 def dump(
@@ -189,29 +192,32 @@ def dump(
         and allow_nan
         and cls is None
         and indent is None
-        and separators is None
         and default is None
         and not sort_keys
         and not kw
+        and (separators is None or tuple(separators) == (",", ":"))
     ):
-        iterable = _default_encoder.iterencode(obj)
-    else:
-        if cls is None:
-            cls = JSONEncoder
-        iterable = cls(
-            skipkeys=skipkeys,
-            ensure_ascii=ensure_ascii,
-            check_circular=check_circular,
-            allow_nan=allow_nan,
-            indent=indent,
-            separators=separators,
-            default=default,
-            sort_keys=sort_keys,
-            **kw
-        ).iterencode(obj)
+        (_compact_encoder if separators else _default_encoder).dump(obj, fp)
+        return
+    if cls is None:
+        cls = JSONEncoder
+    encoder = cls(
+        skipkeys=skipkeys,
+        ensure_ascii=ensure_ascii,
+        check_circular=check_circular,
+        allow_nan=allow_nan,
+        indent=indent,
+        separators=separators,
+        default=default,
+        sort_keys=sort_keys,
+        **kw
+    )
+    if indent is None:
+        encoder.dump(obj, fp)
+        return
     # could accelerate with writelines in some versions of Python, at
     # a debuggability cost
-    for chunk in iterable:
+    for chunk in encoder.iterencode(obj):
         fp.write(chunk)
 
 
@@ -277,12 +283,12 @@ def dumps(
         and allow_nan
         and cls is None
         and indent is None
-        and separators is None
         and default is None
         and not sort_keys
         and not kw
+        and (separators is None or tuple(separators) == (",", ":"))
     ):
-        return _default_encoder.encode(obj)
+        return (_compact_encoder if separators else _default_encoder).encode(obj)
     if cls is None:
         cls = JSONEncoder
     return cls(
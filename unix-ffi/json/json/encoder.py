@@ -196,6 +196,14 @@ class JSONEncoder(object):
                 return encode_basestring_ascii(o)
             else:
                 return encode_basestring(o)
+        if (
+            self.indent is None
+            and c_make_encoder is None
+            and type(self).iterencode is JSONEncoder.iterencode
+        ):
+            chunks = []
+            self.dump(o, chunks)
+            return "".join(chunks)
         # This doesn't pass the iterator directly to ''.join() because the
         # exceptions aren't as detailed.  The list call should be roughly
         # equivalent to the PySequence_Fast that ''.join() would do.
@@ -204,6 +212,40 @@ class JSONEncoder(object):
             chunks = list(chunks)
         return "".join(chunks)
 
+    def dump(self, o, fp):
+        """Encode the given object without indentation, writing each
+        piece of the JSON string representation with ``fp.write()``, or
+        appending it if fp is a list.
+
+        This is faster than iterating over ``iterencode()``, and the
+        encoded forms of dict keys are cached from one call to the next.
+
+        """
+        write = fp.append if isinstance(fp, list) else fp.write
+        if type(self).iterencode is not JSONEncoder.iterencode:
+            # A subclass that overrides iterencode() gets what it yields.
+            for chunk in self.iterencode(o):
+                write(chunk)
+            return
+        # The key cache depends on how keys are encoded, so starts afresh
+        # if that changes.  Everything else is looked up on each call.
+        key_format = (self.ensure_ascii, self.key_separator)
+        cache = getattr(self, "_key_cache", None)
+        if cache is None or cache[0] != key_format:
+            cache = self._key_cache = (key_format, {})
+        _encode = _make_compact_encoder(
+            cache[1],
+            self.check_circular,
+            self.default,
+            encode_basestring_ascii if self.ensure_ascii else encode_basestring,
+            _make_floatstr(self.allow_nan),
+            self.key_separator,
+            self.item_separator,
+            self.sort_keys,
+            self.skipkeys,
+        )
+        _encode(o, write)
+
     def iterencode(self, o, _one_shot=False):
         """Encode the given object and yield each string
         representation as available.
@@ -223,26 +265,7 @@ class JSONEncoder(object):
         else:
             _encoder = encode_basestring
 
-        def floatstr(
-            o, allow_nan=self.allow_nan, _repr=FLOAT_REPR, _inf=INFINITY, _neginf=-INFINITY
-        ):
-            # Check for specials.  Note that this type of test is processor
-            # and/or platform-specific, so do tests which don't depend on the
-            # internals.
-
-            if o != o:
-                text = "NaN"
-            elif o == _inf:
-                text = "Infinity"
-            elif o == _neginf:
-                text = "-Infinity"
-            else:
-                return _repr(o)
-
-            if not allow_nan:
-                raise ValueError("Out of range float values are not JSON compliant: " + repr(o))
-
-            return text
+        floatstr = _make_floatstr(self.allow_nan)
 
         if _one_shot and c_make_encoder is not None and self.indent is None:
             _iterencode = c_make_encoder(
@@ -272,6 +295,29 @@ class JSONEncoder(object):
         return _iterencode(o, 0)
 
 
+def _make_floatstr(allow_nan, _repr=FLOAT_REPR, _inf=INFINITY, _neginf=-INFINITY):
+    def floatstr(o):
+        # Check for specials.  Note that this type of test is processor
+        # and/or platform-specific, so do tests which don't depend on the
+        # internals.
+
+        if o != o:
+            text = "NaN"
+        elif o == _inf:
+            text = "Infinity"
+        elif o == _neginf:
+            text = "-Infinity"
+        else:
+            return _repr(o)
+
+        if not allow_nan:
+            raise ValueError("Out of range float values are not JSON compliant: " + repr(o))
+
+        return text
+
+    return floatstr
+
+
 def _make_iterencode(
     markers,
     _default,
@@ -458,3 +504,118 @@ def _make_iterencode(
                 del markers[markerid]
 
     return _iterencode
+
+
+def _make_compact_encoder(
+    keys,
+    _check_circular,
+    _default,
+    _encoder,
+    _floatstr,
+    _key_separator,
+    _item_separator,
+    _sort_keys,
+    _skipkeys,
+    _key_cache_size=256,
+    ## HACK: hand-optimized bytecode; turn globals into locals
+    ValueError=ValueError,
+    dict=dict,
+    float=float,
+    id=id,
+    int=int,
+    isinstance=isinstance,
+    list=list,
+    str=str,
+    tuple=tuple,
+):
+    # Like _make_iterencode() without indentation, but each piece is passed
+    # to write() from plain recursive calls, rather than being yielded up
+    # through a generator per container.  String keys are looked up in
+    # keys, a cache of their encoded forms followed by the key separator,
+    # as the same keys tend to come up again and again.
+
+    def _encode_key(key):
+        if isinstance(key, str):
+            s = _encoder(key) + _key_separator
+            if len(keys) >= _key_cache_size:
+                keys.clear()
+            keys[key] = s
+            return s
+        # JavaScript is weakly typed for these, so it makes sense to
+        # also allow them.  Many encoders seem to do something like this.
+        elif isinstance(key, float):
+            key = _floatstr(key)
+        elif key is True:
+            key = "true"
+        elif key is False:
+            key = "false"
+        elif key is None:
+            key = "null"
+        elif isinstance(key, int):
+            key = str(key)
+        elif _skipkeys:
+            return None
+        else:
+            raise TypeError("key " + repr(key) + " is not a string")
+        return _encoder(key) + _key_separator
+
+    def _encode(o, write, markers):
+        if isinstance(o, str):
+            write(_encoder(o))
+        elif o is None:
+            write("null")
+        elif o is True:
+            write("true")
+        elif o is False:
+            write("false")
+        elif isinstance(o, int):
+            write(str(o))
+        elif isinstance(o, float):
+            write(_floatstr(o))
+        else:
+            if markers is not None:
+                markerid = id(o)
+                if markerid in markers:
+                    raise ValueError("Circular reference detected")
+                markers[markerid] = o
+            if isinstance(o, (list, tuple)):
+                write("[")
+                first = True
+                for value in o:
+                    if first:
+                        first = False
+                    else:
+                        write(_item_separator)
+                    _encode(value, write, markers)
+                write("]")
+            elif isinstance(o, dict):
+                write("{")
+                first = True
+                if _sort_keys:
+                    items = sorted(o.items(), key=lambda kv: kv[0])
+                else:
+                    items = o.items()
+                for key, value in items:
+                    k = keys.get(key) if isinstance(key, str) else None
+                    if k is None:
+                        k = _encode_key(key)
+                        if k is None:
+                            continue
+                    if first:
+                        first = False
+                    else:
+                        write(_item_separator)
+                    write(k)
+                    _encode(value, write, markers)
+                write("}")
+            else:
+                _encode(_default(o), write, markers)
+            if markers is not None:
+                del markers[markerid]
+
+    def encode(o, write):
+        # Each call has its own markers, so that calls from default(), or
+        # from other threads, don't disturb each other's.
+        _encode(o, write, {} if _check_circular else None)
+
+    return encode
@@ -0,0 +1,295 @@
+"""Incremental JSON parser
+
+Reads a document a chunk at a time from a file, a socket or an iterable of
+chunks, and produces events as it goes, so that memory use is bounded by
+the largest single string or number rather than by the size of the
+document::
+
+    >>> import json.stream
+    >>> list(json.stream.items('{"rows": [{"a": 1}, {"a": 2}]}', "rows.item"))
+    [{'a': 1}, {'a': 2}]
+
+The events and prefixes are those of the ijson package.
+"""
+
+from json.decoder import py_scanstring
+from json.scanner import NUMBER_RE
+
+__all__ = ["basic_parse", "parse", "items"]
+
+BUF_SIZE = 4096
+
+_WS = set(b" \t\n\r")
+_NUM = set(b"+-0123456789.eE")
+_PUNCT = {ord(c): c for c in "{}[]:,"}
+
+# What the parser expects next.
+_VALUE = 0
+_VALUE_OR_END = 1
+_KEY = 2
+_KEY_OR_END = 3
+_COLON = 4
+_COMMA_OR_END = 5
+_DONE = 6
+
+
+def _read(read, size):
+    while True:
+        chunk = read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def _chunks(src, buf_size):
+    # Yields the input as non-empty bytes objects.  Text is encoded, so
+    # that the lexer only deals with bytes, where indexing is cheap.
+    if isinstance(src, (str, bytes)):
+        src = (src,)
+    elif hasattr(src, "read"):
+        src = _read(src.read, buf_size)
+    for chunk in src:
+        if isinstance(chunk, str):
+            chunk = chunk.encode()
+        if chunk:
+            yield chunk
+
+
+def _more(chunks, buf, pos):
+    # Returns the unconsumed part of buf with the next chunk appended, or
+    # None at the end of the input.
+    for chunk in chunks:
+        return buf[pos:] + chunk
+    return None
+
+
+def _tokens(chunks):
+    # Yields (kind, value) for each token: the punctuation characters with
+    # a value of None, and the scalar events.  Only the current token is
+    # kept from one chunk to the next.
+    buf = b""
+    pos = 0
+    offset = 0
+    while True:
+        n = len(buf)
+        while pos < n and buf[pos] in _WS:
+            pos += 1
+        if pos == n:
+            buf = _more(chunks, buf, pos)
+            if buf is None:
+                return
+            offset += pos
+            pos = 0
+            continue
+        c = buf[pos]
+        if c in _PUNCT:
+            pos += 1
+            yield _PUNCT[c], None
+        elif c == 0x22:
+            # A string: find the closing quote, skipping escaped ones.
+            j = pos + 1
+            while True:
+                j = buf.find(b'"', j)
+                if j < 0:
+                    j = len(buf) - pos
+                    buf = _more(chunks, buf, pos)
+                    if buf is None:
+                        raise ValueError(
+                            "Unterminated string starting at char %d" % (offset + pos)
+                        )
+                    offset += pos
+                    pos = 0
+                    continue
+                k = j
+                while buf[k - 1] == 0x5C:
+                    k -= 1
+                if not (j - k) & 1:
+                    break
+                j += 1
+            s = buf[pos + 1 : j]
+            if b"\\" in s:
+                # This also rejects control characters.
+                s = py_scanstring(s.decode() + '"', 0)[0]
+            elif s and min(s) < 0x20:
+                raise ValueError("Invalid control character in string at char %d" % (offset + pos))
+            else:
+                s = s.decode()
+            pos = j + 1
+            yield "string", s
+        elif c in _NUM:
+            j = pos + 1
+            while True:
+                n = len(buf)
+                while j < n and buf[j] in _NUM:
+                    j += 1
+                if j < n:
+                    break
+                more = _more(chunks, buf, pos)
+                if more is None:
+                    break
+                j -= pos
+                offset += pos
+                buf = more
+                pos = 0
+            s = buf[pos:j].decode()
+            # int() and float() accept more than JSON does, e.g. "+1", "01"
+            # or "1.", so check the whole token against the grammar first.
+            m = NUMBER_RE.match(s)
+            if m is None or m.end() != len(s):
+                raise ValueError("Invalid number %r at char %d" % (s, offset + pos))
+            if m.group(2) or m.group(3):
+                value = float(s)
+            else:
+                value = int(s)
+            pos = j
+            yield "number", value
+        else:
+            while len(buf) - pos < 5:
+                more = _more(chunks, buf, pos)
+                if more is None:
+                    break
+                offset += pos
+                buf = more
+                pos = 0
+            if buf[pos : pos + 4] == b"null":
+                pos += 4
+                yield "null", None
+            elif buf[pos : pos + 4] == b"true":
+                pos += 4
+                yield "boolean", True
+            elif buf[pos : pos + 5] == b"false":
+                pos += 5
+                yield "boolean", False
+            else:
+                raise ValueError("Expecting value: char %d" % (offset + pos))
+
+
+def basic_parse(src, buf_size=BUF_SIZE):
+    """Parse the JSON document in src, which is a str or bytes, an object
+    with a read() method, or an iterable of str or bytes chunks.
+
+    Yields (event, value) pairs, where event is one of "start_map",
+    "map_key", "end_map", "start_array", "end_array", "string", "number",
+    "boolean" and "null"; the value is the key for "map_key", the value
+    for the scalar events and None otherwise."""
+    # The open containers, as "{" or "[".
+    stack = []
+    state = _VALUE
+    for tok, value in _tokens(_chunks(src, buf_size)):
+        if state == _COMMA_OR_END:
+            if tok == ",":
+                state = _KEY if stack[-1] == "{" else _VALUE
+                continue
+            if tok == "}" and stack[-1] == "{":
+                event = "end_map"
+            elif tok == "]" and stack[-1] == "[":
+                event = "end_array"
+            else:
+                raise ValueError("Expecting ',' delimiter, got %r" % tok)
+        elif state == _COLON:
+            if tok != ":":
+                raise ValueError("Expecting ':' delimiter, got %r" % tok)
+            state = _VALUE
+            continue
+        elif state == _KEY or state == _KEY_OR_END:
+            if tok == "string":
+                yield "map_key", value
+                state = _COLON
+                continue
+            if tok != "}" or state == _KEY:
+                raise ValueError("Expecting property name enclosed in double quotes")
+            event = "end_map"
+        elif state == _VALUE_OR_END and tok == "]":
+            event = "end_array"
+        elif state == _DONE:
+            raise ValueError("Extra data")
+        elif tok == "{":
+            stack.append(tok)
+            yield "start_map", None
+            state = _KEY_OR_END
+            continue
+        elif tok == "[":
+            stack.append(tok)
+            yield "start_array", None
+            state = _VALUE_OR_END
+            continue
+        elif value is not None or tok == "null":
+            yield tok, value
+            state = _COMMA_OR_END if stack else _DONE
+            continue
+        else:
+            raise ValueError("Expecting value, got %r" % tok)
+        # The end of a container.
+        stack.pop()
+        yield event, None
+        state = _COMMA_OR_END if stack else _DONE
+    if state != _DONE:
+        raise ValueError("Unexpected end of document")
+
+
+def parse(src, buf_size=BUF_SIZE):
+    """Like basic_parse(), but yields (prefix, event, value), where prefix
+    is the path to the value: the keys of the enclosing objects and "item"
+    for array elements, joined with dots, e.g. "rows.item.name"."""
+    prefix = ""
+    # The prefixes of the open containers.
+    stack = []
+    for event, value in basic_parse(src, buf_size):
+        if event == "map_key":
+            parent = stack[-1]
+            yield parent, event, value
+            prefix = parent + "." + value if parent else value
+        elif event == "start_map":
+            yield prefix, event, None
+            stack.append(prefix)
+        elif event == "start_array":
+            yield prefix, event, None
+            stack.append(prefix)
+            prefix = prefix + ".item" if prefix else "item"
+        elif event == "end_map" or event == "end_array":
+            prefix = stack.pop()
+            yield prefix, event, None
+        else:
+            yield prefix, event, value
+
+
+def _build(events, event, value):
+    # Builds the value that starts with the given event from the events
+    # that follow it.
+    if event == "start_map":
+        root = {}
+    elif event == "start_array":
+        root = []
+    else:
+        return value
+    stack = [root]
+    key = None
+    for _, event, value in events:
+        if event == "map_key":
+            key = value
+            continue
+        if event == "end_map" or event == "end_array":
+            stack.pop()
+            if not stack:
+                return root
+            continue
+        if event == "start_map":
+            value = {}
+        elif event == "start_array":
+            value = []
+        top = stack[-1]
+        if type(top) is list:
+            top.append(value)
+        else:
+            top[key] = value
+        if event == "start_map" or event == "start_array":
+            stack.append(value)
+
+
+def items(src, prefix, buf_size=BUF_SIZE):
+    """Yields the values found at prefix (see parse()), each built as
+    json.loads() would.  Only one of them is in memory at a time."""
+    events = parse(src, buf_size)
+    for current, event, value in events:
+        if current == prefix and event not in ("map_key", "end_map", "end_array"):
+            yield _build(events, event, value)
@@ -0,0 +1,151 @@
+import io
+import json
+from json.encoder import JSONEncoder
+
+values = [
+    None,
+    True,
+    0,
+    -12,
+    1.5,
+    'a"b\\c\né\U0001f600',
+    [],
+    {},
+    [1, [2, [3, ()]], {"x": None}],
+    {"n": "temp", "u": "Cel", "v": 23.1, "t": 1, "bn": "urn:dev:1", "e": [{"n": "x"}]},
+    {1: "int", 2.5: "float", True: "bool", None: "none"},
+    [float("inf"), float("-inf")],
+]
+
+# dump() writes the same text as iterencode(), with any separators.
+for kw in ({}, {"separators": (",", ":")}, {"sort_keys": True}, {"ensure_ascii": False}):
+    enc = JSONEncoder(**kw)
+    for v in values:
+        if kw.get("sort_keys") and isinstance(v, dict) and None in v:
+            continue
+        expected = "".join(enc.iterencode(v))
+        chunks = []
+        enc.dump(v, chunks)
+        assert "".join(chunks) == expected, (kw, v)
+        # Again, with the keys already cached.
+        assert enc.encode(v) == expected, (kw, v)
+        fp = io.StringIO()
+        json.dump(v, fp, **kw)
+        assert fp.getvalue() == expected, (kw, v)
+
+assert json.dumps({"a": [1, 2]}, separators=(",", ":")) == '{"a":[1,2]}'
+assert json.dumps([1, {"a": 1}], separators=[",", ":"]) == '[1,{"a":1}]'
+
+# Keys that compare equal but encode differently aren't confused.
+enc = JSONEncoder()
+assert enc.encode({1: 0}) == '{"1": 0}'
+assert enc.encode({True: 0}) == '{"true": 0}'
+assert enc.encode({"1": 0}) == '{"1": 0}'
+
+enc = JSONEncoder(skipkeys=True)
+assert enc.encode({(1,): 0, "a": 1}) == '{"a": 1}'
+
+for bad, kw in ((float("nan"), {"allow_nan": False}), ({(1,): 0}, {})):
+    try:
+        JSONEncoder(**kw).dump(bad, [])
+        assert False
+    except (TypeError, ValueError):
+        pass
+
+# Circular references are detected, and don't affect the next call.
+loop = [1]
+loop.append(loop)
+enc = JSONEncoder()
+try:
+    enc.dump(loop, [])
+    assert False
+except ValueError:
+    pass
+shared = [1]
+assert enc.encode([shared, shared]) == "[[1], [1]]"
+
+
+# A default() that encodes with the same encoder, as the shared one used
+# by json.dumps() is, doesn't disturb the outer call.
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+enc = JSONEncoder(default=lambda o: json.loads(json.dumps({"x": o.x, "y": [o.y]})))
+assert enc.encode([Point(1, 2), {"p": Point(3, 4)}]) == (
+    '[{"x": 1, "y": [2]}, {"p": {"x": 3, "y": [4]}}]'
+)
+
+
+def default(o):
+    chunks = []
+    nested.dump([o.x], chunks)
+    return "".join(chunks)
+
+
+nested = JSONEncoder(default=default)
+chunks = []
+nested.dump({"a": [Point(5, 0)]}, chunks)
+assert "".join(chunks) == '{"a": ["[5]"]}'
+
+
+# Changes to the options after the first call take effect.
+def dump(enc, o):
+    chunks = []
+    enc.dump(o, chunks)
+    return "".join(chunks)
+
+
+enc = JSONEncoder()
+assert dump(enc, {"b": 1, "a": 2}) == '{"b": 1, "a": 2}'
+enc.sort_keys = True
+assert dump(enc, {"b": 1, "a": 2}) == '{"a": 2, "b": 1}'
+enc.ensure_ascii = False
+assert dump(enc, {"é": 1}) == '{"é": 1}'
+enc.ensure_ascii = True
+assert dump(enc, {"é": 1}) == '{"\\u00e9": 1}'
+
+
+# A subclass overriding iterencode() isn't bypassed by the faster path.
+class Overridden(JSONEncoder):
+    def iterencode(self, o, _one_shot=False):
+        return ["OVERRIDDEN"]
+
+
+assert json.dumps([1.23456], cls=Overridden) == "OVERRIDDEN"
+fp = io.StringIO()
+json.dump([1.23456], fp, cls=Overridden)
+assert fp.getvalue() == "OVERRIDDEN"
+assert dump(Overridden(), [1.23456]) == "OVERRIDDEN"
+
+# Calls from several threads at once.
+try:
+    import _thread
+except ImportError:
+    _thread = None
+if _thread:
+    import time
+
+    doc = [{"k%d" % i: [i, {"n": None}]} for i in range(50)]
+    expected = json.dumps(doc)
+    results = []
+
+    def worker():
+        for _ in range(50):
+            fp = io.StringIO()
+            try:
+                json.dump(doc, fp)
+            except Exception as e:
+                results.append(e)
+            else:
+                results.append(fp.getvalue() == expected)
+
+    for _ in range(4):
+        _thread.start_new_thread(worker, ())
+    for _ in range(500):
+        if len(results) == 200:
+            break
+        time.sleep(0.01)
+    assert results == [True] * 200, results
@@ -0,0 +1,66 @@
+import io
+import json
+import json.stream
+
+doc = '{"a": [1, 2.5, -3e2, "x\\"y\\u00e9", true, false, null, {}, []], "b": {"c": "d"}}'
+
+events = list(json.stream.basic_parse(doc))
+assert events[:4] == [("start_map", None), ("map_key", "a"), ("start_array", None), ("number", 1)]
+assert ("string", 'x"yé') in events
+assert events[-1] == ("end_map", None)
+
+# Any chunking of the input gives the same events, including chunks that
+# split tokens and multi-byte characters.
+raw = doc.encode()
+for size in (1, 2, 3, 7):
+    chunks = [raw[i : i + size] for i in range(0, len(raw), size)]
+    assert list(json.stream.basic_parse(chunks)) == events
+    assert list(json.stream.basic_parse(io.BytesIO(raw), size)) == events
+
+assert list(json.stream.parse('{"a": [1, {"b": 2}]}')) == [
+    ("", "start_map", None),
+    ("", "map_key", "a"),
+    ("a", "start_array", None),
+    ("a.item", "number", 1),
+    ("a.item", "start_map", None),
+    ("a.item", "map_key", "b"),
+    ("a.item.b", "number", 2),
+    ("a.item", "end_map", None),
+    ("a", "end_array", None),
+    ("", "end_map", None),
+]
+
+assert list(json.stream.items(doc, "a.item")) == json.loads(doc)["a"]
+assert list(json.stream.items(doc, "b")) == [{"c": "d"}]
+assert list(json.stream.items(doc, "")) == [json.loads(doc)]
+assert list(json.stream.items("[[1, [2]], 3]", "item")) == [[1, [2]], 3]
+assert list(json.stream.items(io.StringIO('"top"'), "")) == ["top"]
+
+for bad in (
+    "",
+    "[1,]",
+    "[1 2]",
+    '{"a" 1}',
+    '{"a": 1,}',
+    "[1]]",
+    "nul",
+    '"abc',
+    "{1: 2}",
+    "+1",
+    "01",
+    "[-01]",
+    "1.",
+    "[.5]",
+    "1e",
+    "1e+",
+    "1.5e",
+    "--1",
+    "1-2",
+    '"a\nb"',
+    '["a\tb\\n"]',
+):
+    try:
+        list(json.stream.basic_parse(bad))
+        assert False, bad
+    except ValueError:
+        pass
@@ -0,0 +1,76 @@
+# Measure how late periodic callbacks run, against the ideal schedule of
+# one every period from the start, for a loop that sleeps for the period
+# between callbacks, and for timers from machine.timerfd, one alone and
+# then several sharing a TimerGroup.  Each callback does WORK_US of busy
+# work, which the sleeping loop adds to every period.
+
+import time
+from machine.timerfd import Timer, TimerGroup
+
+try:
+    ticks_us = time.ticks_us
+    ticks_diff = time.ticks_diff
+except AttributeError:
+    ticks_us = lambda: int(time.perf_counter() * 1000000)
+    ticks_diff = lambda a, b: a - b
+
+DURATION_MS = 2000
+WORK_US = 200
+
+
+def work():
+    t = ticks_us()
+    while ticks_diff(ticks_us(), t) < WORK_US:
+        pass
+
+
+class Stats:
+    def __init__(self, period_ms):
+        self.period_us = int(period_ms * 1000)
+        self.start = ticks_us()
+        self.late = []
+
+    def tick(self, n):
+        # Called for the nth expiry.
+        self.late.append(ticks_diff(ticks_us(), self.start) - n * self.period_us)
+        work()
+
+    def report(self, name, overruns=0):
+        late = self.late
+        print(
+            "  %-22s %5d calls, late by mean %6d us, max %6d us, last %6d us, %d overruns"
+            % (name, len(late), sum(late) // len(late), max(late), late[-1], overruns)
+        )
+
+
+def sleeping(period_ms):
+    stats = Stats(period_ms)
+    for n in range(1, DURATION_MS // period_ms + 1):
+        time.sleep_ms(period_ms)
+        stats.tick(n)
+    stats.report("sleep_ms(%d)" % period_ms)
+
+
+def timers(periods):
+    group = TimerGroup()
+    stats = {}
+    for period_ms in periods:
+        s = Stats(period_ms)
+        t = Timer(period=period_ms, callback=lambda t: stats[t].tick(t.count))
+        stats[t] = s
+        group.add(t)
+    t = ticks_us()
+    while ticks_diff(ticks_us(), t) < DURATION_MS * 1000:
+        group.poll(DURATION_MS)
+    for timer in group.timers:
+        stats[timer].report("timerfd, %d ms" % (stats[timer].period_us // 1000), timer.overruns)
+    group.close()
+
+
+print("%d ms of %d us callbacks:" % (DURATION_MS, WORK_US))
+sleeping(1)
+sleeping(10)
+timers((1,))
+timers((10,))
+print("together:")
+timers((1, 2, 5, 10, 20, 50))
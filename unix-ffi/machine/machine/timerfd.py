@@ -0,0 +1,175 @@
+# Timers backed by Linux timerfd, as an alternative to those in timer.py.
+#
+# timer.py runs each callback from a signal handler, interrupting whatever
+# code was running.  Here, each timer is a file descriptor that becomes
+# readable when the timer expires, and callbacks run only when the program
+# asks for them, from TimerGroup.poll(), or from a task with asyncio.
+#
+# A periodic timer's schedule is kept by the kernel from the time it was
+# started, so a late callback doesn't make the next one late as well.  If
+# the program falls so far behind that the timer expires more than once
+# before it is read, the callback runs once, and the expirations missed
+# are counted in the timer's overruns.
+#
+#     from machine.timerfd import Timer, TimerGroup
+#
+#     group = TimerGroup()
+#     group.add(Timer(period=10, callback=lambda t: print("tick", t.count)))
+#     while True:
+#         group.poll()
+
+import struct
+import errno
+import ffilib
+import os
+import select
+
+libc = ffilib.libc()
+
+CLOCK_MONOTONIC = 1
+TFD_NONBLOCK = 0o0004000
+TFD_CLOEXEC = 0o2000000
+
+# int timerfd_create(int clockid, int flags);
+timerfd_create_ = libc.func("i", "timerfd_create", "ii")
+# int timerfd_settime(int fd, int flags, const struct itimerspec *new_value,
+#                     struct itimerspec *old_value);
+timerfd_settime_ = libc.func("i", "timerfd_settime", "iiPp")
+
+# struct itimerspec: it_interval then it_value, each tv_sec and tv_nsec.
+_ITIMERSPEC = "llll"
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        # id is accepted for compatibility with machine.Timer, and ignored.
+        self.fd = -1
+        self._group = None
+        self._spec = bytearray(struct.calcsize(_ITIMERSPEC))
+        self._buf = bytearray(8)
+        self.count = 0
+        self.overruns = 0
+        if kwargs:
+            self.init(**kwargs)
+
+    def __repr__(self):
+        return "<Timer fd=%d count=%d overruns=%d>" % (self.fd, self.count, self.overruns)
+
+    def init(self, mode=PERIODIC, freq=-1, period=-1, callback=None):
+        # period is in milliseconds, freq in Hz, and either may be a float.
+        if freq > 0:
+            ns = int(1000000000 / freq)
+        elif period > 0:
+            ns = int(period * 1000000)
+        else:
+            raise ValueError("period")
+        if self.fd < 0:
+            self.fd = timerfd_create_(CLOCK_MONOTONIC, TFD_NONBLOCK | TFD_CLOEXEC)
+            os.check_error(self.fd)
+        self.callback = callback
+        # The number of expirations, and of those missed.
+        self.count = 0
+        self.overruns = 0
+        sec, nsec = divmod(ns, 1000000000)
+        if mode == Timer.PERIODIC:
+            struct.pack_into(_ITIMERSPEC, self._spec, 0, sec, nsec, sec, nsec)
+        else:
+            struct.pack_into(_ITIMERSPEC, self._spec, 0, 0, 0, sec, nsec)
+        os.check_error(timerfd_settime_(self.fd, 0, self._spec, None))
+
+    def deinit(self):
+        if self.fd >= 0:
+            if self._group:
+                self._group.remove(self)
+            os.close(self.fd)
+            self.fd = -1
+
+    def fileno(self):
+        return self.fd
+
+    def read(self):
+        # Returns the number of times the timer has expired since it was
+        # last read, which is 0 if it hasn't, and doesn't wait.
+        while True:
+            r = os.read_(self.fd, self._buf, 8)
+            try:
+                if not os.check_error(r):
+                    break
+            except OSError as e:
+                if e.args[0] == errno.EAGAIN:
+                    return 0
+                raise
+        n = struct.unpack_from("Q", self._buf)[0]
+        self.count += n
+        self.overruns += n - 1
+        return n
+
+    def dispatch(self):
+        # Runs the callback if the timer has expired.
+        n = self.read()
+        if n and self.callback:
+            self.callback(self)
+        return n
+
+    def wait(self):
+        # For asyncio: "await timer.wait()" waits for the timer to expire and
+        # returns the number of expirations, without running the callback.
+        from asyncio import core
+
+        while True:
+            yield core._io_queue.queue_read(self.fd)
+            n = self.read()
+            if n:
+                return n
+
+
+class TimerGroup:
+    # Any number of timers, waited for together with one epoll instance.
+    # The group has a file descriptor of its own, readable when any of its
+    # timers has expired, so it can itself be waited on with another
+    # poller, or with asyncio.
+
+    def __init__(self, maxevents=16):
+        self.poller = select.epoll()
+        self.maxevents = maxevents
+        self.timers = []
+
+    def add(self, timer):
+        self.poller.register(timer.fd, select.EPOLLIN, timer)
+        self.timers.append(timer)
+        timer._group = self
+
+    def remove(self, timer):
+        self.poller.unregister(timer.fd)
+        self.timers.remove(timer)
+        timer._group = None
+
+    def fileno(self):
+        return self.poller.epfd
+
+    def poll(self, timeout=-1):
+        # Waits up to timeout milliseconds, or forever if -1, for a timer to
+        # expire, then runs the callbacks of all that have.  Returns the
+        # number of callbacks run.
+        n = 0
+        for timer, ev in self.poller.poll_ms(timeout, self.maxevents):
+            if timer.dispatch():
+                n += 1
+        return n
+
+    def run(self):
+        # For asyncio: "await group.run()" runs the callbacks of the timers
+        # as they expire, until the group has no timers left.
+        from asyncio import core
+
+        while self.timers:
+            yield core._io_queue.queue_read(self.poller.epfd)
+            self.poll(0)
+
+    def close(self):
+        for timer in self.timers[:]:
+            timer.deinit()
+        self.poller.close()
@@ -1,9 +1,10 @@
-metadata(version="0.2.3")
+metadata(version="0.3.0")
 
 # Originally written by Paul Sokolovsky.
 
 require("ffilib")
 require("os")
+require("select")
 require("signal")
 
 package("machine")
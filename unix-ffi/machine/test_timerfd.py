@@ -0,0 +1,39 @@
+import time
+from machine.timerfd import Timer, TimerGroup
+
+ticks = []
+group = TimerGroup()
+fast = Timer(period=5, callback=ticks.append)
+slow = Timer(freq=20, callback=ticks.append)
+group.add(fast)
+group.add(slow)
+
+# 100 ms holds 20 expirations of fast and 2 of slow.
+t = time.ticks_ms()
+while time.ticks_diff(time.ticks_ms(), t) < 102:
+    group.poll(10)
+assert 19 <= fast.count <= 21, fast
+assert slow.count == 2 and slow.overruns == 0, slow
+assert ticks.count(fast) + fast.overruns == fast.count
+assert ticks.count(slow) == 2
+
+# Expirations while nobody is looking are counted, with one callback.
+n = len(ticks)
+time.sleep_ms(50)
+assert group.poll(0) == 2
+assert len(ticks) == n + 2
+assert fast.overruns >= 9, fast
+
+# A one-shot timer expires once.
+once = Timer(mode=Timer.ONE_SHOT, period=1, callback=ticks.append)
+group.add(once)
+time.sleep_ms(10)
+group.poll(0)
+time.sleep_ms(10)
+group.poll(0)
+assert once.count == 1 and once.read() == 0
+
+once.deinit()
+assert once not in group.timers
+group.close()
+assert fast.fd == -1 and slow.fd == -1
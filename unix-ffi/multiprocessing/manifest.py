@@ -1,7 +1,8 @@
-metadata(version="0.1.2")
+metadata(version="0.3.0")
 
 # Originally written by Paul Sokolovsky.
 
+require("ffilib")
 require("os")
 require("select")
 require("pickle")
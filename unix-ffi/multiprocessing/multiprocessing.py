@@ -1,6 +1,17 @@
 import os
 import pickle
 import select
+import time
+import ffilib
+import uctypes
+
+
+class ProcessError(Exception):
+    pass
+
+
+class TimeoutError(ProcessError):
+    pass
 
 
 class Process:
@@ -33,27 +44,37 @@ class Process:
 
 
 class Connection:
-    def __init__(self, fd):
+    def __init__(self, fd, mode="r+b"):
         self.fd = fd
-        self.f = open(fd)
+        # Binary mode, as pickles are bytes.
+        self.f = open(fd, mode)
 
     def __repr__(self):
         return "<Connection %s>" % self.f
 
+    def fileno(self):
+        return self.fd
+
     def send(self, obj):
         s = pickle.dumps(obj)
         self.f.write(len(s).to_bytes(4, "little"))
         self.f.write(s)
 
-    def recv(self):
-        s = self.f.read(4)
-        if not s:
-            raise EOFError
-        l = int.from_bytes(s, "little")
-        s = self.f.read(l)
+    def _read(self, n):
+        # A read from a pipe can return less than was asked for.
+        s = self.f.read(n)
         if not s:
             raise EOFError
-        return pickle.loads(s)
+        while len(s) < n:
+            more = self.f.read(n - len(s))
+            if not more:
+                raise EOFError
+            s += more
+        return s
+
+    def recv(self):
+        l = int.from_bytes(self._read(4), "little")
+        return pickle.loads(self._read(l))
 
     def close(self):
         self.f.close()
@@ -62,52 +83,806 @@ class Connection:
 def Pipe(duplex=True):
     assert duplex == False
     r, w = os.pipe()
-    return Connection(r), Connection(w)
+    return Connection(r, "rb"), Connection(w, "wb")
+
+
+def cpu_count():
+    n = 0
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("processor"):
+                    n += 1
+    except OSError:
+        pass
+    if not n:
+        raise NotImplementedError("cannot determine number of cpus")
+    return n
+
+
+# How a task calls its function: f(*args, **kwargs), f(x) for each item of
+# a chunk, or f(*x) for each item of a chunk.
+_APPLY = 0
+_MAP = 1
+_STARMAP = 2
+
+
+def _worker(funcs, tasks, results, initializer, initargs):
+    # The loop run by each worker process.  Tasks are
+    # (index, function number, mode, arguments) tuples, and the result of
+    # each is sent back as (index, ok, value).
+    if initializer:
+        initializer(*initargs)
+    while True:
+        try:
+            task = tasks.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        i, fi, mode, args = task
+        f = funcs[fi]
+        try:
+            if mode == _APPLY:
+                value = f(*args[0], **args[1])
+            elif mode == _MAP:
+                value = [f(x) for x in args]
+            else:
+                value = [f(*x) for x in args]
+            ok = True
+        except Exception as e:
+            ok = False
+            value = (type(e).__name__, str(e))
+        try:
+            results.send((i, ok, value))
+        except Exception as e:
+            results.send((i, False, (type(e).__name__, str(e))))
+
+
+def _remote_error(value):
+    # Recreates an exception raised in a worker, as far as possible.
+    import builtins
+
+    name, msg = value
+    cls = getattr(builtins, name, None)
+    if isinstance(cls, type) and issubclass(cls, Exception):
+        return cls(msg)
+    return ProcessError("%s: %s" % (name, msg))
+
+
+class _Worker:
+    def __init__(self, pid, tasks, results):
+        self.pid = pid
+        self.tasks = tasks
+        self.results = results
+        # The task being run and the result it is for, or None if the
+        # worker is idle.
+        self.task = None
+        self.result = None
+
+    def close(self):
+        self.tasks.close()
+        self.results.close()
 
 
 class AsyncResult:
-    def __init__(self, p, r):
-        self.p = p
-        self.r = r
-        self.ep = None
+    def __init__(self, pool, callback=None, error_callback=None):
+        self._pool = pool
+        self._callback = callback
+        self._error_callback = error_callback
+        self._ready = False
+        self._value = None
+        self._error = None
 
-    def get(self):
-        res = self.r.recv()
-        self.p.join()
-        return res
+    def _set(self, i, ok, value):
+        self._ready = True
+        if ok:
+            self._value = value
+            if self._callback:
+                self._callback(value)
+        else:
+            self._error = value
+            if self._error_callback:
+                self._error_callback(value)
 
     def ready(self):
-        if not self.ep:
-            self.ep = select.epoll()
-            self.ep.register(self.r.f.fileno(), select.EPOLLIN, None)
-        res = self.ep.poll(0)
-        if res:
-            self.ep.close()
-        return bool(res)
+        if not self._ready:
+            self._pool._pump(0)
+        return self._ready
+
+    def successful(self):
+        if not self._ready:
+            raise ValueError("result is not ready")
+        return self._error is None
+
+    def wait(self, timeout=None):
+        self._pool._wait(self, timeout)
+
+    def get(self, timeout=None):
+        self.wait(timeout)
+        if not self._ready:
+            raise TimeoutError
+        if self._error is not None:
+            raise self._error
+        return self._value
+
+
+class MapResult(AsyncResult):
+    def __init__(self, pool, nchunks, callback=None, error_callback=None):
+        super().__init__(pool, callback, error_callback)
+        self._chunks = [None] * nchunks
+        self._left = nchunks
+        if not nchunks:
+            self._set_value()
+
+    def _set_value(self):
+        value = []
+        for chunk in self._chunks:
+            value.extend(chunk)
+        self._chunks = None
+        AsyncResult._set(self, 0, True, value)
+
+    def _set(self, i, ok, value):
+        if self._ready:
+            return
+        if not ok:
+            self._chunks = None
+            AsyncResult._set(self, i, False, value)
+            return
+        self._chunks[i] = value
+        self._left -= 1
+        if not self._left:
+            self._set_value()
+
+
+class IMapIterator:
+    def __init__(self, pool, ordered):
+        self._pool = pool
+        self._ordered = ordered
+        # Finished chunks not yet returned, by index when ordered.
+        self._done = {} if ordered else []
+        self._next_chunk = 0
+        self._items = None
+        self._pos = 0
+        # The number of chunks, once they have all been dispatched.
+        self._nchunks = None
+
+    def _set(self, i, ok, value):
+        if self._ordered:
+            self._done[i] = value
+        else:
+            self._done.append(value)
+
+    def _set_length(self, n):
+        self._nchunks = n
+
+    def __iter__(self):
+        return self
+
+    def _next_done(self):
+        if self._ordered:
+            return self._done.pop(self._next_chunk, None)
+        if self._done:
+            return self._done.pop(0)
+        return None
+
+    def __next__(self):
+        while self._items is None or self._pos == len(self._items):
+            items = self._next_done()
+            if items is None:
+                if self._next_chunk == self._nchunks:
+                    raise StopIteration
+                self._pool._pump(-1)
+                continue
+            self._next_chunk += 1
+            if isinstance(items, Exception):
+                raise items
+            self._items = items
+            self._pos = 0
+        self._pos += 1
+        return self._items[self._pos - 1]
+
+
+def _chunks(result, fi, mode, iterable, chunksize):
+    # Yields the tasks for a map, reading the input lazily.
+    it = iter(iterable)
+    i = 0
+    while True:
+        chunk = []
+        for x in it:
+            chunk.append(x)
+            if len(chunk) == chunksize:
+                break
+        if not chunk:
+            if isinstance(result, IMapIterator):
+                result._set_length(i)
+            return
+        yield (i, fi, mode, chunk)
+        i += 1
 
 
 class Pool:
-    def __init__(self, num):
-        self.num = num
+    # Worker processes are forked when the first task is submitted and are
+    # then reused.  Each worker gets one task at a time through a pipe, and
+    # the results are collected with epoll, whenever the caller waits for
+    # or checks on a result.  A worker that dies is replaced.
+    #
+    # Functions can't be pickled, so tasks refer to them by their position
+    # in a list the workers inherit when they are forked.  The first use of
+    # a new function waits for running tasks to finish and then forks new
+    # workers, so it's best to use a few module-level functions rather
+    # than a new lambda for each call.
+
+    def __init__(self, processes=None, initializer=None, initargs=()):
+        if processes is None:
+            try:
+                processes = cpu_count()
+            except NotImplementedError:
+                processes = 1
+        if processes < 1:
+            raise ValueError("Number of processes must be at least 1")
+        self.num = processes
+        self._initializer = initializer
+        self._initargs = initargs
+        self._funcs = []
+        self._func_index = {}
+        self._workers = []
+        self._idle = []
+        self._ep = None
+        # (result, iterator) pairs for the tasks that haven't been sent to a
+        # worker yet.
+        self._sources = []
+        self._closed = False
+
+    def _start_worker(self):
+        tr, tw = os.pipe()
+        rr, rw = os.pipe()
+        pid = os.fork()
+        if not pid:
+            try:
+                os.close(tw)
+                os.close(rr)
+                for w in self._workers:
+                    w.close()
+                _worker(
+                    self._funcs,
+                    Connection(tr, "rb"),
+                    Connection(rw, "wb"),
+                    self._initializer,
+                    self._initargs,
+                )
+            finally:
+                os._exit(0)
+        os.close(tr)
+        os.close(rw)
+        w = _Worker(pid, Connection(tw, "wb"), Connection(rr, "rb"))
+        self._ep.register(rr, select.EPOLLIN, w)
+        self._workers.append(w)
+        self._idle.append(w)
+
+    def _start_workers(self):
+        if self._ep is None:
+            self._ep = select.epoll(self.num)
+        while len(self._workers) < self.num:
+            self._start_worker()
+
+    def _stop_workers(self):
+        for w in self._workers:
+            w.tasks.send(None)
+        self._reap()
 
-    def _apply(self, f, args, kwargs):
-        # This is pretty inefficient impl, doesn't really use pool worker
-        def _exec(w):
-            r = f(*args, **kwargs)
-            w.send(r)
+    def _reap(self):
+        for w in self._workers:
+            self._ep.unregister(w.results.fileno())
+            w.close()
+            os.waitpid(w.pid, 0)
+        self._workers = []
+        self._idle = []
 
-        r, w = Pipe(False)
-        p = Process(target=_exec, args=(w,))
-        p.register_pipe(r, w)
-        p.start()
-        return p, r
+    def _restart(self, w):
+        # A worker exited: fail the task it was running and replace it.
+        self._ep.unregister(w.results.fileno())
+        w.close()
+        os.waitpid(w.pid, 0)
+        self._workers.remove(w)
+        if w in self._idle:
+            self._idle.remove(w)
+        if w.task is not None:
+            w.result._set(w.task[0], False, ProcessError("worker process exited"))
+        self._start_worker()
+
+    def _func(self, f):
+        i = self._func_index.get(f)
+        if i is None:
+            if self._workers:
+                # The workers don't have this function.
+                while self._sources or len(self._idle) < len(self._workers):
+                    self._pump(-1)
+                self._stop_workers()
+            i = len(self._funcs)
+            self._funcs.append(f)
+            self._func_index[f] = i
+        return i
+
+    def _submit(self, result, tasks):
+        if self._closed:
+            raise ValueError("Pool not running")
+        self._sources.append((result, tasks))
+        self._dispatch()
+        return result
+
+    def _dispatch(self):
+        if self._sources and not self._workers:
+            self._start_workers()
+        while self._idle and self._sources:
+            result, tasks = self._sources[0]
+            try:
+                task = next(tasks)
+            except StopIteration:
+                self._sources.pop(0)
+                continue
+            w = self._idle.pop()
+            w.task = task
+            w.result = result
+            w.tasks.send(task)
+
+    def _pump(self, timeout):
+        # Sends queued tasks to idle workers, and then waits up to timeout
+        # milliseconds (or forever if it's -1) for a result.
+        self._dispatch()
+        if len(self._idle) == len(self._workers):
+            return
+        for w, ev in self._ep.poll_ms(timeout):
+            try:
+                i, ok, value = w.results.recv()
+            except EOFError:
+                self._restart(w)
+                continue
+            result = w.result
+            w.task = w.result = None
+            self._idle.append(w)
+            result._set(i, ok, value if ok else _remote_error(value))
+        self._dispatch()
+
+    def _wait(self, result, timeout):
+        if timeout is None:
+            while not result._ready:
+                self._pump(-1)
+            return
+        deadline = time.ticks_add(time.ticks_ms(), int(timeout * 1000))
+        while not result._ready:
+            left = time.ticks_diff(deadline, time.ticks_ms())
+            if left < 0:
+                return
+            self._pump(left)
+
+    def _chunksize(self, iterable, chunksize):
+        if chunksize is None:
+            chunksize, extra = divmod(len(iterable), self.num * 4)
+            if extra:
+                chunksize += 1
+        return max(chunksize, 1)
 
     def apply(self, f, args=(), kwargs={}):
-        p, r = self._apply(f, args, kwargs)
-        res = r.recv()
-        p.join()
-        return res
-
-    def apply_async(self, f, args=(), kwargs={}, callback=None, errback=None):
-        p, r = self._apply(f, args, kwargs)
-        return AsyncResult(p, r)
+        return self.apply_async(f, args, kwargs).get()
+
+    def apply_async(self, f, args=(), kwargs={}, callback=None, error_callback=None):
+        fi = self._func(f)
+        result = AsyncResult(self, callback, error_callback)
+        return self._submit(result, iter(((0, fi, _APPLY, (args, kwargs)),)))
+
+    def _map_async(self, f, iterable, mode, chunksize, callback, error_callback):
+        fi = self._func(f)
+        if not hasattr(iterable, "__len__"):
+            iterable = list(iterable)
+        chunksize = self._chunksize(iterable, chunksize)
+        nchunks = (len(iterable) + chunksize - 1) // chunksize
+        result = MapResult(self, nchunks, callback, error_callback)
+        return self._submit(result, _chunks(result, fi, mode, iterable, chunksize))
+
+    def map_async(self, f, iterable, chunksize=None, callback=None, error_callback=None):
+        return self._map_async(f, iterable, _MAP, chunksize, callback, error_callback)
+
+    def starmap_async(self, f, iterable, chunksize=None, callback=None, error_callback=None):
+        return self._map_async(f, iterable, _STARMAP, chunksize, callback, error_callback)
+
+    def map(self, f, iterable, chunksize=None):
+        return self.map_async(f, iterable, chunksize).get()
+
+    def starmap(self, f, iterable, chunksize=None):
+        return self.starmap_async(f, iterable, chunksize).get()
+
+    def _imap(self, f, iterable, chunksize, ordered):
+        fi = self._func(f)
+        result = IMapIterator(self, ordered)
+        return self._submit(result, _chunks(result, fi, _MAP, iterable, chunksize))
+
+    def imap(self, f, iterable, chunksize=1):
+        return self._imap(f, iterable, chunksize, True)
+
+    def imap_unordered(self, f, iterable, chunksize=1):
+        return self._imap(f, iterable, chunksize, False)
+
+    def close(self):
+        self._closed = True
+
+    def join(self):
+        # Finishes the outstanding tasks, then stops the workers.
+        if self._workers:
+            while self._sources or len(self._idle) < len(self._workers):
+                self._pump(-1)
+            self._stop_workers()
+
+    def terminate(self):
+        self._closed = True
+        for w in self._workers:
+            try:
+                os.kill(w.pid, 15)
+            except OSError:
+                pass
+        if self._workers:
+            self._reap()
+        self._sources = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.terminate()
+
+
+# Shared memory.  Segments are mapped with mmap(MAP_SHARED), either
+# anonymously, so that they are shared with the processes forked after
+# they are created, or from a named POSIX shared memory object.
+
+libc = ffilib.libc()
+
+# void *mmap(void *addr, size_t length, int prot, int flags, int fd, off_t offset);
+mmap_ = libc.func("p", "mmap", "pLiiil")
+# int munmap(void *addr, size_t length);
+munmap_ = libc.func("i", "munmap", "pL")
+# int ftruncate(int fd, off_t length);
+ftruncate_ = libc.func("i", "ftruncate", "il")
+# off_t lseek(int fd, off_t offset, int whence);
+lseek_ = libc.func("l", "lseek", "ili")
+try:
+    # int shm_open(const char *name, int oflag, mode_t mode);
+    shm_open_ = libc.func("i", "shm_open", "sii")
+    # int shm_unlink(const char *name);
+    shm_unlink_ = libc.func("i", "shm_unlink", "s")
+except OSError:
+    # Before glibc 2.34 these are in librt.
+    librt = ffilib.open("librt")
+    shm_open_ = librt.func("i", "shm_open", "sii")
+    shm_unlink_ = librt.func("i", "shm_unlink", "s")
+try:
+    # int sem_init(sem_t *sem, int pshared, unsigned int value);
+    sem_init_ = libc.func("i", "sem_init", "pii")
+    # int sem_wait(sem_t *sem);
+    sem_wait_ = libc.func("i", "sem_wait", "p")
+    # int sem_post(sem_t *sem);
+    sem_post_ = libc.func("i", "sem_post", "p")
+except OSError:
+    # Before glibc 2.34 these are in libpthread.
+    libpthread = ffilib.open("libpthread")
+    sem_init_ = libpthread.func("i", "sem_init", "pii")
+    sem_wait_ = libpthread.func("i", "sem_wait", "p")
+    sem_post_ = libpthread.func("i", "sem_post", "p")
+
+PROT_READ = 0x1
+PROT_WRITE = 0x2
+MAP_SHARED = 0x01
+MAP_ANONYMOUS = 0x20
+MAP_FAILED = (1 << ffilib.bitness) - 1
+SEEK_END = 2
+# Enough for a sem_t on any platform glibc supports.
+SEM_SIZE = 32
+
+
+def _mmap(size, fd=-1):
+    flags = MAP_SHARED if fd >= 0 else MAP_SHARED | MAP_ANONYMOUS
+    addr = mmap_(None, size, PROT_READ | PROT_WRITE, flags, fd, 0)
+    if addr in (-1, MAP_FAILED):
+        os.raise_error()
+    return addr
+
+
+class SharedMemory:
+    # A named POSIX shared memory segment, as in CPython's
+    # multiprocessing.shared_memory.  buf is a memoryview of its contents.
+
+    def __init__(self, name=None, create=False, size=0):
+        if create:
+            if size <= 0:
+                raise ValueError("'size' must be a positive number different from zero")
+            flags = os.O_CREAT | os.O_EXCL | os.O_RDWR
+            if name is None:
+                name = "psm_" + "".join("%02x" % b for b in os.urandom(8))
+        else:
+            if name is None:
+                raise ValueError("'name' can only be None if create=True")
+            flags = os.O_RDWR
+        self._name = name
+        fd = shm_open_("/" + name, flags, 0o600)
+        os.check_error(fd)
+        try:
+            if create:
+                os.check_error(ftruncate_(fd, size))
+            else:
+                size = lseek_(fd, 0, SEEK_END)
+                os.check_error(size)
+            self._addr = _mmap(size, fd)
+        finally:
+            os.close(fd)
+        self._size = size
+        self._buf = memoryview(uctypes.bytearray_at(self._addr, size))
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def buf(self):
+        return self._buf
+
+    def close(self):
+        if self._buf is not None:
+            self._buf = None
+            munmap_(self._addr, self._size)
+
+    def __del__(self):
+        self.close()
+
+    def unlink(self):
+        os.check_error(shm_unlink_("/" + self._name))
+
+    def __repr__(self):
+        return "SharedMemory(%r, size=%d)" % (self._name, self._size)
+
+
+# uctypes types for array typecodes.
+_UCTYPES = {
+    "b": uctypes.INT8,
+    "B": uctypes.UINT8,
+    "h": uctypes.INT16,
+    "H": uctypes.UINT16,
+    "i": uctypes.INT32,
+    "I": uctypes.UINT32,
+    "l": uctypes.LONG,
+    "L": uctypes.ULONG,
+    "q": uctypes.INT64,
+    "Q": uctypes.UINT64,
+    "f": uctypes.FLOAT32,
+    "d": uctypes.FLOAT64,
+}
+
+
+def _typed(typecode, n):
+    # Allocates shared memory for n items, returning the address, the size
+    # in bytes and an indexable view of the items.
+    t = _UCTYPES[typecode]
+    size = uctypes.sizeof((uctypes.ARRAY | 0, n | t)) if n else 0
+    addr = _mmap(max(size, 1))
+    return addr, size, uctypes.struct(addr, (uctypes.ARRAY | 0, max(n, 1) | t), uctypes.NATIVE)
+
+
+class _Mapped:
+    # Unmaps the memory of an Array or Value, which is only done in the
+    # process that calls close(), or in which the object is freed.
+
+    def close(self):
+        if self.buf is not None:
+            self.buf = None
+            self._items = None
+            munmap_(self._addr, max(self._size, 1))
+
+    def __del__(self):
+        self.close()
+
+
+class Array(_Mapped):
+    # A fixed-size array of numbers in anonymous shared memory, shared with
+    # the processes forked after it is created.  Items are read and written
+    # by index, and buf is a memoryview of the raw bytes, for copying whole
+    # buffers in and out.  There is no lock, so the lock argument is only
+    # accepted for compatibility.
+
+    def __init__(self, typecode, size_or_initializer, lock=True):
+        if isinstance(size_or_initializer, int):
+            n = size_or_initializer
+            init = None
+        else:
+            init = size_or_initializer
+            n = len(init)
+        self.typecode = typecode
+        self._len = n
+        self._addr, self._size, self._items = _typed(typecode, n)
+        self.buf = memoryview(uctypes.bytearray_at(self._addr, self._size))
+        if init is not None:
+            items = self._items
+            for i in range(n):
+                items[i] = init[i]
+
+    def __len__(self):
+        return self._len
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("array index out of range")
+        return self._items[i]
+
+    def __setitem__(self, i, value):
+        if i < 0:
+            i += self._len
+        if not 0 <= i < self._len:
+            raise IndexError("array index out of range")
+        self._items[i] = value
+
+    def __iter__(self):
+        items = self._items
+        for i in range(self._len):
+            yield items[i]
+
+    def __repr__(self):
+        return "Array(%r, %r)" % (self.typecode, list(self))
+
+
+class Value(_Mapped):
+    # A single number in anonymous shared memory, as value.  Like Array, it
+    # has no lock.
+
+    def __init__(self, typecode, value=0, lock=True):
+        self.typecode = typecode
+        self._addr, self._size, self._items = _typed(typecode, 1)
+        self.buf = memoryview(uctypes.bytearray_at(self._addr, self._size))
+        self._items[0] = value
+
+    @property
+    def value(self):
+        return self._items[0]
+
+    @value.setter
+    def value(self, v):
+        self._items[0] = v
+
+    def __repr__(self):
+        return "Value(%r, %r)" % (self.typecode, self._items[0])
+
+
+class Full(Exception):
+    pass
+
+
+class Empty(Exception):
+    pass
+
+
+class Queue:
+    # A single-producer, single-consumer queue of byte strings, in a ring
+    # buffer in anonymous shared memory.  One process may put() and one
+    # other process may get().  Each index is only written by one side, so
+    # the data is copied in and out without holding a lock.  The indexes
+    # are free-running 32-bit counters, so the capacity is rounded up to a
+    # power of two.  Each message is stored as a 4-byte length followed by
+    # the data.
+    #
+    # The indexes are only read and written with a process-shared
+    # semaphore held, used as a lock.  Taking and releasing it are memory
+    # barriers, so that the data written before the write index is
+    # advanced is seen by the consumer, and that the consumer is done
+    # reading before the producer sees the space as free, on CPUs that
+    # reorder memory accesses (such as ARM and RISC-V) as well as on x86.
+    #
+    # put() and get() wait by polling, with a short sleep.
+
+    def __init__(self, capacity=65536):
+        n = 8
+        while n < capacity:
+            n <<= 1
+        self._capacity = n
+        self._size = SEM_SIZE + 8 + n
+        addr = self._addr = _mmap(self._size)
+        os.check_error(sem_init_(addr, 1, 1))
+        # The write index and the read index.
+        self._index = uctypes.struct(
+            addr + SEM_SIZE, (uctypes.ARRAY | 0, 2 | uctypes.UINT32), uctypes.NATIVE
+        )
+        self._ring = memoryview(uctypes.bytearray_at(addr + SEM_SIZE + 8, n))
+        self._len = bytearray(4)
+
+    def close(self):
+        if self._ring is not None:
+            self._ring = None
+            munmap_(self._addr, self._size)
+
+    def __del__(self):
+        self.close()
+
+    def _lock(self):
+        while os.check_error(sem_wait_(self._addr)):
+            pass
+
+    def _indexes(self):
+        self._lock()
+        head, tail = self._index[0], self._index[1]
+        sem_post_(self._addr)
+        return head, tail
+
+    def _set_index(self, i, value):
+        self._lock()
+        self._index[i] = value
+        sem_post_(self._addr)
+
+    def _copy_in(self, pos, data):
+        ring = self._ring
+        pos &= self._capacity - 1
+        n = len(data)
+        first = min(n, self._capacity - pos)
+        ring[pos : pos + first] = data[:first]
+        if first < n:
+            ring[: n - first] = data[first:]
+
+    def _copy_out(self, pos, buf):
+        ring = self._ring
+        pos &= self._capacity - 1
+        n = len(buf)
+        first = min(n, self._capacity - pos)
+        buf[:first] = ring[pos : pos + first]
+        if first < n:
+            buf[first:] = ring[: n - first]
+
+    def _wait(self, ready, block, timeout, exc):
+        if ready():
+            return
+        if not block:
+            raise exc
+        if timeout is not None:
+            deadline = time.ticks_add(time.ticks_ms(), int(timeout * 1000))
+        while not ready():
+            if timeout is not None and time.ticks_diff(deadline, time.ticks_ms()) < 0:
+                raise exc
+            time.sleep_ms(1)
+
+    def qsize(self):
+        head, tail = self._indexes()
+        return (head - tail) & 0xFFFFFFFF
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def put(self, data, block=True, timeout=None):
+        need = 4 + len(data)
+        if need > self._capacity:
+            raise ValueError("message larger than the queue")
+        capacity = self._capacity
+        self._wait(lambda: capacity - self.qsize() >= need, block, timeout, Full)
+        head = self._index[0]
+        self._copy_in(head, len(data).to_bytes(4, "little"))
+        self._copy_in(head + 4, data)
+        self._set_index(0, (head + need) & 0xFFFFFFFF)
+
+    def get_into(self, buf, block=True, timeout=None):
+        # Reads the next message into buf, without allocating, and returns
+        # its length.
+        self._wait(lambda: not self.empty(), block, timeout, Empty)
+        tail = self._index[1]
+        self._copy_out(tail, self._len)
+        n = int.from_bytes(self._len, "little")
+        if n > len(buf):
+            raise ValueError("buffer too small for message of %d bytes" % n)
+        self._copy_out(tail + 4, memoryview(buf)[:n])
+        self._set_index(1, (tail + 4 + n) & 0xFFFFFFFF)
+        return n
+
+    def get(self, block=True, timeout=None):
+        self._wait(lambda: not self.empty(), block, timeout, Empty)
+        self._copy_out(self._index[1], self._len)
+        buf = bytearray(int.from_bytes(self._len, "little"))
+        self.get_into(buf)
+        return bytes(buf)
@@ -0,0 +1,83 @@
+import os
+from multiprocessing import Pool
+
+
+def sq(x):
+    return x * x
+
+
+def add(a, b):
+    return a + b
+
+
+def pid(x):
+    return os.getpid()
+
+
+def fail(x):
+    if x == 3:
+        raise ValueError("bad %d" % x)
+    return x
+
+
+def crash(x):
+    os._exit(1)
+
+
+def neg(x):
+    return -x
+
+
+pool = Pool(3)
+
+assert pool.map(sq, range(100)) == [x * x for x in range(100)]
+assert pool.map(sq, range(10), chunksize=3) == [x * x for x in range(10)]
+assert pool.map(sq, []) == []
+assert pool.map(sq, (x for x in range(5))) == [0, 1, 4, 9, 16]
+assert pool.starmap(add, [(1, 2), (3, 4)]) == [3, 7]
+assert list(pool.imap(sq, range(20), 4)) == [x * x for x in range(20)]
+assert sorted(pool.imap_unordered(sq, range(20))) == [x * x for x in range(20)]
+assert list(pool.imap_unordered(sq, [])) == []
+
+# The same worker processes are reused for every task.
+pids = set(pool.map(pid, range(50), chunksize=1))
+assert 1 <= len(pids) <= 3 and os.getpid() not in pids
+assert set(pool.map(pid, range(50), chunksize=1)) == pids
+
+try:
+    pool.map(fail, range(5))
+    assert False
+except ValueError as e:
+    assert str(e) == "bad 3"
+it = pool.imap(fail, range(5))
+assert [next(it) for _ in range(3)] == [0, 1, 2]
+try:
+    next(it)
+    assert False
+except ValueError:
+    pass
+
+r = pool.apply_async(fail, (3,))
+r.wait()
+assert r.ready() and not r.successful()
+
+# A worker that dies fails its task and is replaced.
+try:
+    pool.apply(crash, (0,))
+    assert False
+except Exception:
+    pass
+assert pool.map(sq, range(10)) == [x * x for x in range(10)]
+
+# A function first used after the workers were started.
+assert pool.map(neg, range(3)) == [0, -1, -2]
+
+got = []
+pool.map_async(sq, [1, 2], callback=got.append).get()
+assert got == [[1, 4]]
+
+pool.close()
+pool.join()
+
+with Pool(2) as pool:
+    assert pool.apply(add, (1,), {"b": 2}) == 3
@@ -0,0 +1,105 @@
+import os
+from multiprocessing import Array, Value, Queue, SharedMemory, Empty, Full
+
+
+def child(f):
+    pid = os.fork()
+    if pid == 0:
+        try:
+            f()
+        finally:
+            os._exit(0)
+    os.waitpid(pid, 0)
+
+
+# Array and Value are shared with forked children.
+a = Array("i", [1, 2, 3, 4])
+assert len(a) == 4 and list(a) == [1, 2, 3, 4]
+assert a[-1] == 4
+v = Value("d", 1.5)
+
+
+def work():
+    for i in range(len(a)):
+        a[i] *= 10
+    v.value = 2.5
+
+
+child(work)
+assert list(a) == [10, 20, 30, 40]
+assert v.value == 2.5
+assert len(a.buf) == 16
+try:
+    a[4] = 0
+    assert False
+except IndexError:
+    pass
+
+b = Array("B", 3)
+b.buf[:] = b"xyz"
+assert list(b) == [120, 121, 122]
+
+# Named segments can be attached to by name.
+shm = SharedMemory(create=True, size=64)
+try:
+    shm.buf[:5] = b"hello"
+    other = SharedMemory(shm.name)
+    assert other.size >= 64
+    assert bytes(other.buf[:5]) == b"hello"
+    other.close()
+finally:
+    shm.close()
+    shm.unlink()
+
+# Queue: messages wrap around the ring and keep their boundaries.
+q = Queue(32)
+assert q.empty()
+try:
+    q.get(block=False)
+    assert False
+except Empty:
+    pass
+for i in range(20):
+    q.put(b"x" * i)
+    assert q.get() == b"x" * i
+q.put(b"0123456789")
+q.put(b"abcdefghijklmn")
+try:
+    q.put(b"more", block=False)
+    assert False
+except Full:
+    pass
+buf = bytearray(16)
+assert q.get_into(buf) == 10 and buf[:10] == b"0123456789"
+assert q.get() == b"abcdefghijklmn"
+try:
+    q.get(timeout=0.01)
+    assert False
+except Empty:
+    pass
+
+# A producer in another process.
+q = Queue(64)
+N = 200
+
+
+def produce():
+    for i in range(N):
+        q.put(b"%d" % i)
+
+
+pid = os.fork()
+if pid == 0:
+    try:
+        produce()
+    finally:
+        os._exit(0)
+for i in range(N):
+    assert q.get() == b"%d" % i
+os.waitpid(pid, 0)
+assert q.empty()
+
+# Closing unmaps the memory; closing again does nothing.
+for obj in (a, v, b, q):
+    obj.close()
+    obj.close()
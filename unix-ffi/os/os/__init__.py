@@ -20,6 +20,12 @@ O_NOCTTY = 0o0000400
 O_TRUNC = 0o0001000
 O_APPEND = 0o0002000
 O_NONBLOCK = 0o0004000
+O_DIRECTORY = 0o0200000
+O_CLOEXEC = 0o2000000
+
+AT_FDCWD = -100
+AT_SYMLINK_NOFOLLOW = 0x100
+STATX_BASIC_STATS = 0x7FF
 
 error = OSError
 name = "posix"
@@ -55,6 +61,18 @@ if libc:
     execvp_ = libc.func("i", "execvp", "PP")
     kill_ = libc.func("i", "kill", "ii")
     getenv_ = libc.func("s", "getenv", "P")
+    # These need glibc 2.30 and 2.28 respectively.
+    try:
+        # ssize_t getdents64(int fd, void *dirp, size_t count);
+        getdents64_ = libc.func("i", "getdents64", "ipi")
+    except OSError:
+        getdents64_ = None
+    try:
+        # int statx(int dirfd, const char *pathname, int flags, unsigned int mask,
+        #           struct statx *statxbuf);
+        statx_ = libc.func("i", "statx", "isiip")
+    except OSError:
+        statx_ = None
 
 
 def check_error(ret):
@@ -73,6 +91,33 @@ def raise_error():
 
 stat = uos.stat
 
+# The start of struct statx, up to stx_size.  Its layout is the same on
+# every architecture.
+_STATX = "IIQIIIHxxQQ"
+
+
+def lstat(path):
+    # Like stat(), but for a symbolic link describes the link itself.  As
+    # with stat(), the result is a tuple.  Without statx(), symbolic links
+    # are followed.
+    if not statx_:
+        return stat(path)
+    buf = bytearray(256)
+    check_error(statx_(AT_FDCWD, path, AT_SYMLINK_NOFOLLOW, STATX_BASIC_STATS, buf))
+    _, _, _, nlink, uid, gid, mode, ino, size = struct.unpack_from(_STATX, buf)
+    atime = struct.unpack_from("q", buf, 64)[0]
+    ctime = struct.unpack_from("q", buf, 96)[0]
+    mtime = struct.unpack_from("q", buf, 112)[0]
+    major, minor = struct.unpack_from("II", buf, 136)
+    # As glibc's makedev().
+    dev = (
+        (major & 0xFFFFF000) << 32
+        | (major & 0xFFF) << 8
+        | (minor & 0xFFFFFF00) << 12
+        | (minor & 0xFF)
+    )
+    return (mode, ino, dev, nlink, uid, gid, size, atime, mtime, ctime)
+
 
 def getcwd():
     buf = bytearray(512)
@@ -120,11 +165,48 @@ def makedirs(name, mode=0o777, exist_ok=False):
                 raise e
 
 
+# struct linux_dirent64, up to d_name: d_ino, d_off, d_reclen, d_type.
+_DIRENT64 = "QqHB"
+_DIRENT64_SIZE = struct.calcsize(_DIRENT64)
+
+
+def getdents64(fd, buf):
+    # Reads as many entries of the directory open as fd as fit in buf, with
+    # a single system call.  Returns a list of (name, type, inode) as from
+    # ilistdir(), with name as bytes and including "." and "..".  The list
+    # is empty at the end of the directory.
+    while True:
+        n = getdents64_(fd, buf, len(buf))
+        if not check_error(n):
+            break
+    res = []
+    mv = memoryview(buf)
+    off = 0
+    while off < n:
+        ino, _, reclen, type = struct.unpack_from(_DIRENT64, buf, off)
+        name = bytes(mv[off + _DIRENT64_SIZE : off + reclen])
+        res.append((name[: name.find(b"\0")], type << 12, ino))
+        off += reclen
+    return res
+
+
 if hasattr(uos, "ilistdir"):
     ilistdir = uos.ilistdir
 else:
 
     def ilistdir(path="."):
+        if getdents64_:
+            fd = open(path, O_RDONLY | O_DIRECTORY | O_CLOEXEC)
+            try:
+                buf = bytearray(32768)
+                while True:
+                    batch = getdents64(fd, buf)
+                    if not batch:
+                        break
+                    yield from batch
+            finally:
+                close(fd)
+            return
         dir = opendir_(path)
         if not dir:
             raise_error()
@@ -138,7 +220,7 @@ else:
 
             dirent = uctypes.bytes_at(dirent, struct.calcsize(dirent_fmt))
             dirent = struct.unpack(dirent_fmt, dirent)
-            dirent = (dirent[-1].split(b"\0", 1)[0], dirent[-2], dirent[0])
+            dirent = (dirent[-1].split(b"\0", 1)[0], dirent[-2] << 12, dirent[0])
             yield dirent
 
 
@@ -147,34 +229,153 @@ def listdir(path="."):
     res = []
     for dirent in ilistdir(path):
         fname = dirent[0]
+        if not is_bytes:
+            fname = fsdecode(fname)
         if is_bytes:
-            good = fname != b"." and fname == b".."
+            good = fname != b"." and fname != b".."
         else:
             good = fname != "." and fname != ".."
         if good:
-            if not is_bytes:
-                fname = fsdecode(fname)
             res.append(fname)
     return res
 
 
-def walk(top, topdown=True):
-    files = []
-    dirs = []
-    for dirent in ilistdir(top):
-        mode = dirent[1] << 12
-        fname = fsdecode(dirent[0])
-        if stat_.S_ISDIR(mode):
-            if fname != "." and fname != "..":
-                dirs.append(fname)
+class DirEntry:
+    # An entry from scandir().  The type from the directory listing is used
+    # where it is enough, and the results of stat() and lstat() are each
+    # fetched once, when first needed.
+
+    def __init__(self, dir, name, type, ino):
+        self.name = name
+        self.path = dir + name
+        self._type = type
+        self._ino = ino
+        self._stat = None
+        self._lstat = None
+
+    def __repr__(self):
+        return "<DirEntry %r>" % self.name
+
+    def __fspath__(self):
+        return self.path
+
+    def inode(self):
+        return self._ino
+
+    def is_symlink(self):
+        if self._type:
+            return self._type == stat_.S_IFLNK
+        try:
+            return stat_.S_ISLNK(self.stat(follow_symlinks=False)[0])
+        except OSError:
+            return False
+
+    def _mode(self, follow_symlinks):
+        if self._type and not (follow_symlinks and self._type == stat_.S_IFLNK):
+            return self._type
+        try:
+            return self.stat(follow_symlinks)[0]
+        except OSError:
+            # Such as a broken symbolic link.
+            return 0
+
+    def is_dir(self, follow_symlinks=True):
+        return stat_.S_ISDIR(self._mode(follow_symlinks))
+
+    def is_file(self, follow_symlinks=True):
+        return stat_.S_ISREG(self._mode(follow_symlinks))
+
+    def stat(self, follow_symlinks=True):
+        if follow_symlinks and self.is_symlink():
+            if self._stat is None:
+                self._stat = stat(self.path)
+            return self._stat
+        if self._lstat is None:
+            self._lstat = lstat(self.path)
+        return self._lstat
+
+
+class _ScandirIterator:
+    def __init__(self, path):
+        self._it = ilistdir(path)
+        self._bytes = isinstance(path, bytes)
+        if self._bytes:
+            sep = b"/"
+            if path == b".":
+                path = b""
+        else:
+            sep = "/"
+            if path == ".":
+                path = ""
+        if path and not path.endswith(sep):
+            path += sep
+        self._dir = path
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        while True:
+            dirent = next(self._it)
+            name = dirent[0]
+            if name in (".", "..", b".", b".."):
+                continue
+            if not self._bytes:
+                name = fsdecode(name)
+            return DirEntry(self._dir, name, dirent[1], dirent[2])
+
+    def close(self):
+        if hasattr(self._it, "close"):
+            self._it.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+def scandir(path="."):
+    return _ScandirIterator(path)
+
+
+def walk(top, topdown=True, onerror=None, followlinks=False):
+    # Uses an explicit stack of the directories still to be listed, rather
+    # than a generator per level.  For a bottom-up walk, the stack also
+    # holds the results for each directory, to be yielded once those for
+    # its subdirectories have been.
+    stack = [top]
+    while stack:
+        top = stack.pop()
+        if isinstance(top, tuple):
+            yield top
+            continue
+        dirs = []
+        files = []
+        links = []
+        try:
+            with scandir(top) as it:
+                for entry in it:
+                    if entry.is_dir():
+                        dirs.append(entry.name)
+                        if entry.is_symlink():
+                            links.append(entry.name)
+                    else:
+                        files.append(entry.name)
+        except OSError as e:
+            if onerror is not None:
+                onerror(e)
+            continue
+        if topdown:
+            # The caller may change dirs to choose where to go next.
+            yield top, dirs, files
         else:
-            files.append(fname)
-    if topdown:
-        yield top, dirs, files
-    for d in dirs:
-        yield from walk(top + "/" + d, topdown)
-    if not topdown:
-        yield top, dirs, files
+            stack.append((top, dirs, files))
+        sep = b"/" if isinstance(top, bytes) else "/"
+        prefix = top if top.endswith(sep) else top + sep
+        for d in reversed(dirs):
+            if followlinks or d not in links:
+                stack.append(prefix + d)
 
 
 def open(n, flags, mode=0o777):
@@ -0,0 +1,65 @@
+import os
+
+top = "/tmp/test_scandir_%d" % os.getpid()
+os.mkdir(top)
+os.mkdir(top + "/a")
+os.mkdir(top + "/a/b")
+os.mkdir(top + "/c")
+for name, data in (("/f", b"hello"), ("/a/g", b""), ("/a/b/h", b"xy")):
+    fd = os.open(top + name, os.O_WRONLY | os.O_CREAT)
+    os.write(fd, data)
+    os.close(fd)
+os.system("ln -s a %s/link && ln -s missing %s/broken" % (top, top))
+
+entries = {}
+with os.scandir(top) as it:
+    for e in it:
+        entries[e.name] = e
+assert sorted(entries) == ["a", "broken", "c", "f", "link"]
+assert entries["f"].path == top + "/f"
+assert entries["f"].is_file() and not entries["f"].is_dir()
+assert entries["f"].stat()[6] == 5
+assert entries["a"].is_dir() and not entries["a"].is_symlink()
+assert entries["link"].is_symlink() and entries["link"].is_dir()
+assert not entries["link"].is_dir(follow_symlinks=False)
+assert entries["link"].stat()[1] == entries["a"].inode()
+assert entries["broken"].is_symlink()
+assert not entries["broken"].is_file() and not entries["broken"].is_dir()
+
+# lstat() describes the link itself.
+assert os.lstat(top + "/link")[6] == 1
+assert os.lstat(top + "/f") == os.stat(top + "/f")
+assert [e.name for e in os.scandir(top.encode() + b"/a/")] in ([b"b", b"g"], [b"g", b"b"])
+
+walk = [(t, sorted(d), sorted(f)) for t, d, f in os.walk(top)]
+assert sorted(walk) == [
+    (top, ["a", "c", "link"], ["broken", "f"]),
+    (top + "/a", ["b"], ["g"]),
+    (top + "/a/b", [], ["h"]),
+    (top + "/c", [], []),
+]
+names = [t for t, d, f in walk]
+assert names[0] == top and names.index(top + "/a") < names.index(top + "/a/b")
+
+# Symbolic links to directories are followed on request.
+names = [t for t, d, f in os.walk(top, followlinks=True)]
+assert top + "/link/b" in names and len(names) == 6
+
+# Bottom up, each directory comes after those in it.
+names = [t for t, d, f in os.walk(top, False)]
+assert sorted(names) == [top, top + "/a", top + "/a/b", top + "/c"]
+assert names[-1] == top and names.index(top + "/a/b") < names.index(top + "/a")
+
+# Top down, removing from dirs prunes the walk.
+names = []
+for t, d, f in os.walk(top):
+    names.append(t)
+    if "a" in d:
+        d.remove("a")
+assert sorted(names) == [top, top + "/c"]
+
+errors = []
+assert list(os.walk(top + "/none", onerror=errors.append)) == []
+assert len(errors) == 1
+
+os.system("rm -r " + top)
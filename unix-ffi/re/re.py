@@ -28,6 +28,13 @@ pcre2_match_data_create_from_pattern = pcre2.func(
     "p", "pcre2_match_data_create_from_pattern_8", "Pp"
 )
 
+#       int pcre2_jit_compile(pcre2_code *code, uint32_t options);
+try:
+    pcre2_jit_compile = pcre2.func("i", "pcre2_jit_compile_8", "pi")
+except OSError:
+    # PCRE2 built without JIT support.
+    pcre2_jit_compile = None
+
 # PCRE2_SIZE that is of type size_t.
 # Use ULONG as type to support both 32bit and 64bit.
 PCRE2_SIZE_SIZE = uctypes.sizeof({"field": 0 | uctypes.ULONG})
@@ -48,29 +55,83 @@ MULTILINE = M = 0x400
 DOTALL = S = 0x20
 VERBOSE = X = 0x80
 PCRE2_ANCHORED = 0x80000000
+PCRE2_ENDANCHORED = 0x20000000
+PCRE2_NOTEMPTY_ATSTART = 0x8
+PCRE2_JIT_COMPLETE = 0x1
+
+PCRE2_ERROR_NOMATCH = -1
 
 # TODO. Note that Python3 has unicode by default
 ASCII = A = 0
 UNICODE = U = 0
 
 PCRE2_INFO_CAPTURECOUNT = 0x4
+PCRE2_INFO_NAMECOUNT = 0x11
+PCRE2_INFO_NAMEENTRYSIZE = 0x12
+PCRE2_INFO_NAMETABLE = 0x13
+
+# Patterns are JIT-compiled when PCRE2 supports it.  This takes longer than
+# plain compilation, but makes matching several times faster.
+JIT = True
+
+# Escapes understood in replacement strings, other than group references.
+_ESCAPES = {
+    "\\": "\\",
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "f": "\f",
+    "v": "\v",
+    "a": "\a",
+    "b": "\b",
+    "0": "\0",
+}
+
+
+class error(Exception):
+    pass
+
+
+def _pattern_info(code, what):
+    buf = array.array("i", [0])
+    pcre2_pattern_info(code, what, buf)
+    return buf[0]
 
 
 class PCREMatch:
-    def __init__(self, s, num_matches, offsets):
+    def __init__(self, s, num_matches, offsets, re=None):
         self.s = s
         self.num = num_matches
         self.offsets = offsets
+        self.re = re
+
+    def _group(self, n, default=None):
+        if isinstance(n, str):
+            n = self.re.groupindex[n]
+        if not 0 <= n < self.num:
+            raise IndexError("no such group")
+        start = self.offsets[n * 2]
+        if start == PCRE2_UNSET:
+            return default
+        return self.s[start : self.offsets[n * 2 + 1]]
 
     def group(self, *n):
         if not n:
-            return self.s[self.offsets[0] : self.offsets[1]]
+            return self._group(0)
         if len(n) == 1:
-            return None if self.offsets[n[0] * 2] == PCRE2_UNSET else self.s[self.offsets[n[0] * 2] : self.offsets[n[0] * 2 + 1]]
-        return tuple(None if self.offsets[i * 2] == PCRE2_UNSET else self.s[self.offsets[i * 2] : self.offsets[i * 2 + 1]] for i in n)
+            return self._group(n[0])
+        return tuple(self._group(i) for i in n)
 
     def groups(self, default=None):
-        return tuple(default if self.offsets[(i + 1) * 2] == PCRE2_UNSET else self.group(i + 1) for i in range(self.num - 1))
+        return tuple(self._group(i, default) for i in range(1, self.num))
+
+    def groupdict(self, default=None):
+        return {name: self._group(i, default) for name, i in self.re.groupindex.items()}
+
+    def expand(self, template):
+        res = []
+        _expand(self.s, self.offsets, self.re._template(template), res)
+        return "".join(res)
 
     def start(self, n=0):
         return self.offsets[n * 2]
@@ -82,121 +143,280 @@ class PCREMatch:
         return self.offsets[n * 2], self.offsets[n * 2 + 1]
 
 
+def _expand(s, offsets, template, res):
+    # Appends the replacement for one match to the list res.
+    if isinstance(template, str):
+        res.append(template)
+        return
+    for item in template:
+        if isinstance(item, int):
+            start = offsets[item * 2]
+            if start != PCRE2_UNSET:
+                res.append(s[start : offsets[item * 2 + 1]])
+        else:
+            res.append(item)
+
+
 class PCREPattern:
     def __init__(self, compiled_ptn):
         self.obj = compiled_ptn
+        self.groups = _pattern_info(compiled_ptn, PCRE2_INFO_CAPTURECOUNT)
+        self._groupindex = None
+        # One match data block is reused for every match with this pattern,
+        # and the offsets are copied out of it for each result.  The ovector
+        # is read as PCRE2_SIZE values, one pair for the whole match and for
+        # each capturing group, whether or not it took part.
+        self._match_data = pcre2_match_data_create_from_pattern(compiled_ptn, None)
+        self._ovector = uctypes.bytearray_at(
+            pcre2_get_ovector_pointer(self._match_data),
+            PCRE2_SIZE_SIZE * (self.groups + 1) * 2,
+        )
+
+    @property
+    def groupindex(self):
+        if self._groupindex is None:
+            index = {}
+            count = _pattern_info(self.obj, PCRE2_INFO_NAMECOUNT)
+            if count:
+                size = _pattern_info(self.obj, PCRE2_INFO_NAMEENTRYSIZE)
+                ptr = array.array(PCRE2_SIZE_TYPE, [0])
+                pcre2_pattern_info(self.obj, PCRE2_INFO_NAMETABLE, ptr)
+                # Each entry is a 16-bit big-endian group number followed by
+                # the NUL-terminated name.
+                table = uctypes.bytearray_at(ptr[0], count * size)
+                for i in range(0, count * size, size):
+                    j = i + 2
+                    while table[j]:
+                        j += 1
+                    index[bytes(table[i + 2 : j]).decode()] = table[i] << 8 | table[i + 1]
+            self._groupindex = index
+        return self._groupindex
+
+    def _match(self, s, pos, endpos, flags):
+        # Returns the offsets of the match, or None.
+        length = len(s)
+        if 0 <= endpos < length:
+            length = endpos
+        if pos > length:
+            return None
+        num = pcre2_match(self.obj, s, length, pos, flags, self._match_data, None)
+        if num == PCRE2_ERROR_NOMATCH:
+            return None
+        if num < 0:
+            raise error("match failed with PCRE2 error %d" % num)
+        return array.array(PCRE2_SIZE_TYPE, self._ovector)
+
+    def _scan(self, s, pos=0, endpos=-1):
+        # Yields the offsets of successive non-overlapping matches, walking
+        # through s rather than slicing it.  As in CPython, a match can't be
+        # empty if it starts where the previous empty match was.
+        flags = 0
+        while True:
+            ov = self._match(s, pos, endpos, flags)
+            if ov is None:
+                return
+            yield ov
+            pos = ov[1]
+            flags = PCRE2_NOTEMPTY_ATSTART if ov[0] == pos else 0
 
     def search(self, s, pos=0, endpos=-1, _flags=0):
-        assert endpos == -1, "pos: %d, endpos: %d" % (pos, endpos)
-        buf = array.array("i", [0])
-        pcre2_pattern_info(self.obj, PCRE2_INFO_CAPTURECOUNT, buf)
-        cap_count = buf[0]
-        match_data = pcre2_match_data_create_from_pattern(self.obj, None)
-        num = pcre2_match(self.obj, s, len(s), pos, _flags, match_data, None)
-        if num == -1:
-            # No match
+        ov = self._match(s, pos, endpos, _flags)
+        if ov is None:
             return None
-        ov_ptr = pcre2_get_ovector_pointer(match_data)
-        # pcre2_get_ovector_pointer return PCRE2_SIZE
-        ov_buf = uctypes.bytearray_at(ov_ptr, PCRE2_SIZE_SIZE * (cap_count + 1) * 2)
-        ov = array.array(PCRE2_SIZE_TYPE, ov_buf)
-        # We don't care how many matching subexpressions we got, we
-        # care only about total # of capturing ones (including empty)
-        return PCREMatch(s, cap_count + 1, ov)
+        return PCREMatch(s, self.groups + 1, ov, self)
 
     def match(self, s, pos=0, endpos=-1):
         return self.search(s, pos, endpos, PCRE2_ANCHORED)
 
-    def sub(self, repl, s, count=0):
-        if not callable(repl):
-            assert "\\" not in repl, "Backrefs not implemented"
-        res = ""
-        while s:
-            m = self.search(s)
-            if not m:
-                return res + s
-            beg, end = m.span()
-            res += s[:beg]
-            if callable(repl):
-                res += repl(m)
+    def fullmatch(self, s, pos=0, endpos=-1):
+        return self.search(s, pos, endpos, PCRE2_ANCHORED | PCRE2_ENDANCHORED)
+
+    def finditer(self, s, pos=0, endpos=-1):
+        num = self.groups + 1
+        for ov in self._scan(s, pos, endpos):
+            yield PCREMatch(s, num, ov, self)
+
+    def _template(self, repl):
+        # Splits a replacement string into a list of literal strings and
+        # group numbers.  Strings without escapes are returned as they are.
+        if "\\" not in repl:
+            return repl
+        items = []
+        lit = []
+        i = 0
+        n = len(repl)
+        while i < n:
+            c = repl[i]
+            i += 1
+            if c != "\\":
+                lit.append(c)
+                continue
+            if i == n:
+                raise error("bad escape (end of pattern)")
+            c = repl[i]
+            i += 1
+            if c == "g":
+                j = repl.find(">", i)
+                if i == n or repl[i] != "<" or j < 0:
+                    raise error("missing group name")
+                name = repl[i + 1 : j]
+                i = j + 1
+                try:
+                    group = int(name)
+                except ValueError:
+                    group = self.groupindex[name]
+            elif "1" <= c <= "9":
+                group = int(c)
+                if i < n and "0" <= repl[i] <= "9":
+                    group = group * 10 + int(repl[i])
+                    i += 1
+            elif c in _ESCAPES:
+                lit.append(_ESCAPES[c])
+                continue
+            elif "a" <= c <= "z" or "A" <= c <= "Z":
+                raise error("bad escape \\%s" % c)
             else:
-                res += repl
-            s = s[end:]
-            if count != 0:
-                count -= 1
-                if count == 0:
-                    return res + s
-        return res
+                lit.append("\\" + c)
+                continue
+            if not 0 <= group <= self.groups:
+                raise error("invalid group reference %d" % group)
+            if lit:
+                items.append("".join(lit))
+                lit = []
+            items.append(group)
+        if lit:
+            items.append("".join(lit))
+        return items
+
+    def subn(self, repl, s, count=0):
+        template = None if callable(repl) else self._template(repl)
+        res = []
+        last = 0
+        n = 0
+        for ov in self._scan(s):
+            res.append(s[last : ov[0]])
+            if template is None:
+                res.append(repl(PCREMatch(s, self.groups + 1, ov, self)))
+            else:
+                _expand(s, ov, template, res)
+            last = ov[1]
+            n += 1
+            if n == count:
+                break
+        if not n:
+            return s, 0
+        res.append(s[last:])
+        return "".join(res), n
+
+    def sub(self, repl, s, count=0):
+        return self.subn(repl, s, count)[0]
 
     def split(self, s, maxsplit=0):
         res = []
+        pos = 0
         while True:
-            m = self.search(s)
-            g = None
-            if m:
-                g = m.group(0)
-            if not m or not g:
-                res.append(s)
+            ov = self._match(s, pos, -1, 0)
+            if ov is None or ov[0] == ov[1]:
+                res.append(s[pos:])
                 return res
-            beg, end = m.span(0)
-            res.append(s[:beg])
-            if m.num > 1:
-                res.extend(m.groups())
-            s = s[end:]
+            res.append(s[pos : ov[0]])
+            for i in range(1, self.groups + 1):
+                start = ov[i * 2]
+                res.append(None if start == PCRE2_UNSET else s[start : ov[i * 2 + 1]])
+            pos = ov[1]
             if maxsplit > 0:
                 maxsplit -= 1
                 if maxsplit == 0:
-                    res.append(s)
+                    res.append(s[pos:])
                     return res
 
-    def findall(self, s):
+    def findall(self, s, pos=0, endpos=-1):
         res = []
-        start = 0
-        while True:
-            m = self.search(s, start)
-            if not m:
-                return res
-            if m.num == 1:
-                res.append(m.group(0))
-            elif m.num == 2:
-                res.append(m.group(1))
+        for ov in self._scan(s, pos, endpos):
+            if self.groups == 0:
+                res.append(s[ov[0] : ov[1]])
+            elif self.groups == 1:
+                start = ov[2]
+                res.append("" if start == PCRE2_UNSET else s[start : ov[3]])
             else:
-                res.append(m.groups())
-            beg, end = m.span(0)
-            start = end
+                res.append(PCREMatch(s, self.groups + 1, ov).groups(""))
+        return res
 
 
 def compile(pattern, flags=0):
-    errcode = bytes(4)
-    erroffset = bytes(4)
+    if isinstance(pattern, PCREPattern):
+        return pattern
+    errcode = array.array("i", [0])
+    erroffset = array.array(PCRE2_SIZE_TYPE, [0])
     regex = pcre2_compile(pattern, PCRE2_ZERO_TERMINATED, flags, errcode, erroffset, None)
-    assert regex
+    if not regex:
+        raise error("error %d at position %d" % (errcode[0], erroffset[0]))
+    if JIT and pcre2_jit_compile:
+        # If this fails the pattern is still usable, just not JIT-compiled.
+        pcre2_jit_compile(regex, PCRE2_JIT_COMPLETE)
     return PCREPattern(regex)
 
 
+# The patterns most recently used by the module-level functions, so that
+# they aren't compiled again on every call.  _cache_order has the least
+# recently used first.
+_MAXCACHE = 32
+_cache = {}
+_cache_order = []
+
+
+def _compile(pattern, flags):
+    if isinstance(pattern, PCREPattern):
+        return pattern
+    key = (pattern, flags)
+    r = _cache.get(key)
+    if r is None:
+        r = compile(pattern, flags)
+        if len(_cache_order) >= _MAXCACHE:
+            del _cache[_cache_order.pop(0)]
+        _cache[key] = r
+        _cache_order.append(key)
+    elif _cache_order[-1] != key:
+        _cache_order.remove(key)
+        _cache_order.append(key)
+    return r
+
+
+def purge():
+    _cache.clear()
+    del _cache_order[:]
+
+
 def search(pattern, string, flags=0):
-    r = compile(pattern, flags)
-    return r.search(string)
+    return _compile(pattern, flags).search(string)
 
 
 def match(pattern, string, flags=0):
-    r = compile(pattern, flags | PCRE2_ANCHORED)
-    return r.search(string)
+    return _compile(pattern, flags).match(string)
+
+
+def fullmatch(pattern, string, flags=0):
+    return _compile(pattern, flags).fullmatch(string)
 
 
 def sub(pattern, repl, s, count=0, flags=0):
-    r = compile(pattern, flags)
-    return r.sub(repl, s, count)
+    return _compile(pattern, flags).sub(repl, s, count)
+
+
+def subn(pattern, repl, s, count=0, flags=0):
+    return _compile(pattern, flags).subn(repl, s, count)
 
 
 def split(pattern, s, maxsplit=0, flags=0):
-    r = compile(pattern, flags)
-    return r.split(s, maxsplit)
+    return _compile(pattern, flags).split(s, maxsplit)
 
 
 def findall(pattern, s, flags=0):
-    r = compile(pattern, flags)
-    return r.findall(s)
+    return _compile(pattern, flags).findall(s)
+
+
+def finditer(pattern, s, flags=0):
+    return _compile(pattern, flags).finditer(s)
 
 
 def escape(s):
@@ -66,3 +66,60 @@ assert m.group() == ""
 assert m.group(0, 1) == ("", None)
 assert m.groups() == (None,)
 assert m.groups("default") == ("default",)
+
+assert re.fullmatch(r"a+", "aaa").group() == "aaa"
+assert re.fullmatch(r"a+", "aaab") is None
+assert re.fullmatch(r"a|ab", "ab").group() == "ab"
+assert re.compile(r"\d+").fullmatch("x123y", 1, 4).group() == "123"
+
+assert [m.span() for m in re.finditer(r"\d+", "a1b22c333")] == [(1, 2), (3, 5), (6, 9)]
+assert [m.group(1) for m in re.finditer(r"(\w)=", "a=1, b=2")] == ["a", "b"]
+assert list(re.finditer("x", "abc")) == []
+
+# Empty matches, as in CPython 3.7+.
+assert re.sub("x*", "-", "abxd") == "-a-b--d-"
+assert re.sub("x*", "-", "") == "-"
+assert re.findall(r"\b", "ab cd") == ["", "", "", ""]
+assert re.findall("a*", "baaa") == ["", "aaa", ""]
+
+assert re.subn("a", "z", "caaab") == ("czzzb", 3)
+assert re.subn("a", "z", "caaab", 2) == ("czzab", 2)
+assert re.subn("q", "z", "caaab") == ("caaab", 0)
+
+assert re.sub(r"(\w+)@(\w+)", r"\2 at \1", "joe@example") == "example at joe"
+assert re.sub(r"(\w+)@(\w+)", r"\g<2>\g<1>0", "joe@example") == "examplejoe0"
+assert re.sub(r"(?P<user>\w+)@(?P<host>\w+)", r"\g<host>:\g<user>", "joe@x") == "x:joe"
+assert re.sub(r"(a)|b", r"[\1]", "ab") == "[a][]"
+assert re.sub("a", r"\n\t\\", "a") == "\n\t\\"
+assert re.sub("a", r"\&", "a") == "\\&"
+for bad in (r"\2", "\\", r"\q", r"\g<x"):
+    try:
+        re.sub("(a)", bad, "a")
+        assert False, bad
+    except (re.error, IndexError):
+        pass
+
+p = re.compile(r"(?P<key>\w+)=(?P<value>\d+)?")
+m = p.match("a=1")
+assert p.groupindex == {"key": 1, "value": 2}
+assert m.group("key") == "a" and m.group("value", 1) == ("1", "a")
+assert p.match("b=").groupdict() == {"key": "b", "value": None}
+assert m.expand(r"\g<value>:\1") == "1:a"
+assert p.groups == 2
+
+assert re.compile("a").search("aba", 1).span() == (2, 3)
+assert re.compile("a").search("aba", 1, 2) is None
+assert re.compile("a").search("aba", 4) is None
+assert re.compile(r"^b", re.MULTILINE).findall("b\nab\nb") == ["b", "b"]
+
+# Matching continues at an offset into the string, so anchors and lookbehind
+# see the text before it.
+assert re.split("^a", "aaa") == ["", "aa"]
+assert re.sub(r"^a", "x", "aaa") == "xaa"
+
+p = re.compile("z+")
+assert re.compile(p) is p and re.search(p, "zz").group() == "zz"
+for i in range(100):
+    assert re.search("x%d" % i, "x%d" % i)
+assert re.search("x0", "x0")
+re.purge()
@@ -51,6 +51,8 @@ class Epoll:
     def __init__(self, epfd):
         self.epfd = epfd
         self.evbuf = struct.pack(epoll_event, 0, None)
+        # Reused by poll_ms(), and grown as needed for maxevents.
+        self.events = bytearray(self.evbuf)
         self.registry = {}
 
     def register(self, fd, eventmask=EPOLLIN | EPOLLPRI | EPOLLOUT, retval=None):
@@ -67,18 +69,29 @@ class Epoll:
         # reference later.
         self.registry[fd] = retval
 
+    def modify(self, fd, eventmask, retval=None):
+        if retval is None:
+            retval = fd
+        s = struct.pack(epoll_event, eventmask, retval)
+        os.check_error(epoll_ctl(self.epfd, EPOLL_CTL_MOD, fd, s))
+        self.registry[fd] = retval
+
     def unregister(self, fd):
         # Pass dummy event structure, to workaround kernel bug
         r = epoll_ctl(self.epfd, EPOLL_CTL_DEL, fd, self.evbuf)
         os.check_error(r)
         del self.registry[fd]
 
-    def poll_ms(self, timeout=-1):
-        s = bytearray(self.evbuf)
+    def poll_ms(self, timeout=-1, maxevents=1):
+        "maxevents is extension to stdlib, for the maximum number of results."
+        size = len(self.evbuf)
+        s = self.events
+        if len(s) < size * maxevents:
+            s = self.events = bytearray(size * maxevents)
         if timeout >= 0:
             deadline = utime.ticks_add(utime.ticks_ms(), timeout)
         while True:
-            n = epoll_wait(self.epfd, s, 1, timeout)
+            n = epoll_wait(self.epfd, s, maxevents, timeout)
             if not os.check_error(n):
                 break
             if timeout >= 0:
@@ -87,13 +100,13 @@ class Epoll:
                     n = 0
                     break
         res = []
-        if n > 0:
-            vals = struct.unpack(epoll_event, s)
+        for i in range(n):
+            vals = struct.unpack_from(epoll_event, s, i * size)
             res.append((vals[1], vals[0]))
         return res
 
-    def poll(self, timeout=-1):
-        return self.poll_ms(-1 if timeout == -1 else math.ceil(timeout * 1000))
+    def poll(self, timeout=-1, maxevents=1):
+        return self.poll_ms(-1 if timeout == -1 else math.ceil(timeout * 1000), maxevents)
 
     def close(self):
         os.close(self.epfd)
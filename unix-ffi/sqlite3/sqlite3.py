@@ -32,16 +32,42 @@ sqlite3_step = sq3.func("i", "sqlite3_step", "p")
 sqlite3_column_count = sq3.func("i", "sqlite3_column_count", "p")
 # int sqlite3_column_type(sqlite3_stmt*, int iCol);
 sqlite3_column_type = sq3.func("i", "sqlite3_column_type", "pi")
-# int sqlite3_column_int(sqlite3_stmt*, int iCol);
-sqlite3_column_int = sq3.func("i", "sqlite3_column_int", "pi")
+# int sqlite3_reset(sqlite3_stmt *pStmt);
+sqlite3_reset = sq3.func("i", "sqlite3_reset", "p")
+# int sqlite3_clear_bindings(sqlite3_stmt*);
+sqlite3_clear_bindings = sq3.func("i", "sqlite3_clear_bindings", "p")
+# int sqlite3_bind_parameter_count(sqlite3_stmt*);
+sqlite3_bind_parameter_count = sq3.func("i", "sqlite3_bind_parameter_count", "p")
+# const char *sqlite3_bind_parameter_name(sqlite3_stmt*, int);
+sqlite3_bind_parameter_name = sq3.func("s", "sqlite3_bind_parameter_name", "pi")
+# int sqlite3_bind_null(sqlite3_stmt*, int);
+sqlite3_bind_null = sq3.func("i", "sqlite3_bind_null", "pi")
+# int sqlite3_bind_int64(sqlite3_stmt*, int, sqlite3_int64);
+sqlite3_bind_int64 = sq3.func("i", "sqlite3_bind_int64", "piq")
+# int sqlite3_bind_double(sqlite3_stmt*, int, double);
+sqlite3_bind_double = sq3.func("i", "sqlite3_bind_double", "pid")
+# int sqlite3_bind_text(sqlite3_stmt*, int, const char*, int, void(*)(void*));
+sqlite3_bind_text = sq3.func("i", "sqlite3_bind_text", "pisip")
+# int sqlite3_bind_blob(sqlite3_stmt*, int, const void*, int n, void(*)(void*));
+sqlite3_bind_blob = sq3.func("i", "sqlite3_bind_blob", "pipip")
+# int sqlite3_bind_zeroblob(sqlite3_stmt*, int, int n);
+sqlite3_bind_zeroblob = sq3.func("i", "sqlite3_bind_zeroblob", "pii")
+# sqlite3_int64 sqlite3_column_int64(sqlite3_stmt*, int iCol);
+sqlite3_column_int64 = sq3.func("q", "sqlite3_column_int64", "pi")
 # double sqlite3_column_double(sqlite3_stmt*, int iCol);
 sqlite3_column_double = sq3.func("d", "sqlite3_column_double", "pi")
 # const unsigned char *sqlite3_column_text(sqlite3_stmt*, int iCol);
 sqlite3_column_text = sq3.func("s", "sqlite3_column_text", "pi")
 # sqlite3_int64 sqlite3_last_insert_rowid(sqlite3*);
-sqlite3_last_insert_rowid = sq3.func("l", "sqlite3_last_insert_rowid", "p")
+sqlite3_last_insert_rowid = sq3.func("q", "sqlite3_last_insert_rowid", "p")
 # const char *sqlite3_errmsg(sqlite3*);
 sqlite3_errmsg = sq3.func("s", "sqlite3_errmsg", "p")
+# const void *sqlite3_column_blob(sqlite3_stmt*, int iCol);
+sqlite3_column_blob = sq3.func("p", "sqlite3_column_blob", "pi")
+# int sqlite3_column_bytes(sqlite3_stmt*, int iCol);
+sqlite3_column_bytes = sq3.func("i", "sqlite3_column_bytes", "pi")
+# int sqlite3_changes(sqlite3*);
+sqlite3_changes = sq3.func("i", "sqlite3_changes", "p")
 
 
 SQLITE_OK = 0
@@ -59,6 +85,9 @@ SQLITE_NULL = 5
 
 SQLITE_CONFIG_URI = 17
 
+# Makes SQLite take its own copy of bound text and blobs.
+SQLITE_TRANSIENT = -1
+
 # For compatibility with CPython sqlite3 driver
 LEGACY_TRANSACTION_CONTROL = -1
 
@@ -98,11 +127,70 @@ def __is_dml(sql):
     return False
 
 
+def _bind(db, stmt, params):
+    # Binds a sequence of parameters to ? placeholders, or a dict to named
+    # ones, so that values never become part of the SQL text.
+    n = sqlite3_bind_parameter_count(stmt)
+    if isinstance(params, dict):
+        params = [params[sqlite3_bind_parameter_name(stmt, i)[1:]] for i in range(1, n + 1)]
+    elif len(params) != n:
+        raise Error(
+            "Incorrect number of bindings supplied. "
+            "The current statement uses %d, and there are %d supplied." % (n, len(params))
+        )
+    i = 1
+    for v in params:
+        if v is None:
+            res = sqlite3_bind_null(stmt, i)
+        elif isinstance(v, int):
+            res = sqlite3_bind_int64(stmt, i, v)
+        elif isinstance(v, float):
+            res = sqlite3_bind_double(stmt, i, v)
+        elif isinstance(v, str):
+            res = sqlite3_bind_text(stmt, i, v, -1, SQLITE_TRANSIENT)
+        elif isinstance(v, (bytes, bytearray, memoryview)):
+            if len(v):
+                res = sqlite3_bind_blob(stmt, i, v, len(v), SQLITE_TRANSIENT)
+            else:
+                # A blob with no data would be bound as NULL.
+                res = sqlite3_bind_zeroblob(stmt, i, 0)
+        else:
+            raise Error("Error binding parameter %d: type %s is not supported" % (i, type(v)))
+        check_error(db, res)
+        i += 1
+
+
 class Connections:
-    def __init__(self, db, isolation_level, autocommit):
+    def __init__(self, db, isolation_level, autocommit, cached_statements=128):
         self.db = db
         self.isolation_level = isolation_level
         self.autocommit = autocommit
+        # Prepared statements that aren't in use, by SQL text, and the SQL
+        # of each with the least recently used first.  Cursors take
+        # statements out while they use them, so two cursors never share
+        # one.
+        self._cached_statements = cached_statements
+        self._stmts = {}
+        self._stmt_order = []
+
+    def _prepare(self, sql):
+        stmt = self._stmts.pop(sql, None)
+        if stmt is None:
+            return __prepare_stmt(self.db, sql)
+        self._stmt_order.remove(sql)
+        return stmt
+
+    def _release(self, sql, stmt):
+        # Resets a statement a cursor is done with and caches it.
+        sqlite3_reset(stmt)
+        sqlite3_clear_bindings(stmt)
+        if sql in self._stmts or not self._cached_statements:
+            sqlite3_finalize(stmt)
+            return
+        if len(self._stmt_order) >= self._cached_statements:
+            sqlite3_finalize(self._stmts.pop(self._stmt_order.pop(0)))
+        self._stmts[sql] = stmt
+        self._stmt_order.append(sql)
 
     def commit(self):
         if self.autocommit == LEGACY_TRANSACTION_CONTROL and not sqlite3_get_autocommit(self.db):
@@ -119,85 +207,190 @@ class Connections:
             __exec_stmt(self.db, "BEGIN")
 
     def cursor(self):
-        return Cursor(self.db, self.isolation_level, self.autocommit)
+        return Cursor(self)
+
+    def execute(self, sql, params=()):
+        return self.cursor().execute(sql, params)
+
+    def executemany(self, sql, seq_of_params):
+        return self.cursor().executemany(sql, seq_of_params)
 
     def close(self):
         if self.db:
             if self.autocommit == False and not sqlite3_get_autocommit(self.db):
                 __exec_stmt(self.db, "ROLLBACK")
 
+            for stmt in self._stmts.values():
+                sqlite3_finalize(stmt)
+            self._stmts.clear()
+            self._stmt_order.clear()
+
             res = sqlite3_close(self.db)
             check_error(self.db, res)
             self.db = None
 
 
 class Cursor:
-    def __init__(self, db, isolation_level, autocommit):
-        self.db = db
-        self.isolation_level = isolation_level
-        self.autocommit = autocommit
+    def __init__(self, connection):
+        self.connection = connection
+        self.db = connection.db
+        self.isolation_level = connection.isolation_level
+        self.autocommit = connection.autocommit
+        self.arraysize = 1
+        self.rowcount = -1
+        self.lastrowid = None
         self.stmt = None
+        self.sql = None
 
-    def __quote(val):
-        if isinstance(val, str):
-            return "'%s'" % val
-        return str(val)
-
-    def execute(self, sql, params=None):
+    def _release(self):
         if self.stmt:
-            # If there is an existing statement, finalize that to free it
-            res = sqlite3_finalize(self.stmt)
-            check_error(self.db, res)
-
-        if params:
-            params = [self.__quote(v) for v in params]
-            sql = sql % tuple(params)
+            self.connection._release(self.sql, self.stmt)
+            self.stmt = None
 
-        if __is_dml(sql) and self.autocommit == LEGACY_TRANSACTION_CONTROL and sqlite3_get_autocommit(self.db):
+    def _begin(self, sql):
+        if (
+            __is_dml(sql)
+            and self.autocommit == LEGACY_TRANSACTION_CONTROL
+            and sqlite3_get_autocommit(self.db)
+        ):
             # For compatibility with CPython, add functionality for their default transaction
             # behavior. Changing autocommit from LEGACY_TRANSACTION_CONTROL will remove this
             __exec_stmt(self.db, "BEGIN " + self.isolation_level)
 
-        self.stmt = __prepare_stmt(self.db, sql)
-        self.num_cols = sqlite3_column_count(self.stmt)
-
-        if not self.num_cols:
-            v = self.fetchone()
-            # If it's not select, actually execute it here
-            # num_cols == 0 for statements which don't return data (=> modify it)
-            assert v is None
-            self.lastrowid = sqlite3_last_insert_rowid(self.db)
+    def execute(self, sql, params=()):
+        self._release()
+        self._begin(sql)
+
+        stmt = self.connection._prepare(sql)
+        self.stmt = stmt
+        self.sql = sql
+        try:
+            _bind(self.db, stmt, params)
+            self.num_cols = sqlite3_column_count(stmt)
+            if not self.num_cols:
+                # If it's not select, actually execute it here
+                # num_cols == 0 for statements which don't return data (=> modify it)
+                v = self.fetchone()
+                assert v is None
+                self.lastrowid = sqlite3_last_insert_rowid(self.db)
+                self.rowcount = sqlite3_changes(self.db)
+                self._release()
+            else:
+                self.rowcount = -1
+        except:
+            self._release()
+            raise
+        return self
+
+    def executemany(self, sql, seq_of_params):
+        # Runs the statement for each set of parameters, reusing one
+        # prepared statement.  Unless a transaction is already open, they
+        # are all done in one, which saves a commit per row.
+        self._release()
+        self._begin(sql)
+
+        db = self.db
+        stmt = self.connection._prepare(sql)
+        own_transaction = sqlite3_get_autocommit(db)
+        if own_transaction:
+            __exec_stmt(db, "BEGIN")
+        rowcount = 0
+        try:
+            for params in seq_of_params:
+                _bind(db, stmt, params)
+                res = sqlite3_step(stmt)
+                if res != SQLITE_DONE:
+                    if res == SQLITE_ROW:
+                        raise Error("executemany() can only execute DML statements.")
+                    check_error(db, res)
+                rowcount += sqlite3_changes(db)
+                sqlite3_reset(stmt)
+        except:
+            self.connection._release(sql, stmt)
+            if own_transaction:
+                __exec_stmt(db, "ROLLBACK")
+            raise
+        self.connection._release(sql, stmt)
+        if own_transaction:
+            __exec_stmt(db, "COMMIT")
+        self.rowcount = rowcount
+        self.lastrowid = sqlite3_last_insert_rowid(db)
+        return self
 
     def close(self):
-        if self.stmt:
-            res = sqlite3_finalize(self.stmt)
-            check_error(self.db, res)
-            self.stmt = None
+        self._release()
 
     def __make_row(self):
         res = []
+        stmt = self.stmt
         for i in range(self.num_cols):
-            t = sqlite3_column_type(self.stmt, i)
+            t = sqlite3_column_type(stmt, i)
             if t == SQLITE_INTEGER:
-                res.append(sqlite3_column_int(self.stmt, i))
+                res.append(sqlite3_column_int64(stmt, i))
             elif t == SQLITE_FLOAT:
-                res.append(sqlite3_column_double(self.stmt, i))
+                res.append(sqlite3_column_double(stmt, i))
             elif t == SQLITE_TEXT:
-                res.append(sqlite3_column_text(self.stmt, i))
+                res.append(sqlite3_column_text(stmt, i))
+            elif t == SQLITE_BLOB:
+                # Get the pointer after the size, as asking for the size
+                # can move the data.
+                n = sqlite3_column_bytes(stmt, i)
+                res.append(
+                    bytes(uctypes.bytearray_at(sqlite3_column_blob(stmt, i), n)) if n else b""
+                )
             else:
-                raise NotImplementedError
+                res.append(None)
         return tuple(res)
 
     def fetchone(self):
+        if not self.stmt:
+            return None
         res = sqlite3_step(self.stmt)
         if res == SQLITE_DONE:
+            if self.num_cols:
+                # Hand the statement back to the cache.
+                self._release()
             return None
         if res == SQLITE_ROW:
             return self.__make_row()
         check_error(self.db, res)
 
-
-def connect(fname, uri=False, isolation_level="", autocommit=LEGACY_TRANSACTION_CONTROL):
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        rows = []
+        while len(rows) < size:
+            row = self.fetchone()
+            if row is None:
+                break
+            rows.append(row)
+        return rows
+
+    def fetchall(self):
+        rows = []
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return rows
+            rows.append(row)
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        row = self.fetchone()
+        if row is None:
+            raise StopIteration
+        return row
+
+
+def connect(
+    fname,
+    uri=False,
+    isolation_level="",
+    autocommit=LEGACY_TRANSACTION_CONTROL,
+    cached_statements=128,
+):
     if isolation_level not in [None, "", "DEFERRED", "IMMEDIATE", "EXCLUSIVE"]:
         raise Error("Invalid option for isolation level")
 
@@ -210,4 +403,4 @@ def connect(fname, uri=False, isolation_level="", autocommit=LEGACY_TRANSACTION_
     if autocommit == False:
         __exec_stmt(db, "BEGIN")
 
-    return Connections(db, isolation_level, autocommit)
+    return Connections(db, isolation_level, autocommit, cached_statements)
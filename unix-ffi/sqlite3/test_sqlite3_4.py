@@ -0,0 +1,99 @@
+import sqlite3
+
+
+def test_binding():
+    conn = sqlite3.connect(":memory:", autocommit=True)
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE t(i int, f real, s text, b blob, n)")
+    row = (1 << 40, 2.5, "it's", b"\x00\x01\xff", None)
+    cur.execute("INSERT INTO t VALUES (?, ?, ?, ?, ?)", row)
+    assert cur.rowcount == 1
+    cur.execute("SELECT * FROM t WHERE s = ?", ("it's",))
+    assert cur.fetchone() == row
+    assert cur.fetchone() is None
+
+    # Parameters are bound, never spliced into the SQL.
+    cur.execute("SELECT count(*) FROM t WHERE s = ?", ("x' OR '1'='1",))
+    assert cur.fetchone() == (0,)
+
+    cur.execute("SELECT :a + :b, :a", {"a": 1, "b": 2})
+    assert cur.fetchall() == [(3, 1)]
+
+    cur.execute("SELECT ?, ?", (-(1 << 62), (1 << 63) - 1))
+    assert cur.fetchone() == (-(1 << 62), (1 << 63) - 1)
+
+    cur.execute("SELECT ?, x''", (b"",))
+    assert cur.fetchone() == (b"", b"")
+
+    try:
+        cur.execute("SELECT ?, ?", (1,))
+        assert False
+    except sqlite3.Error:
+        pass
+
+    cur.close()
+    conn.close()
+
+
+def test_executemany():
+    conn = sqlite3.connect(":memory:", autocommit=True)
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE r(ts int PRIMARY KEY, v real)")
+    cur.executemany("INSERT INTO r VALUES (?, ?)", ((i, i / 2) for i in range(1000)))
+    assert cur.rowcount == 1000
+
+    # A failure rolls back the whole batch.
+    try:
+        cur.executemany("INSERT INTO r VALUES (?, ?)", [(1000, 0.0), (0, 0.0)])
+        assert False
+    except sqlite3.Error:
+        pass
+
+    rows = cur.execute("SELECT ts, v FROM r ORDER BY ts").fetchmany(3)
+    assert rows == [(0, 0.0), (1, 0.5), (2, 1.0)]
+    cur.arraysize = 2
+    assert cur.fetchmany() == [(3, 1.5), (4, 2.0)]
+    assert len(cur.fetchall()) == 995
+    assert cur.fetchall() == []
+
+    assert list(cur.execute("SELECT count(*) FROM r")) == [(1000,)]
+    cur.close()
+    conn.close()
+
+
+def test_statement_cache():
+    conn = sqlite3.connect(":memory:", autocommit=True, cached_statements=2)
+    cur = conn.execute("CREATE TABLE k(a)")
+    for i in range(10):
+        cur.execute("INSERT INTO k VALUES (?)", (i,))
+        cur.execute("SELECT ?", (i,))
+        assert cur.fetchone() == (i,)
+    assert len(conn._stmts) <= 2
+
+    # Two cursors running the same query at once don't share a statement.
+    c1 = conn.execute("SELECT a FROM k ORDER BY a")
+    c2 = conn.execute("SELECT a FROM k ORDER BY a")
+    assert c1.fetchone() == (0,)
+    assert c2.fetchone() == (0,)
+    assert c1.fetchone() == (1,)
+    assert len(c2.fetchall()) == 9
+    c1.close()
+    c2.close()
+    conn.close()
+
+
+def test_legacy_transaction():
+    conn = sqlite3.connect(":memory:")
+    cur = conn.cursor()
+    cur.execute("CREATE TABLE t(a)")
+    cur.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+    conn.rollback()
+    assert cur.execute("SELECT count(*) FROM t").fetchone() == (0,)
+    cur.close()
+    conn.close()
+
+
+test_binding()
+test_executemany()
+test_statement_cache()
+test_legacy_transaction()